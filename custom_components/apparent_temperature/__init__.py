@@ -4,3 +4,30 @@ Custom component to calculate air temperature feeling.
 For more details about this integration, please refer to
 https://github.com/Limych/ha-temperature-feeling
 """
+
+import voluptuous as vol
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.discovery import async_load_platform
+from homeassistant.helpers.typing import ConfigType
+
+from .const import DOMAIN
+from .schema import INTEGRATION_SCHEMA
+from .services import async_setup_services
+
+CONFIG_SCHEMA = vol.Schema(
+    {vol.Optional(DOMAIN): INTEGRATION_SCHEMA},
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up apparent_temperature integration."""
+    async_setup_services(hass)
+
+    # All sensors of integration configuration are set up by one platform call
+    if DOMAIN in config:
+        hass.async_create_task(
+            async_load_platform(hass, Platform.SENSOR, DOMAIN, config[DOMAIN], config)
+        )
+    return True
@@ -0,0 +1,268 @@
+"""Aggregation of several sources values for apparent_temperature."""
+
+from heapq import heapify, heappop, heappush
+from itertools import count
+from typing import Final
+
+from .const import (
+    AGGREGATE_FRESHNESS,
+    AGGREGATE_MAX,
+    AGGREGATE_MEAN,
+    AGGREGATE_MEDIAN,
+    AGGREGATE_MIN,
+)
+
+AGGREGATES: Final = (
+    AGGREGATE_MEAN,
+    AGGREGATE_MEDIAN,
+    AGGREGATE_MIN,
+    AGGREGATE_MAX,
+    AGGREGATE_FRESHNESS,
+)
+
+# Weight of value halves for each half-life it is older than the freshest one
+FRESHNESS_HALF_LIFE: Final = 600  # seconds
+# Weights are rebased when their exponent grows that large
+FRESHNESS_REBASE_EXPONENT: Final = 512
+# Stale heap entries are dropped when there are that many more of them
+# than of current ones
+HEAP_COMPACT_SLACK: Final = 32
+
+
+class _LazyHeap:
+    """Heap of member values whose replaced entries are dropped lazily."""
+
+    # Entries are (sign * value, sequence, entity_id). An entry is current
+    # while its sequence is the last one assigned to its entity, so replaced
+    # values are just skipped when they come to the top.
+
+    __slots__ = ("_entries", "_sequences", "_sign", "size")
+
+    def __init__(self, sign: int, sequences: dict[str, int]) -> None:
+        """Class initialization."""
+        self._sign = sign  # 1 for min-heap, -1 for max-heap
+        self._sequences = sequences
+        self._entries: list[tuple[float, int, str]] = []
+        self.size = 0  # number of current entries
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self.size = 0
+
+    def push(self, value: float, sequence: int, entity_id: str) -> None:
+        """Add current value of member."""
+        heappush(self._entries, (self._sign * value, sequence, entity_id))
+        self.size += 1
+
+    def top(self) -> float:
+        """Return smallest (or largest for max-heap) current value."""
+        self._prune()
+        return self._sign * self._entries[0][0]
+
+    def pop(self) -> tuple[float, int, str]:
+        """Remove and return top current entry."""
+        self._prune()
+        key, sequence, entity_id = heappop(self._entries)
+        self.size -= 1
+        return self._sign * key, sequence, entity_id
+
+    def discard(self) -> None:
+        """Account for one current entry which became stale."""
+        self.size -= 1
+        if len(self._entries) > 2 * self.size + HEAP_COMPACT_SLACK:
+            self._entries = [entry for entry in self._entries if self._current(entry)]
+            heapify(self._entries)
+
+    def _current(self, entry: tuple[float, int, str]) -> bool:
+        """Return True if entry holds current value of its member."""
+        return self._sequences.get(entry[2]) == entry[1]
+
+    def _prune(self) -> None:
+        """Drop stale entries from top of heap."""
+        while not self._current(self._entries[0]):
+            heappop(self._entries)
+
+
+class Aggregate:
+    """Aggregate class."""
+
+    # Keeps an aggregate of member values incrementally: running sums for
+    # means, one heap for min or max and two balanced heaps (lower half and
+    # upper half of values) for median. Updating one member costs amortized
+    # O(log n) instead of re-reading every member.
+
+    __slots__ = (
+        "_epoch",
+        "_heaps",
+        "_sequence",
+        "_sequences",
+        "_sides",
+        "_sum",
+        "_timestamps",
+        "_values",
+        "_weight_sum",
+        "_weighted_sum",
+        "members",
+        "method",
+    )
+
+    def __init__(self, method: str) -> None:
+        """Class initialization."""
+        self.method = method
+        self.members: set[str] = set()
+
+        self._values: dict[str, float] = {}
+        self._timestamps: dict[str, float] = {}
+        self._sequence = count()
+        self._sequences: dict[str, int] = {}
+        self._sides: dict[str, _LazyHeap] = {}
+        # Min-heap for min, max-heap for max, lower and upper halves for median
+        self._heaps = tuple(
+            _LazyHeap(sign, self._sequences)
+            for sign in {
+                AGGREGATE_MIN: (1,),
+                AGGREGATE_MAX: (-1,),
+                AGGREGATE_MEDIAN: (-1, 1),
+            }.get(method, ())
+        )
+        self._sum = 0.0
+        self._epoch: float | None = None
+        self._weight_sum = 0.0
+        self._weighted_sum = 0.0
+
+    def __contains__(self, entity_id: str) -> bool:
+        """Return True if entity is a member of aggregate."""
+        return entity_id in self.members
+
+    def __len__(self) -> int:
+        """Return number of members with known values."""
+        return len(self._values)
+
+    @property
+    def value(self) -> float | None:
+        """Return aggregated value of members."""
+        if not self._values:
+            return None
+
+        method = self.method
+        if method == AGGREGATE_MEAN:
+            value = self._sum / len(self._values)
+        elif method == AGGREGATE_FRESHNESS:
+            if self._weight_sum <= 0:
+                # Weights of all remaining values underflowed
+                self._rebase(max(self._timestamps.values()))
+            value = self._weighted_sum / self._weight_sum
+        elif method == AGGREGATE_MEDIAN:
+            lower, upper = self._heaps
+            value = (
+                lower.top()
+                if lower.size > upper.size
+                else (lower.top() + upper.top()) / 2
+            )
+        else:
+            value = self._heaps[0].top()
+        return value
+
+    def add(self, entity_id: str) -> None:
+        """Add member without value."""
+        self.members.add(entity_id)
+
+    def remove(self, entity_id: str) -> None:
+        """Remove member and its value."""
+        self._discard(entity_id)
+        self.members.discard(entity_id)
+
+    def update(self, entity_id: str, value: float | None, timestamp: float) -> None:
+        """Update value of member."""
+        self._discard(entity_id)
+        self.members.add(entity_id)
+        if value is None:
+            return
+
+        self._values[entity_id] = value
+        self._timestamps[entity_id] = timestamp
+        method = self.method
+        if method == AGGREGATE_MEAN:
+            self._sum += value
+        elif method == AGGREGATE_FRESHNESS:
+            if (
+                self._epoch is None
+                or (timestamp - self._epoch) / FRESHNESS_HALF_LIFE
+                > FRESHNESS_REBASE_EXPONENT
+            ):
+                self._rebase(timestamp)
+            else:
+                weight = self._weight(timestamp)
+                self._weight_sum += weight
+                self._weighted_sum += weight * value
+        else:
+            self._push(entity_id, value)
+
+    def _push(self, entity_id: str, value: float) -> None:
+        """Push member value to heaps."""
+        sequence = self._sequences[entity_id] = next(self._sequence)
+        heap = self._heaps[0]
+        if self.method == AGGREGATE_MEDIAN:
+            lower, upper = self._heaps
+            if lower.size and value > lower.top():
+                heap = upper
+        heap.push(value, sequence, entity_id)
+        self._sides[entity_id] = heap
+        if self.method == AGGREGATE_MEDIAN:
+            self._rebalance()
+
+    def _rebalance(self) -> None:
+        """Keep lower half of median heaps equal or one value larger."""
+        lower, upper = self._heaps
+        while lower.size > upper.size + 1:
+            self._move(lower, upper)
+        while upper.size > lower.size:
+            self._move(upper, lower)
+
+    def _move(self, source: _LazyHeap, target: _LazyHeap) -> None:
+        """Move top value from one median heap to the other."""
+        value, sequence, entity_id = source.pop()
+        target.push(value, sequence, entity_id)
+        self._sides[entity_id] = target
+
+    def _discard(self, entity_id: str) -> None:
+        """Discard value of member."""
+        if (value := self._values.pop(entity_id, None)) is None:
+            return
+
+        timestamp = self._timestamps.pop(entity_id)
+        if not self._values:
+            # Drop accumulated rounding errors
+            self._sum = self._weight_sum = self._weighted_sum = 0.0
+            self._sequences.clear()
+            self._sides.clear()
+            for heap in self._heaps:
+                heap.clear()
+            return
+
+        method = self.method
+        if method == AGGREGATE_MEAN:
+            self._sum -= value
+        elif method == AGGREGATE_FRESHNESS:
+            weight = self._weight(timestamp)
+            self._weight_sum -= weight
+            self._weighted_sum -= weight * value
+        else:
+            del self._sequences[entity_id]
+            self._sides.pop(entity_id).discard()
+            if method == AGGREGATE_MEDIAN:
+                self._rebalance()
+
+    def _weight(self, timestamp: float) -> float:
+        """Return freshness weight of value updated at timestamp."""
+        return 2.0 ** ((timestamp - self._epoch) / FRESHNESS_HALF_LIFE)
+
+    def _rebase(self, epoch: float) -> None:
+        """Recalculate freshness weights relative to new epoch."""
+        self._epoch = epoch
+        self._weight_sum = self._weighted_sum = 0.0
+        for entity_id, value in self._values.items():
+            weight = self._weight(self._timestamps[entity_id])
+            self._weight_sum += weight
+            self._weighted_sum += weight * value
@@ -0,0 +1,181 @@
+"""Historical backfill of long-term statistics for apparent_temperature."""
+
+import logging
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Final
+
+import numpy as np
+from homeassistant.components.recorder import DOMAIN as RECORDER_DOMAIN
+from homeassistant.components.recorder import get_instance, history
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import async_import_statistics
+from homeassistant.const import UnitOfTemperature
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import TemperatureConverter
+from numpy.typing import NDArray
+
+from .const import ROLE_HUMIDITY, ROLE_TEMPERATURE, ROLE_WIND_SPEED
+from .formulas import Formula
+from .series import Series, align_series, decode_history
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CHUNK: Final = timedelta(days=1)
+HOUR: Final = 3600  # seconds
+
+
+def compile_hourly_statistics(
+    start: float,
+    end: float,
+    sources: Mapping[str, Series | None],
+    formula: Formula,
+) -> list[tuple[float, float, float, float]]:
+    """
+    Compile hourly statistics of apparent temperature.
+
+    Sources series are treated as step functions. Returns list of
+    (hour start timestamp, time-weighted mean, min, max) tuples.
+    """
+    series = [item for item in sources.values() if item is not None]
+    breakpoints = np.unique(
+        np.concatenate(
+            [np.arange(start, end, HOUR)]
+            + [times[(times > start) & (times < end)] for times, _ in series]
+        )
+    )
+    durations = np.diff(np.append(breakpoints, end))
+
+    def aligned(role: str, default: float) -> NDArray[np.float64]:
+        if (item := sources.get(role)) is None:
+            return np.full(len(breakpoints), default)
+        return align_series(breakpoints, item)
+
+    values = formula.calculate_batch(
+        aligned(ROLE_TEMPERATURE, np.nan),
+        aligned(ROLE_HUMIDITY, np.nan),
+        np.nan_to_num(aligned(ROLE_WIND_SPEED, 0.0), nan=0.0),
+    )
+
+    hours = int(np.ceil((end - start) / HOUR))
+    index = ((breakpoints - start) // HOUR).astype(np.intp)
+    valid = ~np.isnan(values) & (durations > 0)
+    index, values, durations = index[valid], values[valid], durations[valid]
+
+    weights = np.bincount(index, weights=durations, minlength=hours)
+    sums = np.bincount(index, weights=values * durations, minlength=hours)
+    minimums = np.full(hours, np.inf)
+    maximums = np.full(hours, -np.inf)
+    np.minimum.at(minimums, index, values)
+    np.maximum.at(maximums, index, values)
+
+    return [
+        (
+            start + hour * HOUR,
+            sums[hour] / weights[hour],
+            minimums[hour],
+            maximums[hour],
+        )
+        for hour in np.flatnonzero(weights).tolist()
+    ]
+
+
+async def async_backfill(  # noqa: PLR0913
+    hass: HomeAssistant,
+    statistic_id: str,
+    sources: Mapping[str, str | None],
+    formula: Formula,
+    *,
+    start_time: datetime,
+    end_time: datetime,
+    unit_of_measurement: str = UnitOfTemperature.CELSIUS,
+    chunk: timedelta = DEFAULT_CHUNK,
+) -> int:
+    """
+    Backfill long-term statistics of sensor from its sources history.
+
+    History is read and imported chunk by chunk, so only one chunk of rows is
+    kept in memory at once. Returns number of imported hours.
+    """
+    if RECORDER_DOMAIN not in hass.config.components:
+        msg = "Recorder is required to backfill statistics"
+        raise HomeAssistantError(msg)
+
+    recorder = get_instance(hass)
+    entity_ids = list({entity_id for entity_id in sources.values() if entity_id})
+    convert = TemperatureConverter.converter_factory(
+        UnitOfTemperature.CELSIUS, unit_of_measurement
+    )
+    metadata = StatisticMetaData(
+        has_mean=True,
+        has_sum=False,
+        name=None,
+        source="recorder",
+        statistic_id=statistic_id,
+        unit_of_measurement=unit_of_measurement,
+    )
+
+    # Only full hours are imported
+    start = dt_util.as_utc(start_time).replace(minute=0, second=0, microsecond=0)
+    end = dt_util.as_utc(end_time).replace(minute=0, second=0, microsecond=0)
+    chunk = max(chunk // timedelta(hours=1), 1) * timedelta(hours=1)
+    imported = 0
+
+    while start < end:
+        chunk_end = min(start + chunk, end)
+        states = await recorder.async_add_executor_job(
+            partial(
+                history.get_significant_states,
+                hass,
+                # History excludes states updated exactly at its start time
+                start - timedelta(microseconds=1),
+                chunk_end,
+                entity_ids,
+                include_start_time_state=True,
+                significant_changes_only=False,
+            )
+        )
+
+        statistics = compile_hourly_statistics(
+            start.timestamp(),
+            chunk_end.timestamp(),
+            {
+                role: decode_history(states.get(entity_id, []), role, entity_id)
+                if entity_id
+                else None
+                for role, entity_id in sources.items()
+            },
+            formula,
+        )
+        if statistics:
+            async_import_statistics(
+                hass,
+                metadata,
+                [
+                    StatisticData(
+                        start=dt_util.utc_from_timestamp(hour),
+                        mean=convert(mean),
+                        min=convert(minimum),
+                        max=convert(maximum),
+                    )
+                    for hour, mean, minimum, maximum in statistics
+                ],
+            )
+            imported += len(statistics)
+
+        _LOGGER.debug(
+            "Backfilled %d hours of %s statistics from %s to %s",
+            len(statistics),
+            statistic_id,
+            start,
+            chunk_end,
+        )
+        start = chunk_end
+
+    return imported
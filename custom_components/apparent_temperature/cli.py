@@ -0,0 +1,547 @@
+"""
+Offline recalculation of apparent temperature.
+
+Reads source entities history from a recorder SQLite database or CSV export
+of history, recalculates apparent temperature with the same conversion and
+formula code the sensor uses and writes results to CSV or Parquet file.
+
+Example:
+    python -m custom_components.apparent_temperature.cli --db home-assistant_v2.db
+        --sensor office=sensor.office_temperature,sensor.office_humidity
+        --output office.parquet
+
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+from collections import OrderedDict, deque
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import closing
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Final, NamedTuple, TextIO
+
+import numpy as np
+from homeassistant.util import dt as dt_util
+from numpy.typing import NDArray
+
+from .const import DEFAULT_FORMULA, ROLE_HUMIDITY, ROLE_TEMPERATURE, ROLE_WIND_SPEED
+from .formulas import FORMULAS
+from .series import align_series, decode_history
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PARTITION: Final = timedelta(days=1)
+MAX_OPEN_PARTITIONS: Final = 64
+ROLES: Final = (ROLE_TEMPERATURE, ROLE_HUMIDITY, ROLE_WIND_SPEED)
+COLUMNS: Final = (
+    "sensor",
+    "time",
+    "temperature",
+    "humidity",
+    "wind_speed",
+    "apparent_temperature",
+)
+
+
+class StateRow(NamedTuple):
+    """Recorded state of source entity."""
+
+    entity_id: str
+    state: str
+    attributes: dict[str, Any]
+    last_updated_timestamp: float
+
+
+class SensorSpec(NamedTuple):
+    """Sources of one apparent temperature sensor."""
+
+    name: str
+    sources: dict[str, str | None]
+
+
+class Result(NamedTuple):
+    """Calculated values of one sensor for one time partition."""
+
+    sensor: str
+    times: NDArray[np.float64]
+    temperature: NDArray[np.float64]
+    humidity: NDArray[np.float64]
+    wind_speed: NDArray[np.float64]
+    apparent_temperature: NDArray[np.float64]
+
+
+@lru_cache(maxsize=4096)
+def _parse_attributes(raw: str | None) -> dict[str, Any]:
+    """Parse recorded state attributes."""
+    return json.loads(raw) if raw else {}
+
+
+def _connect(path: str) -> closing[sqlite3.Connection]:
+    """Open read-only connection to recorder database, closed on exit."""
+    # Opening read-only connection is cheap, so workers do not keep them
+    return closing(
+        sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+    )
+
+
+_STATES_QUERY: Final = """
+SELECT states.state, states.last_updated_ts,
+    COALESCE(state_attributes.shared_attrs, states.attributes)
+FROM states
+JOIN states_meta ON states.metadata_id = states_meta.metadata_id
+LEFT JOIN state_attributes ON states.attributes_id = state_attributes.attributes_id
+WHERE states_meta.entity_id = ? AND {condition}
+ORDER BY states.last_updated_ts {order}
+"""
+
+
+def read_database_states(
+    path: str, entity_id: str, start: float, end: float
+) -> list[StateRow]:
+    """
+    Read entity states from recorder database.
+
+    Result includes last state before start of the period.
+    """
+    with _connect(path) as connection:
+        rows = connection.execute(
+            _STATES_QUERY.format(
+                condition="states.last_updated_ts < ?", order="DESC LIMIT 1"
+            ),
+            (entity_id, start),
+        ).fetchall()
+        rows += connection.execute(
+            _STATES_QUERY.format(
+                condition="states.last_updated_ts >= ? AND states.last_updated_ts < ?",
+                order="",
+            ),
+            (entity_id, start, end),
+        ).fetchall()
+    return [
+        StateRow(entity_id, state or "", _parse_attributes(attributes), timestamp)
+        for state, timestamp, attributes in rows
+    ]
+
+
+def database_time_range(path: str, entity_ids: Sequence[str]) -> tuple[float, float]:
+    """Return time range of recorded states of entities."""
+    placeholders = ",".join("?" * len(entity_ids))
+    with _connect(path) as connection:
+        start, end = connection.execute(
+            "SELECT MIN(states.last_updated_ts), MAX(states.last_updated_ts) "  # noqa: S608
+            "FROM states JOIN states_meta "
+            "ON states.metadata_id = states_meta.metadata_id "
+            f"WHERE states_meta.entity_id IN ({placeholders})",
+            tuple(entity_ids),
+        ).fetchone()
+    if start is None:
+        msg = "No recorded states of source entities found"
+        raise ValueError(msg)
+    return start, end
+
+
+def _parse_timestamp(value: str) -> float:
+    """Parse timestamp from CSV export."""
+    try:
+        return float(value)
+    except ValueError:
+        if (parsed := dt_util.parse_datetime(value)) is None:
+            msg = f"Invalid timestamp: {value}"
+            raise ValueError(msg) from None
+        return dt_util.as_utc(parsed).timestamp()
+
+
+def read_csv_states(path: str, entity_ids: set[str]) -> Iterator[StateRow]:
+    """
+    Stream states of entities from CSV export of history.
+
+    File must have `entity_id`, `state` and `last_changed` (or `last_updated`)
+    columns. Optional `attributes` column contains JSON of state attributes.
+    """
+    with Path(path).open(newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            if row["entity_id"] not in entity_ids:
+                continue
+            yield StateRow(
+                row["entity_id"],
+                row["state"],
+                _parse_attributes(row.get("attributes")),
+                _parse_timestamp(row.get("last_updated") or row["last_changed"]),
+            )
+
+
+class CsvPartitions:
+    """Split CSV export into time partition files on disk."""
+
+    def __init__(self, directory: str, start: float, step: float) -> None:
+        """Class initialization."""
+        self._directory = directory
+        self._start = start
+        self._step = step
+        self._files: OrderedDict[int, tuple[TextIO, Any]] = OrderedDict()
+        # Last state of each entity in each partition, states before start of
+        # the first partition are kept in partition -1
+        self._last: dict[int, dict[str, StateRow]] = {}
+
+    def path(self, index: int) -> str:
+        """Return path of partition file."""
+        return str(Path(self._directory) / f"{index}.csv")
+
+    def add(self, row: StateRow) -> None:
+        """Write state to its partition file."""
+        index = max(int((row.last_updated_timestamp - self._start) // self._step), -1)
+        if index >= 0:
+            if (item := self._files.pop(index, None)) is None:
+                if len(self._files) >= MAX_OPEN_PARTITIONS:
+                    self._files.popitem(last=False)[1][0].close()
+                file = Path(self.path(index)).open("a", newline="", encoding="utf-8")  # noqa: SIM115
+                item = (file, csv.writer(file))
+            self._files[index] = item
+            item[1].writerow(
+                (
+                    row.entity_id,
+                    row.state,
+                    json.dumps(row.attributes),
+                    repr(row.last_updated_timestamp),
+                )
+            )
+
+        last = self._last.setdefault(index, {})
+        if (
+            previous := last.get(row.entity_id)
+        ) is None or previous.last_updated_timestamp <= row.last_updated_timestamp:
+            last[row.entity_id] = row
+
+    def close(self) -> None:
+        """Close all partition files."""
+        while self._files:
+            self._files.popitem()[1][0].close()
+
+    def seeds(self, partitions: int) -> list[list[StateRow]]:
+        """Return last states before start of each partition."""
+        seeds = []
+        current: dict[str, StateRow] = dict(self._last.get(-1, {}))
+        for index in range(partitions):
+            seeds.append(list(current.values()))
+            current.update(self._last.get(index, {}))
+        return seeds
+
+
+def read_partition_states(
+    path: str, seed: Sequence[StateRow], entity_id: str
+) -> list[StateRow]:
+    """Read entity states from partition file."""
+    rows = [row for row in seed if row.entity_id == entity_id]
+    if not Path(path).exists():
+        return rows
+
+    with Path(path).open(newline="", encoding="utf-8") as file:
+        rows += sorted(
+            (
+                StateRow(entity, state, _parse_attributes(attributes), float(ts))
+                for entity, state, attributes, ts in csv.reader(file)
+                if entity == entity_id
+            ),
+            key=lambda row: row.last_updated_timestamp,
+        )
+    return rows
+
+
+def process_partition(  # noqa: PLR0913
+    sensor: SensorSpec,
+    formula: str,
+    start: float,
+    end: float,
+    *,
+    database: str | None = None,
+    partition_file: str | None = None,
+    seed: Sequence[StateRow] = (),
+) -> Result:
+    """Calculate apparent temperature of one sensor for one time partition."""
+    series = {}
+    for role, entity_id in sensor.sources.items():
+        if entity_id is None:
+            continue
+        if database is not None:
+            rows = read_database_states(database, entity_id, start, end)
+        else:
+            rows = read_partition_states(partition_file, seed, entity_id)
+        series[role] = decode_history(rows, role, entity_id)  # type: ignore[arg-type]
+
+    # Apparent temperature is calculated at every change of any source
+    times = np.unique(
+        np.concatenate(
+            [np.empty(0)]
+            + [times[(times >= start) & (times < end)] for times, _ in series.values()]
+        )
+    )
+    values = {
+        role: align_series(times, series[role])
+        if role in series
+        else np.full(len(times), 0.0 if role == ROLE_WIND_SPEED else np.nan)
+        for role in ROLES
+    }
+    values[ROLE_WIND_SPEED] = np.nan_to_num(values[ROLE_WIND_SPEED], nan=0.0)
+    result = FORMULAS[formula].calculate_batch(
+        values[ROLE_TEMPERATURE], values[ROLE_HUMIDITY], values[ROLE_WIND_SPEED]
+    )
+
+    valid = ~np.isnan(result)
+    return Result(
+        sensor.name,
+        times[valid],
+        values[ROLE_TEMPERATURE][valid],
+        values[ROLE_HUMIDITY][valid],
+        values[ROLE_WIND_SPEED][valid],
+        result[valid],
+    )
+
+
+class CsvResultWriter:
+    """Write results to CSV file."""
+
+    def __init__(self, path: str) -> None:
+        """Class initialization."""
+        self._file = Path(path).open("w", newline="", encoding="utf-8")  # noqa: SIM115
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(COLUMNS)
+
+    def write(self, result: Result) -> None:
+        """Write results of one partition."""
+        self._writer.writerows(
+            (
+                result.sensor,
+                datetime.fromtimestamp(timestamp, UTC).isoformat(),
+                *values,
+            )
+            for timestamp, *values in zip(
+                result.times.tolist(),
+                result.temperature.tolist(),
+                result.humidity.tolist(),
+                result.wind_speed.tolist(),
+                result.apparent_temperature.tolist(),
+                strict=True,
+            )
+        )
+
+    def close(self) -> None:
+        """Close output file."""
+        self._file.close()
+
+
+class ParquetResultWriter:
+    """Write results to Parquet file."""
+
+    def __init__(self, path: str) -> None:
+        """Class initialization."""
+        try:
+            import pyarrow as pa  # noqa: PLC0415
+            import pyarrow.parquet as pq  # noqa: PLC0415
+        except ImportError as err:
+            msg = "Parquet output requires pyarrow package to be installed"
+            raise RuntimeError(msg) from err
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("sensor", pa.string()),
+                ("time", pa.timestamp("us", tz="UTC")),
+                ("temperature", pa.float64()),
+                ("humidity", pa.float64()),
+                ("wind_speed", pa.float64()),
+                ("apparent_temperature", pa.float64()),
+            ]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, result: Result) -> None:
+        """Write results of one partition as a row group."""
+        if not len(result.times):
+            return
+
+        pa = self._pa
+        self._writer.write_table(
+            pa.table(
+                [
+                    pa.array([result.sensor] * len(result.times), pa.string()),
+                    pa.array(
+                        (result.times * 1_000_000).astype(np.int64),
+                        pa.timestamp("us", tz="UTC"),
+                    ),
+                    pa.array(result.temperature),
+                    pa.array(result.humidity),
+                    pa.array(result.wind_speed),
+                    pa.array(result.apparent_temperature),
+                ],
+                schema=self._schema,
+            )
+        )
+
+    def close(self) -> None:
+        """Close output file."""
+        self._writer.close()
+
+
+def parse_sensor(value: str) -> SensorSpec:
+    """Parse sensor specification `name=temperature,humidity[,wind_speed]`."""
+    name, _, sources = value.partition("=")
+    entity_ids = [entity_id.strip() or None for entity_id in sources.split(",")]
+    if not name or not 2 <= len(entity_ids) <= 3 or None in entity_ids[:2]:  # noqa: PLR2004
+        msg = f"Invalid sensor specification: {value}"
+        raise argparse.ArgumentTypeError(msg)
+    entity_ids += [None] * (3 - len(entity_ids))
+    return SensorSpec(name, dict(zip(ROLES, entity_ids, strict=True)))
+
+
+def parse_time(value: str) -> float:
+    """Parse time argument."""
+    if (parsed := dt_util.parse_datetime(value)) is None:
+        msg = f"Invalid time: {value}"
+        raise argparse.ArgumentTypeError(msg)
+    return dt_util.as_utc(parsed).timestamp()
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.apparent_temperature.cli",
+        description="Recalculate apparent temperature from recorded history.",
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--db", help="recorder SQLite database file")
+    source.add_argument("--csv", help="CSV export of history")
+    parser.add_argument(
+        "--sensor",
+        action="append",
+        required=True,
+        type=parse_sensor,
+        help="sensor as name=temperature_entity,humidity_entity[,wind_speed_entity]",
+    )
+    parser.add_argument(
+        "--output", required=True, help="output file (.csv or .parquet)"
+    )
+    parser.add_argument("--formula", default=DEFAULT_FORMULA, choices=list(FORMULAS))
+    parser.add_argument("--start", type=parse_time, help="start of the period")
+    parser.add_argument("--end", type=parse_time, help="end of the period")
+    parser.add_argument(
+        "--partition-hours",
+        type=int,
+        default=int(DEFAULT_PARTITION.total_seconds() // 3600),
+        help="length of time partitions processed in parallel",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="number of processes"
+    )
+    parser.add_argument("--verbose", action="store_true")
+    return parser.parse_args(argv)
+
+
+def run(args: argparse.Namespace) -> int:
+    """Recalculate apparent temperature; return number of written rows."""
+    entity_ids = sorted(
+        {
+            entity_id
+            for sensor in args.sensor
+            for entity_id in sensor.sources.values()
+            if entity_id
+        }
+    )
+    step = args.partition_hours * 3600.0
+    workers = args.workers or os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        partitions = None
+        if args.db:
+            start, end = database_time_range(args.db, entity_ids)
+            start = args.start if args.start is not None else start
+            end = args.end if args.end is not None else end + 1
+        else:
+            if args.start is None:
+                msg = "--start is required for CSV input"
+                raise ValueError(msg)
+            start = args.start
+            end = args.end if args.end is not None else datetime.now(UTC).timestamp()
+
+            # CSV file has no index, so it is split once into partition files
+            partitions = CsvPartitions(directory, start, step)
+            try:
+                for row in read_csv_states(args.csv, set(entity_ids)):
+                    if row.last_updated_timestamp < end:
+                        partitions.add(row)
+            finally:
+                partitions.close()
+
+        count = max(int(np.ceil((end - start) / step)), 1)
+        seeds = partitions.seeds(count) if partitions is not None else None
+
+        writer = (
+            ParquetResultWriter(args.output)
+            if args.output.endswith(".parquet")
+            else CsvResultWriter(args.output)
+        )
+        written = 0
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Limited number of tasks is kept in flight to keep memory flat
+                pending: deque[Future[Result]] = deque()
+                for index in range(count):
+                    for sensor in args.sensor:
+                        pending.append(
+                            executor.submit(
+                                process_partition,
+                                sensor,
+                                args.formula,
+                                start + index * step,
+                                min(start + (index + 1) * step, end),
+                                database=args.db,
+                                partition_file=partitions and partitions.path(index),
+                                seed=seeds[index] if seeds is not None else (),
+                            )
+                        )
+                        while len(pending) > 2 * workers:
+                            written += _write_result(writer, pending.popleft())
+                while pending:
+                    written += _write_result(writer, pending.popleft())
+        finally:
+            writer.close()
+
+    return written
+
+
+def _write_result(
+    writer: CsvResultWriter | ParquetResultWriter, future: "Future[Result]"
+) -> int:
+    """Write result of finished task; return number of written rows."""
+    result = future.result()
+    writer.write(result)
+    return len(result.times)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run command line interface."""
+    args = _parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
+    try:
+        written = run(args)
+    except (OSError, ValueError, RuntimeError, sqlite3.Error) as err:
+        _LOGGER.error("%s", err)  # noqa: TRY400
+        return 1
+
+    _LOGGER.info("Written %d rows to %s", written, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Comfort values derived from the same source values as apparent temperature."""
+
+import math
+from collections.abc import Iterable
+from typing import Final
+
+from .const import (
+    DERIVED_ABSOLUTE_HUMIDITY,
+    DERIVED_COMFORT,
+    DERIVED_DEW_POINT,
+    DERIVED_HEAT_INDEX,
+    DERIVED_WIND_CHILL,
+)
+from .formulas import heat_index, vapor_pressure, wind_chill
+
+DERIVED: Final = (
+    DERIVED_DEW_POINT,
+    DERIVED_ABSOLUTE_HUMIDITY,
+    DERIVED_HEAT_INDEX,
+    DERIVED_WIND_CHILL,
+    DERIVED_COMFORT,
+)
+
+# Upper dew point limits (in °C) of comfort categories
+COMFORT_CATEGORIES: Final = (
+    ("dry", 10.0),
+    ("very_comfortable", 13.0),
+    ("comfortable", 16.0),
+    ("ok_but_humid", 18.0),
+    ("somewhat_uncomfortable", 21.0),
+    ("quite_uncomfortable", 24.0),
+    ("extremely_uncomfortable", 26.0),
+    ("severely_high", math.inf),
+)
+
+
+def dew_point(e_value: float) -> float | None:
+    """Calculate dew point (in °C) from vapor pressure (in hPa)."""
+    if e_value <= 0:
+        return None
+    gamma = math.log(e_value / 6.105)
+    return 237.7 * gamma / (17.27 - gamma)
+
+
+def absolute_humidity(temperature: float, e_value: float) -> float:
+    """Calculate absolute humidity (in g/m³) from vapor pressure (in hPa)."""
+    return 216.7 * e_value / (273.15 + temperature)
+
+
+def comfort(dew_point_value: float | None) -> str:
+    """Return comfort category for dew point (in °C)."""
+    if dew_point_value is None:
+        return COMFORT_CATEGORIES[0][0]
+    return next(
+        category for category, limit in COMFORT_CATEGORIES if dew_point_value < limit
+    )
+
+
+def derived_values(
+    temperature: float,
+    humidity: float,
+    wind_speed: float,
+    kinds: Iterable[str],
+    e_value: float | None = None,
+) -> dict[str, float | str | None]:
+    """Calculate requested kinds of derived values."""
+    # Vapor pressure is the expensive part shared by most values,
+    # so it is calculated once for all of them (if not given already)
+    if e_value is None:
+        e_value = vapor_pressure(temperature, humidity)
+    values: dict[str, float | str | None] = {}
+    for kind in kinds:
+        if kind == DERIVED_DEW_POINT:
+            values[kind] = dew_point(e_value)
+        elif kind == DERIVED_ABSOLUTE_HUMIDITY:
+            values[kind] = absolute_humidity(temperature, e_value)
+        elif kind == DERIVED_HEAT_INDEX:
+            values[kind] = heat_index(temperature, humidity, wind_speed)
+        elif kind == DERIVED_WIND_CHILL:
+            values[kind] = wind_chill(temperature, humidity, wind_speed)
+        elif kind == DERIVED_COMFORT:
+            values[kind] = comfort(dew_point(e_value))
+    return values
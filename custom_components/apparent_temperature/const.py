@@ -19,6 +19,53 @@ If you have ANY issues with this you need to open an issue here:
 """
 
 
+# Configuration
+CONF_COALESCE_WINDOW: Final = "coalesce_window"
+CONF_MIN_CHANGE: Final = "min_change"
+CONF_HYSTERESIS: Final = "hysteresis"
+CONF_HEARTBEAT: Final = "heartbeat"
+CONF_MAX_AGE: Final = "max_age"
+CONF_SOURCE_VALUES: Final = "source_values"
+CONF_FORMULA: Final = "formula"
+CONF_INSTRUMENTATION: Final = "instrumentation"
+CONF_AGGREGATE: Final = "aggregate"
+CONF_WINDOWS: Final = "windows"
+CONF_DERIVED: Final = "derived"
+CONF_SENSORS: Final = "sensors"
+CONF_AREAS: Final = "areas"
+
+SOURCE_VALUES_RECORDED: Final = "recorded"
+SOURCE_VALUES_UNRECORDED: Final = "unrecorded"
+SOURCE_VALUES_HIDDEN: Final = "hidden"
+
+AGGREGATE_LAST: Final = "last"
+AGGREGATE_MEAN: Final = "mean"
+AGGREGATE_MEDIAN: Final = "median"
+AGGREGATE_MIN: Final = "min"
+AGGREGATE_MAX: Final = "max"
+AGGREGATE_FRESHNESS: Final = "freshness"
+
+# Derived sensors
+DERIVED_DEW_POINT: Final = "dew_point"
+DERIVED_ABSOLUTE_HUMIDITY: Final = "absolute_humidity"
+DERIVED_HEAT_INDEX: Final = "heat_index"
+DERIVED_WIND_CHILL: Final = "wind_chill"
+DERIVED_COMFORT: Final = "comfort"
+
+# Formulas
+FORMULA_AUSTRALIAN: Final = "australian"
+FORMULA_HEAT_INDEX: Final = "heat_index"
+FORMULA_WIND_CHILL: Final = "wind_chill"
+FORMULA_HUMIDEX: Final = "humidex"
+FORMULA_FEELS_LIKE: Final = "feels_like"
+
+DEFAULT_FORMULA: Final = FORMULA_AUSTRALIAN
+
+# Services
+SERVICE_BACKFILL: Final = "backfill"
+SERVICE_CALCULATE: Final = "calculate"
+SERVICE_GET_FORECASTS: Final = "get_forecasts"
+
 # Attributes
 ATTR_TEMPERATURE_SOURCE: Final = "temperature_source"
 ATTR_TEMPERATURE_SOURCE_VALUE: Final = "temperature_source_value"
@@ -26,3 +73,55 @@ ATTR_HUMIDITY_SOURCE: Final = "humidity_source"
 ATTR_HUMIDITY_SOURCE_VALUE: Final = "humidity_source_value"
 ATTR_WIND_SPEED_SOURCE: Final = "wind_speed_source"
 ATTR_WIND_SPEED_SOURCE_VALUE: Final = "wind_speed_source_value"
+ATTR_START_TIME: Final = "start_time"
+ATTR_END_TIME: Final = "end_time"
+ATTR_READINGS: Final = "readings"
+ATTR_FORMULA: Final = "formula"
+ATTR_TEMPERATURE: Final = "temperature"
+ATTR_TEMPERATURE_UNIT: Final = "temperature_unit"
+ATTR_HUMIDITY: Final = "humidity"
+ATTR_WIND_SPEED: Final = "wind_speed"
+ATTR_WIND_SPEED_UNIT: Final = "wind_speed_unit"
+ATTR_RESULTS: Final = "results"
+ATTR_FORECAST: Final = "forecast"
+ATTR_FORECAST_TYPE: Final = "type"
+ATTR_APPARENT_TEMPERATURE: Final = "apparent_temperature"
+ATTR_UPDATES: Final = "updates"
+ATTR_COALESCED: Final = "coalesced"
+ATTR_SKIPPED: Final = "skipped"
+ATTR_DECODE_FAILURES: Final = "decode_failures"
+ATTR_CACHE_HITS: Final = "cache_hits"
+ATTR_CACHE_MISSES: Final = "cache_misses"
+ATTR_LATENCY_P50: Final = "latency_p50"
+ATTR_LATENCY_P99: Final = "latency_p99"
+# Prefixes of rolling-window statistics attributes, e.g. "min_24h"
+ATTR_MIN: Final = "min"
+ATTR_MAX: Final = "max"
+ATTR_MEAN: Final = "mean"
+
+# Source domains and their attributes. They mirror constants of the weather,
+# climate and group components, so these heavy packages are not imported
+# unless a source of that domain is actually used.
+CLIMATE_DOMAIN: Final = "climate"
+GROUP_DOMAIN: Final = "group"
+WEATHER_DOMAIN: Final = "weather"
+
+ATTR_CURRENT_TEMPERATURE: Final = "current_temperature"
+ATTR_CURRENT_HUMIDITY: Final = "current_humidity"
+ATTR_WEATHER_TEMPERATURE: Final = "temperature"
+ATTR_WEATHER_TEMPERATURE_UNIT: Final = "temperature_unit"
+ATTR_WEATHER_HUMIDITY: Final = "humidity"
+ATTR_WEATHER_WIND_SPEED: Final = "wind_speed"
+ATTR_WEATHER_WIND_SPEED_UNIT: Final = "wind_speed_unit"
+ATTR_FORECAST_TIME: Final = "datetime"
+ATTR_FORECAST_TEMP: Final = "temperature"
+ATTR_FORECAST_HUMIDITY: Final = "humidity"
+ATTR_FORECAST_WIND_SPEED: Final = "wind_speed"
+
+# Source roles
+ROLE_TEMPERATURE: Final = "temperature"
+ROLE_HUMIDITY: Final = "humidity"
+ROLE_WIND_SPEED: Final = "wind_speed"
+
+# Data keys
+DATA_COORDINATOR: Final = f"{DOMAIN}_coordinator"
@@ -0,0 +1,252 @@
+"""Shared source entities tracking for apparent_temperature."""
+
+import heapq
+import itertools
+from collections.abc import Callable, Hashable, Iterable
+from datetime import datetime
+from typing import Final
+
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HassJob,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+)
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_COORDINATOR
+from .source import SourceAvailability, SourceDecoder, SourceValues, expand_source
+
+SourceListener = Callable[[str, SourceValues | None], None]
+
+# Heap is compacted when it holds that many more entries than active ones
+EXPIRY_COMPACT_THRESHOLD: Final = 64
+
+
+@callback
+def async_get_coordinator(hass: HomeAssistant) -> "SourceCoordinator":
+    """Return integration-wide source coordinator."""
+    if (coordinator := hass.data.get(DATA_COORDINATOR)) is None:
+        coordinator = hass.data[DATA_COORDINATOR] = SourceCoordinator(hass)
+    return coordinator
+
+
+class SourceCoordinator:
+    """Source coordinator class."""
+
+    # Owns one state change subscription per source entity, decodes each new
+    # source state once and passes decoded values to every subscribed sensor.
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Class initialization."""
+        self.hass = hass
+
+        self._listeners: dict[str, list[SourceListener]] = {}
+        self._unsubs: dict[str, CALLBACK_TYPE] = {}
+        self._decoders: dict[str, SourceDecoder] = {}
+        self._availability: dict[str, SourceAvailability] = {}
+        self._values: dict[str, SourceValues | None] = {}
+        self._expansions: dict[str, tuple[list[str], list[str]]] = {}
+
+        self.expiry = ExpiryQueue(hass)
+
+    @property
+    def tracked_entities(self) -> list[str]:
+        """Return list of currently tracked source entities."""
+        return list(self._unsubs)
+
+    @callback
+    def async_add_listener(
+        self, entity_ids: Iterable[str], listener: SourceListener
+    ) -> CALLBACK_TYPE:
+        """Subscribe listener to updates of source entities."""
+        entity_ids = list(entity_ids)
+        for entity_id in entity_ids:
+            if entity_id not in self._listeners:
+                self._listeners[entity_id] = []
+                self._async_decode(entity_id, self.hass.states.get(entity_id))
+                self._unsubs[entity_id] = async_track_state_change_event(
+                    self.hass, entity_id, self._async_state_changed
+                )
+            self._listeners[entity_id].append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            """Unsubscribe listener."""
+            self.async_remove_listener(entity_ids, listener)
+
+        return remove_listener
+
+    @callback
+    def async_remove_listener(
+        self, entity_ids: Iterable[str], listener: SourceListener
+    ) -> None:
+        """Unsubscribe listener from updates of source entities."""
+        for entity_id in entity_ids:
+            self._async_remove_listener(entity_id, listener)
+
+    @callback
+    def _async_remove_listener(self, entity_id: str, listener: SourceListener) -> None:
+        """Unsubscribe listener from one source entity."""
+        listeners = self._listeners.get(entity_id)
+        if listeners is None or listener not in listeners:
+            return
+
+        listeners.remove(listener)
+        if not listeners:
+            self._unsubs.pop(entity_id)()
+            del self._listeners[entity_id]
+            self._decoders.pop(entity_id, None)
+            self._availability.pop(entity_id, None)
+            self._values.pop(entity_id, None)
+
+    @callback
+    def async_expand_source(self, entity_id: str) -> tuple[list[str], list[str]]:
+        """Expand configured source into member entities and groups."""
+        # Sensors set up together (e.g. all of them on startup) share sources,
+        # so expansions are reused until the end of current event loop iteration.
+        # Group membership may change within that iteration, so changes must be
+        # expanded without this cache.
+        if (expansion := self._expansions.get(entity_id)) is None:
+            if not self._expansions:
+                self.hass.loop.call_soon(self._expansions.clear)
+            expansion = self._expansions[entity_id] = expand_source(
+                self.hass, entity_id
+            )
+        return expansion
+
+    @callback
+    def async_get_values(self, entity_id: str) -> SourceValues | None:
+        """Return decoded values of source entity."""
+        if entity_id in self._values:
+            return self._values[entity_id]
+
+        if (state := self.hass.states.get(entity_id)) is None:
+            return None
+        return SourceDecoder(state).decode(state)
+
+    @callback
+    def async_get_decode_failures(self, entity_id: str) -> int:
+        """Return number of values of source entity which could not be decoded."""
+        if (decoder := self._decoders.get(entity_id)) is None:
+            return 0
+        return decoder.failures
+
+    @callback
+    def _async_decode(self, entity_id: str, state: State | None) -> SourceValues | None:
+        """Decode source entity state and cache the result."""
+        if state is None:
+            values = None
+            available = False
+        else:
+            if (decoder := self._decoders.get(entity_id)) is None:
+                decoder = self._decoders[entity_id] = SourceDecoder(state)
+            values = decoder.decode(state)
+            # Role names match names of decoded values
+            available = all(
+                getattr(values, role) is not None for role in decoder.required_roles
+            )
+
+        if (availability := self._availability.get(entity_id)) is None:
+            availability = self._availability[entity_id] = SourceAvailability(entity_id)
+        availability.update(state, available=available)
+
+        self._values[entity_id] = values
+        return values
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Handle source entity state changes."""
+        entity_id = event.data["entity_id"]
+        values = self._async_decode(entity_id, event.data["new_state"])
+
+        for listener in tuple(self._listeners.get(entity_id, ())):
+            listener(entity_id, values)
+
+
+class ExpiryQueue:
+    """Expiry queue class."""
+
+    # Integration-wide queue of deadlines served by a single timer. Deadlines
+    # are kept in a heap; rescheduled and cancelled entries are left in it and
+    # skipped lazily, so every (re)scheduling costs O(log n).
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Class initialization."""
+        self.hass = hass
+
+        self._heap: list[tuple[float, int, Hashable]] = []
+        self._entries: dict[Hashable, tuple[float, int, Callable[[], None]]] = {}
+        self._counter = itertools.count()
+        self._job = HassJob(self._async_expire, cancel_on_shutdown=True)
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._timer_deadline: float | None = None
+
+    def __len__(self) -> int:
+        """Return number of active entries."""
+        return len(self._entries)
+
+    @callback
+    def async_schedule(
+        self, key: Hashable, deadline: float, action: Callable[[], None]
+    ) -> None:
+        """Schedule (or reschedule) action to be called at deadline timestamp."""
+        seq = next(self._counter)
+        self._entries[key] = (deadline, seq, action)
+        heapq.heappush(self._heap, (deadline, seq, key))
+
+        if len(self._heap) > 2 * len(self._entries) + EXPIRY_COMPACT_THRESHOLD:
+            self._heap = [
+                (deadline, seq, key)
+                for key, (deadline, seq, _) in self._entries.items()
+            ]
+            heapq.heapify(self._heap)
+
+        if self._timer_deadline is None or deadline < self._timer_deadline:
+            self._async_start_timer(deadline)
+
+    @callback
+    def async_cancel(self, key: Hashable) -> None:
+        """Cancel scheduled action."""
+        self._entries.pop(key, None)
+
+    def _is_active(self, seq: int, key: Hashable) -> bool:
+        """Return True if heap entry was not rescheduled or cancelled."""
+        entry = self._entries.get(key)
+        return entry is not None and entry[1] == seq
+
+    @callback
+    def _async_start_timer(self, deadline: float) -> None:
+        """(Re)start timer to fire at deadline timestamp."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+        self._timer_deadline = deadline
+        self._unsub_timer = async_call_later(
+            self.hass, max(deadline - dt_util.utcnow().timestamp(), 0), self._job
+        )
+
+    @callback
+    def _async_expire(self, now: datetime) -> None:
+        """Call actions of all expired entries."""
+        self._unsub_timer = None
+        self._timer_deadline = None
+
+        timestamp = now.timestamp()
+        heap = self._heap
+        while heap and heap[0][0] <= timestamp:
+            _, seq, key = heapq.heappop(heap)
+            if self._is_active(seq, key):
+                _, _, action = self._entries.pop(key)
+                action()
+
+        while heap and not self._is_active(heap[0][1], heap[0][2]):
+            heapq.heappop(heap)
+        if heap:
+            self._async_start_timer(heap[0][0])
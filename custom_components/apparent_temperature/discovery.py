@@ -0,0 +1,118 @@
+"""Discovery of source entities by areas for apparent_temperature."""
+
+from collections.abc import Iterable
+
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.core import HomeAssistant, callback, split_entity_id
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+
+from .const import (
+    CLIMATE_DOMAIN,
+    DOMAIN,
+    ROLE_HUMIDITY,
+    ROLE_TEMPERATURE,
+    WEATHER_DOMAIN,
+)
+from .source import classify_roles
+
+SOURCE_DOMAINS = (SENSOR_DOMAIN, WEATHER_DOMAIN, CLIMATE_DOMAIN)
+
+
+class AreaIndex:
+    """Index of source entities by area."""
+
+    # Built by one pass over entity registry and then updated entity by
+    # entity, so finding sources of all areas never rescans the registry.
+
+    def __init__(self, hass: HomeAssistant, exclude: Iterable[str] = ()) -> None:
+        """Class initialization."""
+        self.hass = hass
+        self._exclude = set(exclude)
+        self._areas: dict[str, dict[str, tuple[str, ...]]] = {}
+        self._entity_areas: dict[str, str] = {}
+
+    @property
+    def areas(self) -> list[str]:
+        """Return list of areas which have any source entities."""
+        return list(self._areas)
+
+    def sources(self, area_id: str) -> dict[str, tuple[str, ...]] | None:
+        """Return roles of area source entities if it has temperature and humidity."""
+        entities = self._areas.get(area_id)
+        if not entities:
+            return None
+
+        roles = {role for entity_roles in entities.values() for role in entity_roles}
+        if ROLE_TEMPERATURE not in roles or ROLE_HUMIDITY not in roles:
+            return None
+        return dict(sorted(entities.items()))
+
+    @callback
+    def async_build(self) -> None:
+        """Index all entities of entity registry."""
+        self._areas.clear()
+        self._entity_areas.clear()
+        devices = dr.async_get(self.hass)
+        for entry in er.async_get(self.hass).entities.values():
+            self._index(entry, devices)
+
+    @callback
+    def async_update_entity(self, entity_id: str) -> set[str]:
+        """Reindex entity and return affected areas."""
+        affected = self._unindex(entity_id)
+        if (entry := er.async_get(self.hass).async_get(entity_id)) is not None and (
+            area_id := self._index(entry, dr.async_get(self.hass))
+        ):
+            affected.add(area_id)
+        return affected
+
+    @callback
+    def async_update_device(self, device_id: str) -> set[str]:
+        """Reindex entities of device and return affected areas."""
+        affected: set[str] = set()
+        entries = er.async_entries_for_device(
+            er.async_get(self.hass), device_id, include_disabled_entities=True
+        )
+        for entry in entries:
+            affected |= self.async_update_entity(entry.entity_id)
+        return affected
+
+    def _index(self, entry: er.RegistryEntry, devices: dr.DeviceRegistry) -> str | None:
+        """Add entity to index and return its area."""
+        if (
+            entry.platform == DOMAIN
+            or entry.disabled_by is not None
+            or split_entity_id(entry.entity_id)[0] not in SOURCE_DOMAINS
+        ):
+            return None
+
+        area_id = entry.area_id
+        if area_id is None and entry.device_id is not None:
+            device = devices.async_get(entry.device_id)
+            area_id = device.area_id if device is not None else None
+        if area_id is None or area_id in self._exclude:
+            return None
+
+        roles = classify_roles(
+            entry.entity_id,
+            entry.device_class or entry.original_device_class,
+            entry.unit_of_measurement,
+        )
+        if not roles:
+            return None
+
+        self._areas.setdefault(area_id, {})[entry.entity_id] = roles
+        self._entity_areas[entry.entity_id] = area_id
+        return area_id
+
+    def _unindex(self, entity_id: str) -> set[str]:
+        """Remove entity from index and return its former area."""
+        if (area_id := self._entity_areas.pop(entity_id, None)) is None:
+            return set()
+
+        entities = self._areas[area_id]
+        del entities[entity_id]
+        if not entities:
+            del self._areas[area_id]
+        return {area_id}
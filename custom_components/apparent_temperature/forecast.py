@@ -0,0 +1,238 @@
+"""Forecast of apparent temperature for weather sources."""
+
+from typing import Any
+
+from homeassistant.const import ATTR_ENTITY_ID, UnitOfSpeed, UnitOfTemperature
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util.unit_conversion import SpeedConverter, TemperatureConverter
+
+from .const import (
+    ATTR_APPARENT_TEMPERATURE,
+    ATTR_FORECAST,
+    ATTR_FORECAST_HUMIDITY,
+    ATTR_FORECAST_TEMP,
+    ATTR_FORECAST_TIME,
+    ATTR_FORECAST_TYPE,
+    ATTR_FORECAST_WIND_SPEED,
+    ATTR_WEATHER_TEMPERATURE_UNIT,
+    ATTR_WEATHER_WIND_SPEED_UNIT,
+    SERVICE_GET_FORECASTS,
+    WEATHER_DOMAIN,
+)
+from .formulas import Formula
+
+ForecastKey = tuple[Any, ...]
+
+
+def forecast_key(
+    forecast: list[dict[str, Any]],
+    temperature_unit: str,
+    wind_speed_unit: str,
+    humidity: float | None = None,
+) -> ForecastKey:
+    """Return key of forecast payload values used in calculation."""
+    entries = tuple(
+        (
+            entry.get(ATTR_FORECAST_TIME),
+            entry.get(ATTR_FORECAST_TEMP),
+            entry.get(ATTR_FORECAST_HUMIDITY),
+            entry.get(ATTR_FORECAST_WIND_SPEED),
+        )
+        for entry in forecast
+    )
+    # Fallback humidity matters only if some entries have no humidity
+    if all(entry[2] is not None for entry in entries):
+        humidity = None
+    return temperature_unit, wind_speed_unit, humidity, entries
+
+
+def calculate_forecast(
+    formula: Formula,
+    forecast: list[dict[str, Any]],
+    temperature_unit: str,
+    wind_speed_unit: str,
+    humidity: float | None = None,
+) -> list[dict[str, Any]]:
+    """Calculate apparent temperature (in °C) of all forecast entries at once."""
+    # Imported on first forecast, not with sensor platform
+    import numpy as np  # noqa: PLC0415
+
+    # Missing values are NaN, so they give NaN results instead of exceptions
+    temp, humd, wind = (
+        np.array(
+            [
+                np.nan if (value := entry.get(key, default)) is None else value
+                for entry in forecast
+            ],
+            dtype=np.float64,
+        )
+        for key, default in (
+            (ATTR_FORECAST_TEMP, None),
+            (ATTR_FORECAST_HUMIDITY, humidity),
+            (ATTR_FORECAST_WIND_SPEED, 0.0),
+        )
+    )
+    if temperature_unit != UnitOfTemperature.CELSIUS:
+        temp = TemperatureConverter.converter_factory(
+            temperature_unit, UnitOfTemperature.CELSIUS
+        )(temp)
+    if wind_speed_unit != UnitOfSpeed.METERS_PER_SECOND:
+        wind = SpeedConverter.converter_factory(
+            wind_speed_unit, UnitOfSpeed.METERS_PER_SECOND
+        )(wind)
+
+    with np.errstate(invalid="ignore"):
+        result = formula.calculate_batch(temp, humd, wind)
+    return [
+        {
+            ATTR_FORECAST_TIME: entry.get(ATTR_FORECAST_TIME),
+            ATTR_APPARENT_TEMPERATURE: None if np.isnan(value) else value,
+        }
+        for entry, value in zip(forecast, result.tolist(), strict=True)
+    ]
+
+
+class _Subscription:
+    """Subscription to forecasts of weather entity."""
+
+    __slots__ = ("entity", "forecast", "humidity_missing", "unsub")
+
+    def __init__(self, entity: Any) -> None:
+        """Class initialization."""
+        self.entity = entity
+        self.forecast: list[dict[str, Any]] | None = None  # until first push
+        self.humidity_missing = False
+        self.unsub: CALLBACK_TYPE | None = None
+
+
+class ForecastCache:
+    """Apparent temperature forecasts of one sensor."""
+
+    # Forecasts of weather entities are subscribed to, so reads are served
+    # from the last pushed forecast without asking the entity again. The result
+    # is calculated again only when a new forecast is pushed or units change,
+    # so repeated reads cost a few comparisons. Entities which can not be
+    # subscribed to are asked on every read and their payloads compared.
+
+    def __init__(self, formula: Formula) -> None:
+        """Class initialization."""
+        self._formula = formula
+        self._cache: dict[tuple[str, str], tuple[ForecastKey, list[dict]]] = {}
+        self._subscriptions: dict[tuple[str, str], _Subscription] = {}
+
+    @callback
+    def async_close(self) -> None:
+        """Unsubscribe from all forecasts."""
+        for subscription in self._subscriptions.values():
+            if subscription.unsub is not None:
+                subscription.unsub()
+        self._subscriptions.clear()
+        self._cache.clear()
+
+    async def async_get(
+        self,
+        hass: HomeAssistant,
+        entity_id: str,
+        forecast_type: str,
+        humidity: float | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return apparent temperature forecast of weather entity."""
+        state = hass.states.get(entity_id)
+        attributes = state.attributes if state is not None else {}
+        temperature_unit = attributes.get(
+            ATTR_WEATHER_TEMPERATURE_UNIT, UnitOfTemperature.CELSIUS
+        )
+        wind_speed_unit = attributes.get(
+            ATTR_WEATHER_WIND_SPEED_UNIT, UnitOfSpeed.METERS_PER_SECOND
+        )
+
+        cache_key = (entity_id, forecast_type)
+        subscription = await self._async_subscribe(hass, entity_id, forecast_type)
+        if subscription is not None and subscription.forecast is not None:
+            # Pushed forecast drops cached result, so only units and fallback
+            # humidity are left to compare
+            forecast = subscription.forecast
+            key: ForecastKey = (
+                temperature_unit,
+                wind_speed_unit,
+                humidity if subscription.humidity_missing else None,
+            )
+        else:
+            forecast = await self._async_fetch(hass, entity_id, forecast_type)
+            key = forecast_key(forecast, temperature_unit, wind_speed_unit, humidity)
+
+        cached = self._cache.get(cache_key)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        result = calculate_forecast(
+            self._formula, forecast, temperature_unit, wind_speed_unit, humidity
+        )
+        self._cache[cache_key] = (key, result)
+        return result
+
+    async def _async_fetch(
+        self, hass: HomeAssistant, entity_id: str, forecast_type: str
+    ) -> list[dict[str, Any]]:
+        """Get forecast from weather entity."""
+        response = await hass.services.async_call(
+            WEATHER_DOMAIN,
+            SERVICE_GET_FORECASTS,
+            {ATTR_ENTITY_ID: entity_id, ATTR_FORECAST_TYPE: forecast_type},
+            blocking=True,
+            return_response=True,
+        )
+        return response.get(entity_id, {}).get(ATTR_FORECAST) or []
+
+    async def _async_subscribe(
+        self, hass: HomeAssistant, entity_id: str, forecast_type: str
+    ) -> _Subscription | None:
+        """Return subscription to forecast of weather entity if it is possible."""
+        # Weather component is loaded already when it has entities
+        from homeassistant.components.weather import (  # noqa: PLC0415
+            DATA_COMPONENT,
+            WeatherEntityFeature,
+        )
+
+        feature = {
+            "daily": WeatherEntityFeature.FORECAST_DAILY,
+            "hourly": WeatherEntityFeature.FORECAST_HOURLY,
+            "twice_daily": WeatherEntityFeature.FORECAST_TWICE_DAILY,
+        }.get(forecast_type)
+        component = hass.data.get(DATA_COMPONENT)
+        entity = component.get_entity(entity_id) if component is not None else None
+        cache_key = (entity_id, forecast_type)
+        subscription = self._subscriptions.get(cache_key)
+        if subscription is not None:
+            if subscription.entity is entity:
+                return subscription
+            # Weather entity was reloaded
+            if subscription.unsub is not None:
+                subscription.unsub()
+            del self._subscriptions[cache_key]
+            self._cache.pop(cache_key, None)
+
+        if (
+            entity is None
+            or feature is None
+            or not (entity.supported_features or 0) & feature
+        ):
+            return None
+
+        subscription = self._subscriptions[cache_key] = _Subscription(entity)
+
+        @callback
+        def _async_forecast_updated(forecast: list[dict[str, Any]] | None) -> None:
+            subscription.forecast = forecast or []
+            subscription.humidity_missing = any(
+                entry.get(ATTR_FORECAST_HUMIDITY) is None
+                for entry in subscription.forecast
+            )
+            self._cache.pop(cache_key, None)
+
+        subscription.unsub = entity.async_subscribe_forecast(
+            forecast_type, _async_forecast_updated
+        )
+        # Push the current forecast
+        await entity.async_update_listeners({forecast_type})
+        return subscription
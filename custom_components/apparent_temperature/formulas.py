@@ -0,0 +1,270 @@
+"""
+Apparent temperature formulas for apparent_temperature.
+
+Every formula takes temperature in °C, relative humidity in % and wind speed
+in m/s and returns temperature in °C. Scalar functions are used by sensors;
+batch functions take NumPy arrays and are used for bulk calculations.
+"""
+
+import math
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Final
+
+from .const import (
+    FORMULA_AUSTRALIAN,
+    FORMULA_FEELS_LIKE,
+    FORMULA_HEAT_INDEX,
+    FORMULA_HUMIDEX,
+    FORMULA_WIND_CHILL,
+)
+
+# NumPy is slow to import and sensors use scalar functions only, so it is
+# imported by batch functions when they are called
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import ArrayLike, NDArray
+
+# Heat index is defined for temperatures from 80 °F (26.7 °C)
+HEAT_INDEX_MIN_TEMPERATURE: Final = 80.0  # °F
+# Wind chill is defined for temperatures up to 10 °C and winds above 4.8 km/h
+WIND_CHILL_MAX_TEMPERATURE: Final = 10.0  # °C
+WIND_CHILL_MIN_WIND_SPEED: Final = 4.8  # km/h
+
+# Cached calculations are shared by all sensors
+CALCULATION_CACHE_SIZE: Final = 1024
+# Input values are quantized to 1/100 of their units for caching
+CALCULATION_QUANTUM: Final = 100
+
+
+@dataclass(frozen=True, slots=True)
+class Formula:
+    """Apparent temperature formula."""
+
+    name: str
+    calculate: Callable[[float, float, float], float]
+    calculate_batch: Callable[
+        ["ArrayLike", "ArrayLike", "ArrayLike"], "NDArray[np.float64]"
+    ]
+
+
+def _as_arrays(*values: "ArrayLike") -> "list[NDArray[np.float64]]":
+    """Convert values to broadcasted float arrays."""
+    import numpy as np  # noqa: PLC0415
+
+    return np.broadcast_arrays(
+        *(np.asarray(value, dtype=np.float64) for value in values)
+    )
+
+
+def vapor_pressure(temperature: float, humidity: float) -> float:
+    """Calculate water vapor pressure (in hPa)."""
+    return humidity * 0.06105 * math.exp((17.27 * temperature) / (237.7 + temperature))
+
+
+def australian(temperature: float, humidity: float, wind_speed: float) -> float:
+    """Calculate Australian BoM apparent temperature."""
+    e_value = vapor_pressure(temperature, humidity)
+    return temperature + 0.348 * e_value - 0.7 * wind_speed - 4.25
+
+
+def australian_batch(
+    temperature: "ArrayLike", humidity: "ArrayLike", wind_speed: "ArrayLike"
+) -> "NDArray[np.float64]":
+    """Calculate Australian BoM apparent temperature for arrays of values."""
+    import numpy as np  # noqa: PLC0415
+
+    temp, humd, wind = _as_arrays(temperature, humidity, wind_speed)
+    e_value = humd * 0.06105 * np.exp((17.27 * temp) / (237.7 + temp))
+    return temp + 0.348 * e_value - 0.7 * wind - 4.25
+
+
+def heat_index(
+    temperature: float,
+    humidity: float,
+    wind_speed: float,  # noqa: ARG001
+) -> float:
+    """Calculate NWS heat index."""
+    temp = temperature * 1.8 + 32  # °F
+    index = 0.5 * (temp + 61.0 + (temp - 68.0) * 1.2 + humidity * 0.094)
+    if (index + temp) / 2 >= HEAT_INDEX_MIN_TEMPERATURE:
+        index = (
+            -42.379
+            + 2.04901523 * temp
+            + 10.14333127 * humidity
+            - 0.22475541 * temp * humidity
+            - 0.00683783 * temp * temp
+            - 0.05481717 * humidity * humidity
+            + 0.00122874 * temp * temp * humidity
+            + 0.00085282 * temp * humidity * humidity
+            - 0.00000199 * temp * temp * humidity * humidity
+        )
+        if humidity < 13 and 80 <= temp <= 112:  # noqa: PLR2004
+            index -= ((13 - humidity) / 4) * math.sqrt((17 - abs(temp - 95)) / 17)
+        elif humidity > 85 and 80 <= temp <= 87:  # noqa: PLR2004
+            index += ((humidity - 85) / 10) * ((87 - temp) / 5)
+    return (index - 32) / 1.8
+
+
+def heat_index_batch(
+    temperature: "ArrayLike",
+    humidity: "ArrayLike",
+    wind_speed: "ArrayLike",  # noqa: ARG001
+) -> "NDArray[np.float64]":
+    """Calculate NWS heat index for arrays of values."""
+    import numpy as np  # noqa: PLC0415
+
+    temp, humd = _as_arrays(temperature, humidity)
+    temp = temp * 1.8 + 32  # °F
+    simple = 0.5 * (temp + 61.0 + (temp - 68.0) * 1.2 + humd * 0.094)
+    index = (
+        -42.379
+        + 2.04901523 * temp
+        + 10.14333127 * humd
+        - 0.22475541 * temp * humd
+        - 0.00683783 * temp * temp
+        - 0.05481717 * humd * humd
+        + 0.00122874 * temp * temp * humd
+        + 0.00085282 * temp * humd * humd
+        - 0.00000199 * temp * temp * humd * humd
+    )
+    dry = (humd < 13) & (temp >= 80) & (temp <= 112)  # noqa: PLR2004
+    wet = (humd > 85) & (temp >= 80) & (temp <= 87)  # noqa: PLR2004
+    with np.errstate(invalid="ignore"):
+        index = np.where(
+            dry,
+            index - ((13 - humd) / 4) * np.sqrt((17 - np.abs(temp - 95)) / 17),
+            index,
+        )
+    index = np.where(wet, index + ((humd - 85) / 10) * ((87 - temp) / 5), index)
+    index = np.where((simple + temp) / 2 >= HEAT_INDEX_MIN_TEMPERATURE, index, simple)
+    return (index - 32) / 1.8
+
+
+def wind_chill(
+    temperature: float,
+    humidity: float,  # noqa: ARG001
+    wind_speed: float,
+) -> float:
+    """Calculate JAG/TI wind chill index."""
+    wind = wind_speed * 3.6  # km/h
+    if temperature > WIND_CHILL_MAX_TEMPERATURE or wind <= WIND_CHILL_MIN_WIND_SPEED:
+        return temperature
+
+    wind = wind**0.16
+    return 13.12 + 0.6215 * temperature - 11.37 * wind + 0.3965 * temperature * wind
+
+
+def wind_chill_batch(
+    temperature: "ArrayLike",
+    humidity: "ArrayLike",  # noqa: ARG001
+    wind_speed: "ArrayLike",
+) -> "NDArray[np.float64]":
+    """Calculate JAG/TI wind chill index for arrays of values."""
+    import numpy as np  # noqa: PLC0415
+
+    temp, wind = _as_arrays(temperature, wind_speed)
+    wind = wind * 3.6  # km/h
+    applicable = (temp <= WIND_CHILL_MAX_TEMPERATURE) & (
+        wind > WIND_CHILL_MIN_WIND_SPEED
+    )
+    with np.errstate(invalid="ignore"):
+        wind = wind**0.16
+    index = 13.12 + 0.6215 * temp - 11.37 * wind + 0.3965 * temp * wind
+    return np.where(applicable, index, temp)
+
+
+def humidex(
+    temperature: float,
+    humidity: float,
+    wind_speed: float,  # noqa: ARG001
+) -> float:
+    """Calculate Canadian humidex."""
+    e_value = vapor_pressure(temperature, humidity)
+    return temperature + 0.5555 * (e_value - 10.0)
+
+
+def humidex_batch(
+    temperature: "ArrayLike",
+    humidity: "ArrayLike",
+    wind_speed: "ArrayLike",  # noqa: ARG001
+) -> "NDArray[np.float64]":
+    """Calculate Canadian humidex for arrays of values."""
+    import numpy as np  # noqa: PLC0415
+
+    temp, humd = _as_arrays(temperature, humidity)
+    e_value = humd * 0.06105 * np.exp((17.27 * temp) / (237.7 + temp))
+    return temp + 0.5555 * (e_value - 10.0)
+
+
+def feels_like(temperature: float, humidity: float, wind_speed: float) -> float:
+    """
+    Calculate "feels like" temperature.
+
+    Heat index is used in hot weather, wind chill in cold windy weather
+    and air temperature itself otherwise.
+    """
+    if temperature * 1.8 + 32 >= HEAT_INDEX_MIN_TEMPERATURE:
+        return heat_index(temperature, humidity, wind_speed)
+    return wind_chill(temperature, humidity, wind_speed)
+
+
+def feels_like_batch(
+    temperature: "ArrayLike", humidity: "ArrayLike", wind_speed: "ArrayLike"
+) -> "NDArray[np.float64]":
+    """Calculate "feels like" temperature for arrays of values."""
+    import numpy as np  # noqa: PLC0415
+
+    temp, humd, wind = _as_arrays(temperature, humidity, wind_speed)
+    return np.where(
+        temp * 1.8 + 32 >= HEAT_INDEX_MIN_TEMPERATURE,
+        heat_index_batch(temp, humd, wind),
+        wind_chill_batch(temp, humd, wind),
+    )
+
+
+FORMULAS: Final[dict[str, Formula]] = {
+    formula.name: formula
+    for formula in (
+        Formula(FORMULA_AUSTRALIAN, australian, australian_batch),
+        Formula(FORMULA_HEAT_INDEX, heat_index, heat_index_batch),
+        Formula(FORMULA_WIND_CHILL, wind_chill, wind_chill_batch),
+        Formula(FORMULA_HUMIDEX, humidex, humidex_batch),
+        Formula(FORMULA_FEELS_LIKE, feels_like, feels_like_batch),
+    )
+}
+
+
+@lru_cache(maxsize=CALCULATION_CACHE_SIZE)
+def _calculate_quantized(
+    formula: str, temperature: int, humidity: int, wind_speed: int
+) -> tuple[float, float]:
+    """Calculate apparent temperature and vapor pressure from quantized values."""
+    temp = temperature / CALCULATION_QUANTUM
+    humd = humidity / CALCULATION_QUANTUM
+    wind = wind_speed / CALCULATION_QUANTUM
+    return FORMULAS[formula].calculate(temp, humd, wind), vapor_pressure(temp, humd)
+
+
+def calculate_cached(
+    formula: str, temperature: float, humidity: float, wind_speed: float
+) -> tuple[float, float]:
+    """
+    Calculate apparent temperature and vapor pressure (in hPa) using cache.
+
+    Sensors which share sources calculate the same values, so values are
+    quantized and the results are kept in a cache shared by all sensors.
+    """
+    return _calculate_quantized(
+        formula,
+        round(temperature * CALCULATION_QUANTUM),
+        round(humidity * CALCULATION_QUANTUM),
+        round(wind_speed * CALCULATION_QUANTUM),
+    )
+
+
+def calculation_cache_info() -> tuple[int, int]:
+    """Return numbers of hits and misses of calculation cache."""
+    info = _calculate_quantized.cache_info()
+    return info.hits, info.misses
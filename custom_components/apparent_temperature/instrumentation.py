@@ -0,0 +1,54 @@
+"""Runtime instrumentation of apparent_temperature sensors."""
+
+from collections import deque
+from typing import Any, Final
+
+from .const import (
+    ATTR_COALESCED,
+    ATTR_LATENCY_P50,
+    ATTR_LATENCY_P99,
+    ATTR_SKIPPED,
+    ATTR_UPDATES,
+)
+
+LATENCY_SAMPLES: Final = 1024
+
+
+def percentile(samples: list[int], quantile: float) -> int | None:
+    """Return nearest-rank percentile of sorted samples."""
+    if not samples:
+        return None
+    return samples[min(int(len(samples) * quantile), len(samples) - 1)]
+
+
+class SensorStats:
+    """Update counters and compute latency of one sensor."""
+
+    # Recording is just a few integer increments and a bounded deque append,
+    # percentiles are calculated only when statistics are read.
+
+    __slots__ = ("_latencies", "coalesced", "skipped", "updates")
+
+    def __init__(self, samples: int = LATENCY_SAMPLES) -> None:
+        """Class initialization."""
+        self.updates = 0
+        self.coalesced = 0
+        self.skipped = 0
+        self._latencies: deque[int] = deque(maxlen=samples)  # ns
+
+    def add_latency(self, latency: int) -> None:
+        """Record compute latency (in ns) of one update."""
+        self._latencies.append(latency)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return statistics as dictionary."""
+        samples = sorted(self._latencies)
+        p50 = percentile(samples, 0.5)
+        p99 = percentile(samples, 0.99)
+        return {
+            ATTR_UPDATES: self.updates,
+            ATTR_COALESCED: self.coalesced,
+            ATTR_SKIPPED: self.skipped,
+            ATTR_LATENCY_P50: None if p50 is None else p50 / 1_000_000,  # ms
+            ATTR_LATENCY_P99: None if p99 is None else p99 / 1_000_000,  # ms
+        }
@@ -0,0 +1,79 @@
+"""Configuration schemas for apparent_temperature."""
+
+from typing import Final
+
+import voluptuous as vol
+from homeassistant.const import CONF_EXCLUDE, CONF_NAME, CONF_SOURCE, CONF_UNIQUE_ID
+from homeassistant.helpers import config_validation as cv
+
+from .aggregate import AGGREGATES
+from .comfort import DERIVED
+from .const import (
+    AGGREGATE_LAST,
+    CONF_AGGREGATE,
+    CONF_AREAS,
+    CONF_COALESCE_WINDOW,
+    CONF_DERIVED,
+    CONF_FORMULA,
+    CONF_HEARTBEAT,
+    CONF_HYSTERESIS,
+    CONF_INSTRUMENTATION,
+    CONF_MAX_AGE,
+    CONF_MIN_CHANGE,
+    CONF_SENSORS,
+    CONF_SOURCE_VALUES,
+    CONF_WINDOWS,
+    DEFAULT_FORMULA,
+    SOURCE_VALUES_HIDDEN,
+    SOURCE_VALUES_RECORDED,
+    SOURCE_VALUES_UNRECORDED,
+)
+from .formulas import FORMULAS
+
+SENSOR_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(CONF_SOURCE): cv.entity_ids,
+        vol.Optional(CONF_NAME): cv.string,
+        vol.Optional(CONF_UNIQUE_ID): cv.string,
+        vol.Optional(CONF_FORMULA, default=DEFAULT_FORMULA): vol.In(FORMULAS),
+        vol.Optional(CONF_COALESCE_WINDOW, default=0): cv.positive_int,
+        vol.Optional(CONF_MIN_CHANGE, default=0): cv.positive_float,
+        vol.Optional(CONF_HYSTERESIS, default=0): cv.positive_float,
+        vol.Optional(CONF_HEARTBEAT): cv.positive_time_period,
+        vol.Optional(CONF_MAX_AGE): cv.positive_time_period,
+        vol.Optional(CONF_SOURCE_VALUES, default=SOURCE_VALUES_RECORDED): vol.In(
+            [SOURCE_VALUES_RECORDED, SOURCE_VALUES_UNRECORDED, SOURCE_VALUES_HIDDEN]
+        ),
+        vol.Optional(CONF_INSTRUMENTATION, default=False): cv.boolean,
+        vol.Optional(CONF_AGGREGATE, default=AGGREGATE_LAST): vol.In(
+            [AGGREGATE_LAST, *AGGREGATES]
+        ),
+        vol.Optional(CONF_WINDOWS, default=[]): vol.All(
+            cv.ensure_list, [cv.positive_time_period]
+        ),
+        vol.Optional(CONF_DERIVED, default=[]): vol.All(
+            cv.ensure_list, [vol.In(DERIVED)]
+        ),
+    }
+)
+
+AREAS_SCHEMA: Final = vol.Schema(
+    {
+        vol.Optional(CONF_FORMULA, default=DEFAULT_FORMULA): vol.In(FORMULAS),
+        vol.Optional(CONF_EXCLUDE, default=[]): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+INTEGRATION_SCHEMA: Final = vol.Any(
+    vol.Schema(
+        {
+            vol.Optional(CONF_SENSORS, default=[]): vol.All(
+                cv.ensure_list, [SENSOR_SCHEMA]
+            ),
+            # Empty "areas:" key enables discovery with default options
+            vol.Optional(CONF_AREAS): vol.All(lambda value: value or {}, AREAS_SCHEMA),
+        }
+    ),
+    # Plain list of sensors
+    vol.All(cv.ensure_list, [SENSOR_SCHEMA], lambda sensors: {CONF_SENSORS: sensors}),
+)
@@ -1,79 +1,173 @@
 """Sensor platform for apparent_temperature."""
 
+import asyncio
 import logging
-import math
+import time
 from collections.abc import Mapping
-from typing import Any
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Final
 
 import voluptuous as vol
-from homeassistant.components.climate import (
-    ATTR_CURRENT_HUMIDITY,
-    ATTR_CURRENT_TEMPERATURE,
-)
-from homeassistant.components.climate import (
-    DOMAIN as CLIMATE_DOMAIN,
-)
-from homeassistant.components.group import expand_entity_ids
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
+    SensorExtraStoredData,
     SensorStateClass,
 )
-from homeassistant.components.weather import (
-    ATTR_WEATHER_HUMIDITY,
-    ATTR_WEATHER_TEMPERATURE,
-    ATTR_WEATHER_TEMPERATURE_UNIT,
-    ATTR_WEATHER_WIND_SPEED,
-    ATTR_WEATHER_WIND_SPEED_UNIT,
-)
-from homeassistant.components.weather import (
-    DOMAIN as WEATHER_DOMAIN,
-)
 from homeassistant.const import (
-    ATTR_DEVICE_CLASS,
-    ATTR_UNIT_OF_MEASUREMENT,
+    CONF_EXCLUDE,
     CONF_NAME,
     CONF_SOURCE,
     CONF_UNIQUE_ID,
-    EVENT_HOMEASSISTANT_START,
-    PERCENTAGE,
-    STATE_UNAVAILABLE,
-    STATE_UNKNOWN,
-    UnitOfSpeed,
+    EVENT_HOMEASSISTANT_STOP,
+    EntityCategory,
     UnitOfTemperature,
+    UnitOfTime,
 )
 from homeassistant.core import (
+    CALLBACK_TYPE,
     Event,
+    EventStateChangedData,
+    HassJob,
     HomeAssistant,
-    State,
+    ServiceResponse,
+    SupportsResponse,
     callback,
     split_entity_id,
 )
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import area_registry as ar
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_platform
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+)
+from homeassistant.helpers.start import async_at_start
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType, UndefinedType
-from homeassistant.util.unit_conversion import SpeedConverter, TemperatureConverter
+from homeassistant.util import dt as dt_util
 
+from .aggregate import Aggregate
+from .comfort import COMFORT_CATEGORIES, derived_values
 from .const import (
+    AGGREGATE_LAST,
+    AGGREGATE_MEAN,
+    ATTR_CACHE_HITS,
+    ATTR_CACHE_MISSES,
+    ATTR_DECODE_FAILURES,
+    ATTR_END_TIME,
+    ATTR_FORECAST,
+    ATTR_FORECAST_TYPE,
     ATTR_HUMIDITY_SOURCE,
     ATTR_HUMIDITY_SOURCE_VALUE,
+    ATTR_LATENCY_P99,
+    ATTR_MAX,
+    ATTR_MEAN,
+    ATTR_MIN,
+    ATTR_START_TIME,
     ATTR_TEMPERATURE_SOURCE,
     ATTR_TEMPERATURE_SOURCE_VALUE,
     ATTR_WIND_SPEED_SOURCE,
     ATTR_WIND_SPEED_SOURCE_VALUE,
+    CONF_AGGREGATE,
+    CONF_AREAS,
+    CONF_COALESCE_WINDOW,
+    CONF_DERIVED,
+    CONF_FORMULA,
+    CONF_HEARTBEAT,
+    CONF_HYSTERESIS,
+    CONF_INSTRUMENTATION,
+    CONF_MAX_AGE,
+    CONF_MIN_CHANGE,
+    CONF_SENSORS,
+    CONF_SOURCE_VALUES,
+    CONF_WINDOWS,
+    DEFAULT_FORMULA,
+    DERIVED_ABSOLUTE_HUMIDITY,
+    DERIVED_COMFORT,
+    DERIVED_DEW_POINT,
+    DERIVED_HEAT_INDEX,
+    DERIVED_WIND_CHILL,
+    DOMAIN,
+    ROLE_HUMIDITY,
+    ROLE_TEMPERATURE,
+    ROLE_WIND_SPEED,
+    SERVICE_BACKFILL,
+    SERVICE_GET_FORECASTS,
+    SOURCE_VALUES_HIDDEN,
+    SOURCE_VALUES_UNRECORDED,
     STARTUP_MESSAGE,
+    WEATHER_DOMAIN,
 )
+from .coordinator import async_get_coordinator
+from .discovery import AreaIndex
+from .forecast import ForecastCache
+from .formulas import FORMULAS, calculate_cached, calculation_cache_info
+from .instrumentation import SensorStats
+from .schema import SENSOR_SCHEMA
+from .source import SourceValues, expand_source, source_roles
+from .window import RollingWindow, window_name
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORM_SCHEMA = cv.PLATFORM_SCHEMA.extend(
-    {
-        vol.Required(CONF_SOURCE): cv.entity_ids,
-        vol.Optional(CONF_NAME): cv.string,
-        vol.Optional(CONF_UNIQUE_ID): cv.string,
-    }
-)
+FORECAST_TYPES: Final = ("daily", "hourly", "twice_daily")
+
+DERIVED_DESCRIPTIONS: dict[str, SensorEntityDescription] = {
+    description.key: description
+    for description in (
+        SensorEntityDescription(
+            key=DERIVED_DEW_POINT,
+            name="Dew Point",
+            icon="mdi:thermometer-water",
+            device_class=SensorDeviceClass.TEMPERATURE,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+            suggested_display_precision=1,
+        ),
+        SensorEntityDescription(
+            key=DERIVED_ABSOLUTE_HUMIDITY,
+            name="Absolute Humidity",
+            icon="mdi:water",
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement="g/m³",
+            suggested_display_precision=1,
+        ),
+        SensorEntityDescription(
+            key=DERIVED_HEAT_INDEX,
+            name="Heat Index",
+            icon="mdi:sun-thermometer",
+            device_class=SensorDeviceClass.TEMPERATURE,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+            suggested_display_precision=1,
+        ),
+        SensorEntityDescription(
+            key=DERIVED_WIND_CHILL,
+            name="Wind Chill",
+            icon="mdi:snowflake-thermometer",
+            device_class=SensorDeviceClass.TEMPERATURE,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+            suggested_display_precision=1,
+        ),
+        SensorEntityDescription(
+            key=DERIVED_COMFORT,
+            name="Comfort",
+            icon="mdi:emoticon-outline",
+            device_class=SensorDeviceClass.ENUM,
+            options=[category for category, _ in COMFORT_CATEGORIES],
+        ),
+    )
+}
+
+PLATFORM_SCHEMA = cv.PLATFORM_SCHEMA.extend(SENSOR_SCHEMA.schema)
 
 
 # pylint: disable=unused-argument
@@ -81,24 +175,83 @@ async def async_setup_platform(
     hass: HomeAssistant,
     config: ConfigType,
     async_add_entities: AddEntitiesCallback,
-    discovery_info: DiscoveryInfoType | None = None,  # noqa: ARG001
+    discovery_info: DiscoveryInfoType | None = None,
 ) -> None:
-    """Set up the Car Wash sensor."""
+    """Set up the Apparent Temperature sensors."""
     # Print startup message
     _LOGGER.info(STARTUP_MESSAGE)
 
-    async_add_entities(
-        [
-            ApparentTemperatureSensor(
-                config.get(CONF_UNIQUE_ID),
-                config.get(CONF_NAME),
-                expand_entity_ids(hass, config.get(CONF_SOURCE)),
-            )
-        ]
+    # Sensors declared in integration configuration are already validated
+    # and come as one list, so all of them are added at once
+    configs = [config] if discovery_info is None else discovery_info[CONF_SENSORS]
+    entities: list[SensorEntity] = []
+    for sensor_config in configs:
+        sensor = _create_sensor(sensor_config)
+        entities.append(sensor)
+        entities.extend(sensor.derived)
+        if sensor.stats is not None:
+            entities.append(UpdateLatencySensor(sensor))
+    if discovery_info is not None and CONF_AREAS in discovery_info:
+        areas = AreaSensors(hass, discovery_info[CONF_AREAS], async_add_entities)
+        entities.extend(areas.async_setup())
+    async_add_entities(entities)
+
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_BACKFILL,
+        {
+            vol.Required(ATTR_START_TIME): cv.datetime,
+            vol.Optional(ATTR_END_TIME): cv.datetime,
+        },
+        "async_backfill",
     )
+    platform.async_register_entity_service(
+        SERVICE_GET_FORECASTS,
+        {vol.Required(ATTR_FORECAST_TYPE): vol.In(FORECAST_TYPES)},
+        "async_get_forecasts",
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def _create_sensor(config: ConfigType) -> "ApparentTemperatureSensor":
+    """Create sensor from its configuration."""
+    sensor_class = (
+        UnrecordedApparentTemperatureSensor
+        if config[CONF_SOURCE_VALUES] == SOURCE_VALUES_UNRECORDED
+        else ApparentTemperatureSensor
+    )
+    return sensor_class(
+        config.get(CONF_UNIQUE_ID),
+        config.get(CONF_NAME),
+        config[CONF_SOURCE],
+        formula=config[CONF_FORMULA],
+        coalesce_window=config[CONF_COALESCE_WINDOW] / 1000,
+        min_change=config[CONF_MIN_CHANGE],
+        hysteresis=config[CONF_HYSTERESIS],
+        heartbeat=config.get(CONF_HEARTBEAT),
+        max_age=config.get(CONF_MAX_AGE),
+        source_values=config[CONF_SOURCE_VALUES] != SOURCE_VALUES_HIDDEN,
+        instrumentation=config[CONF_INSTRUMENTATION],
+        aggregate=config[CONF_AGGREGATE],
+        windows=config[CONF_WINDOWS],
+        derived=config[CONF_DERIVED],
+    )
+
 
+@dataclass
+class ApparentTemperatureExtraStoredData(SensorExtraStoredData):
+    """Object to hold extra stored data of apparent temperature sensor."""
 
-class ApparentTemperatureSensor(SensorEntity):
+    windows: dict[str, list[list[float]]]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the sensor data."""
+        data = super().as_dict()
+        data["windows"] = self.windows
+        return data
+
+
+class ApparentTemperatureSensor(RestoreSensor):
     """Apparent Temperature Sensor class."""
 
     _attr_has_entity_name = True
@@ -109,15 +262,56 @@ class ApparentTemperatureSensor(SensorEntity):
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_suggested_display_precision = 1
 
-    def __init__(
-        self, unique_id: str | None, name: str | None, sources: list[str]
+    def __init__(  # noqa: PLR0913
+        self,
+        unique_id: str | None,
+        name: str | None,
+        sources: list[str],
+        *,
+        formula: str = DEFAULT_FORMULA,
+        coalesce_window: float = 0,
+        min_change: float = 0,
+        hysteresis: float = 0,
+        heartbeat: timedelta | None = None,
+        max_age: timedelta | None = None,
+        source_values: bool = True,
+        instrumentation: bool = False,
+        aggregate: str = AGGREGATE_LAST,
+        windows: list[timedelta] | None = None,
+        derived: list[str] | None = None,
+        roles: dict[str, tuple[str, ...]] | None = None,
     ) -> None:
         """Class initialization."""
         self._attr_unique_id = unique_id
         self._attr_native_value = None
 
         self._name = name
-        self._sources = sources
+        self._default_name: str | None = None
+        self._sources = sources  # as configured, groups are expanded on setup
+        self._formula = FORMULAS[formula]
+        self._forecasts = ForecastCache(self._formula)
+
+        self._members: dict[str, list[str]] = {}
+        self._groups: dict[str, set[str]] = {}
+        # Roles known in advance are kept, other ones are cached on first state
+        self._roles: dict[str, tuple[str, ...]] = dict(roles or {})
+        self._entities: list[str] = []
+        self._unsub_groups: CALLBACK_TYPE | None = None
+
+        self._coalesce_window = coalesce_window  # seconds
+        self._coalesce_job = HassJob(
+            self._async_coalesced_update, cancel_on_shutdown=True
+        )
+        self._unsub_coalesce: CALLBACK_TYPE | None = None
+
+        self._min_change = min_change
+        self._hysteresis = hysteresis
+        self._heartbeat = heartbeat
+        self._max_age = None if max_age is None else max_age.total_seconds()
+        self._expired: set[str] = set()
+        self._written_value: float | None = None
+        self._written_at: datetime | None = None
+        self._written_direction = 0
 
         self._temp = None
         self._humd = None
@@ -125,6 +319,29 @@ class ApparentTemperatureSensor(SensorEntity):
         self._temp_val = None
         self._humd_val = None
         self._wind_val = None
+        # Several sources of each role are combined if aggregate is set
+        self._aggregates: dict[str, Aggregate] | None = (
+            None
+            if aggregate == AGGREGATE_LAST
+            else {
+                role: Aggregate(aggregate)
+                for role in (ROLE_TEMPERATURE, ROLE_HUMIDITY, ROLE_WIND_SPEED)
+            }
+        )
+
+        self._source_values = source_values
+        self._source_attributes: Mapping[str, Any] = {}
+        self._update_source_attributes()
+
+        self._stats = SensorStats() if instrumentation else None
+        self._windows = {
+            window_name(period.total_seconds()): RollingWindow(period.total_seconds())
+            for period in windows or ()
+        }
+        self._derived = [
+            DerivedSensor(self, DERIVED_DESCRIPTIONS[kind])
+            for kind in dict.fromkeys(derived or ())
+        ]
 
     @staticmethod
     def _compose_name(source_name: str) -> str:
@@ -141,206 +358,764 @@ class ApparentTemperatureSensor(SensorEntity):
         """Return the name of the sensor."""
         if self._name:
             return self._name
+        if self._default_name is not None:
+            return self._default_name
+
+        if self.hass is None:
+            return self._compose_name(split_entity_id(self._sources[0])[1])
+
+        # Name is kept stable even if group members change later
+        sources = [
+            member
+            for source in self._sources
+            for member in expand_source(self.hass, source)[0]
+        ] or self._sources
+        self._default_name = self._compose_name(split_entity_id(sources[0])[1])
+        return self._default_name
+
+    @property
+    def stats(self) -> SensorStats | None:
+        """Return update statistics if instrumentation is enabled."""
+        return self._stats
+
+    @property
+    def derived(self) -> list["DerivedSensor"]:
+        """Return sensors of values derived from the same sources."""
+        return self._derived
 
-        return self._compose_name(split_entity_id(self._sources[0])[1])
+    @property
+    def decode_failures(self) -> int:
+        """Return number of source values which could not be decoded."""
+        coordinator = async_get_coordinator(self.hass)
+        return sum(
+            coordinator.async_get_decode_failures(entity_id)
+            for entity_id in self._entities
+        )
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
         """Return entity specific state attributes."""
-        return {
+        if not self._source_values and not self._windows:
+            return self._source_attributes
+
+        attributes = dict(self._source_attributes)
+        if self._source_values:
+            attributes[ATTR_TEMPERATURE_SOURCE_VALUE] = self._temp_val
+            attributes[ATTR_HUMIDITY_SOURCE_VALUE] = self._humd_val
+            attributes[ATTR_WIND_SPEED_SOURCE_VALUE] = self._wind_val
+        if self._windows:
+            now = dt_util.utcnow().timestamp()
+            for name, window in self._windows.items():
+                (
+                    attributes[f"{ATTR_MIN}_{name}"],
+                    attributes[f"{ATTR_MAX}_{name}"],
+                    attributes[f"{ATTR_MEAN}_{name}"],
+                ) = window.stats(now)
+        return attributes
+
+    @property
+    def extra_restore_state_data(self) -> ApparentTemperatureExtraStoredData:
+        """Return sensor specific state data to be restored."""
+        return ApparentTemperatureExtraStoredData(
+            self.native_value,
+            self.native_unit_of_measurement,
+            {name: window.as_list() for name, window in self._windows.items()},
+        )
+
+    def _update_source_attributes(self) -> None:
+        """Update cached mapping of source entities attributes."""
+        if self._aggregates is not None:
+            temp, humd, wind = (
+                [entity_id for entity_id in self._entities if entity_id in aggregate]
+                or None
+                for aggregate in self._aggregates.values()
+            )
+            self._source_attributes = {
+                ATTR_TEMPERATURE_SOURCE: temp,
+                ATTR_HUMIDITY_SOURCE: humd,
+                ATTR_WIND_SPEED_SOURCE: wind,
+            }
+            return
+
+        self._source_attributes = {
             ATTR_TEMPERATURE_SOURCE: self._temp,
-            ATTR_TEMPERATURE_SOURCE_VALUE: self._temp_val,
             ATTR_HUMIDITY_SOURCE: self._humd,
-            ATTR_HUMIDITY_SOURCE_VALUE: self._humd_val,
             ATTR_WIND_SPEED_SOURCE: self._wind,
-            ATTR_WIND_SPEED_SOURCE_VALUE: self._wind_val,
         }
 
     def _setup_sources(self) -> list[str]:
         """Set sources for entity and return list of sources to track."""
-        entities = set()
-        for entity_id in self._sources:
-            state: State = self.hass.states.get(entity_id)
-            domain = split_entity_id(state.entity_id)[0]
-            device_class = state.attributes.get(ATTR_DEVICE_CLASS)
-            unit_of_measurement = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
-
-            if domain == WEATHER_DOMAIN:
-                self._temp = entity_id
-                self._humd = entity_id
-                self._wind = entity_id
-                entities.add(entity_id)
-            elif domain == CLIMATE_DOMAIN:
-                self._temp = entity_id
-                self._humd = entity_id
-                entities.add(entity_id)
-            elif (
-                device_class == SensorDeviceClass.TEMPERATURE
-                or unit_of_measurement in UnitOfTemperature
-            ):
-                self._temp = entity_id
-                entities.add(entity_id)
-            elif (
-                device_class == SensorDeviceClass.HUMIDITY
-                or unit_of_measurement == PERCENTAGE
-            ):
-                self._humd = entity_id
-                entities.add(entity_id)
-            elif unit_of_measurement in UnitOfSpeed:
-                self._wind = entity_id
-                entities.add(entity_id)
-            elif entity_id.find("temperature") >= 0:
-                self._temp = entity_id
-                entities.add(entity_id)
-            elif entity_id.find("humidity") >= 0:
-                self._humd = entity_id
-                entities.add(entity_id)
-            elif entity_id.find("wind") >= 0:
-                self._wind = entity_id
-                entities.add(entity_id)
-
-        return list(entities)
+        self._members.clear()
+        self._groups.clear()
+        for source in self._sources:
+            self._expand_source(source)
 
-    async def async_added_to_hass(self) -> None:
-        """Register callbacks."""
+        return self._assign_roles()
 
-        # pylint: disable=unused-argument
-        @callback
-        def sensor_state_listener(event: Event) -> None:  # noqa: ARG001
-            """Handle device state changes."""
-            self.async_schedule_update_ha_state(force_refresh=True)
+    def _expand_source(self, source: str, *, cached: bool = True) -> bool:
+        """Expand configured source into members and return True if they changed."""
+        if cached:
+            coordinator = async_get_coordinator(self.hass)
+            members, groups = coordinator.async_expand_source(source)
+        else:
+            members, groups = expand_source(self.hass, source)
+        for sources in self._groups.values():
+            sources.discard(source)
+        for group in groups:
+            self._groups.setdefault(group, set()).add(source)
+        self._groups = {group: item for group, item in self._groups.items() if item}
+
+        changed = members != self._members.get(source)
+        self._members[source] = members
+        return changed
+
+    def _source_roles(self, entity_id: str) -> tuple[str, ...]:
+        """Return cached roles of source entity."""
+        if (roles := self._roles.get(entity_id)) is None:
+            if (state := self.hass.states.get(entity_id)) is None:
+                return ()
+            roles = self._roles[entity_id] = source_roles(state)
+        return roles
+
+    def _assign_roles(self) -> list[str]:
+        """Assign source entities to roles and return list of sources to track."""
+        self._temp = self._humd = self._wind = None
+        entities = []
+        for members in self._members.values():
+            for entity_id in members:
+                roles = self._source_roles(entity_id)
+                if ROLE_TEMPERATURE in roles:
+                    self._temp = entity_id
+                if ROLE_HUMIDITY in roles:
+                    self._humd = entity_id
+                if ROLE_WIND_SPEED in roles:
+                    self._wind = entity_id
+                if roles and entity_id not in entities:
+                    entities.append(entity_id)
+
+        self._entities = entities
+        if self._aggregates is not None:
+            self._assign_aggregates()
+        self._update_source_attributes()
+        return entities
+
+    def _assign_aggregates(self) -> None:
+        """Sync aggregates members with source entities."""
+        for role, aggregate in self._aggregates.items():
+            members = {
+                entity_id
+                for entity_id in self._entities
+                if role in self._source_roles(entity_id)
+            }
+            for entity_id in aggregate.members - members:
+                aggregate.remove(entity_id)
+            for entity_id in members - aggregate.members:
+                aggregate.add(entity_id)
+
+    def _aggregate_values(self, entity_id: str, values: SourceValues | None) -> None:
+        """Update aggregates with values of source entity."""
+        if (state := self.hass.states.get(entity_id)) is not None:
+            timestamp = state.last_updated_timestamp
+        else:
+            timestamp = time.time()
+        for role, aggregate in self._aggregates.items():
+            if entity_id in aggregate:
+                aggregate.update(
+                    entity_id,
+                    None if values is None else getattr(values, role),
+                    timestamp,
+                )
+
+    @callback
+    def _async_track_groups(self) -> None:
+        """Track membership changes of group sources."""
+        if self._unsub_groups is not None:
+            self._unsub_groups()
+            self._unsub_groups = None
+        if self._groups:
+            self._unsub_groups = async_track_state_change_event(
+                self.hass, list(self._groups), self._async_group_changed
+            )
+
+    @callback
+    def _async_group_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Update sources affected by group membership change."""
+        groups = set(self._groups)
+        changed = False
+        # Shared expansions may predate this change, so they are not used
+        for source in list(self._groups.get(event.data["entity_id"], ())):
+            changed |= self._expand_source(source, cached=False)
+        if not changed:
+            return
+
+        # Only the difference between old and new members is (un)subscribed
+        old_entities = set(self._entities)
+        entities = self._assign_roles()
+        removed = old_entities.difference(entities)
+        added = [entity_id for entity_id in entities if entity_id not in old_entities]
+        _LOGGER.debug(
+            "Sources of %s changed: added %s, removed %s",
+            self.entity_id,
+            added,
+            removed,
+        )
+
+        coordinator = async_get_coordinator(self.hass)
+        coordinator.async_remove_listener(removed, self._async_source_updated)
+        coordinator.async_add_listener(added, self._async_source_updated)
+        for entity_id in removed:
+            self._roles.pop(entity_id, None)
+            self._async_cancel_expiry(entity_id)
+        for entity_id in added:
+            self._async_schedule_expiry(entity_id)
+        if set(self._groups) != groups:
+            self._async_track_groups()
+
+        self._async_refresh()
+        self._async_write_state()
+
+    async def async_added_to_hass(self) -> None:
+        """Restore last state and register callbacks."""
+        await super().async_added_to_hass()
+        await self._async_restore_state()
 
         # pylint: disable=unused-argument
         @callback
-        def sensor_startup(event: Event) -> None:  # noqa: ARG001
+        def sensor_startup(hass: HomeAssistant) -> None:  # noqa: ARG001
             """Update entity on startup."""
-            async_track_state_change_event(
-                self.hass, self._setup_sources(), sensor_state_listener
+            coordinator = async_get_coordinator(self.hass)
+            coordinator.async_add_listener(
+                self._setup_sources(), self._async_source_updated
+            )
+            self.async_on_remove(
+                lambda: coordinator.async_remove_listener(
+                    self._entities, self._async_source_updated
+                )
             )
+            self._async_track_groups()
 
-            self.async_schedule_update_ha_state(
-                force_refresh=True
-            )  # Force first update
+            # Force first update, sources which have not reported yet keep
+            # their restored values
+            self._async_refresh(keep_missing=True)
+            self._async_write_state()
+            for entity_id in self._entities:
+                self._async_schedule_expiry(entity_id)
 
-        self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START, sensor_startup)
+        # Subscribes right away if Home Assistant is already running
+        self.async_on_remove(async_at_start(self.hass, sensor_startup))
 
-    @staticmethod
-    def _has_state(state: str | None) -> bool:
-        """Return True if state has any value."""
-        return state is not None and state not in [
-            STATE_UNKNOWN,
-            STATE_UNAVAILABLE,
-            "None",
-            "",
-        ]
+    async def _async_restore_state(self) -> None:
+        """Restore last sensor value and source values."""
+        if (last_sensor_data := await self.async_get_last_sensor_data()) is None:
+            return
 
-    def _get_temperature(self, entity_id: str | None) -> float | None:
-        """Get temperature value (in °C) from entity."""
-        if entity_id is None:
-            return None
-        state: State = self.hass.states.get(entity_id)
-        if state is None:
-            return None
+        value = last_sensor_data.native_value
+        self._attr_native_value = value if isinstance(value, int | float) else None
+        self._written_value = self._attr_native_value
+        self._written_at = dt_util.utcnow()
+
+        if (last_state := await self.async_get_last_state()) is not None:
+            attributes = last_state.attributes
+            self._temp_val = attributes.get(ATTR_TEMPERATURE_SOURCE_VALUE)
+            self._humd_val = attributes.get(ATTR_HUMIDITY_SOURCE_VALUE)
+            self._wind_val = attributes.get(ATTR_WIND_SPEED_SOURCE_VALUE)
+
+        if self._windows and (extra := await self.async_get_last_extra_data()):
+            stored = extra.as_dict().get("windows") or {}
+            now = dt_util.utcnow().timestamp()
+            for name, window in self._windows.items():
+                try:
+                    window.restore(stored.get(name, []), now)
+                except (TypeError, ValueError, IndexError):
+                    _LOGGER.warning(
+                        "Could not restore %s window of %s", name, self.name
+                    )
+                    self._windows[name] = RollingWindow(window.period)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel pending updates and stop tracking groups and forecasts."""
+        self._forecasts.async_close()
+        if self._unsub_coalesce is not None:
+            self._unsub_coalesce()
+            self._unsub_coalesce = None
+        if self._unsub_groups is not None:
+            self._unsub_groups()
+            self._unsub_groups = None
+        for entity_id in self._entities:
+            self._async_cancel_expiry(entity_id)
+
+    @callback
+    def _async_schedule_expiry(self, entity_id: str) -> None:
+        """Schedule expiry of source values when source stops updating."""
+        if self._max_age is None:
+            return
+        if (state := self.hass.states.get(entity_id)) is None:
+            self._async_cancel_expiry(entity_id)
+            return
+
+        async_get_coordinator(self.hass).expiry.async_schedule(
+            (self, entity_id),
+            state.last_updated_timestamp + self._max_age,
+            partial(self._async_source_expired, entity_id),
+        )
+
+    @callback
+    def _async_cancel_expiry(self, entity_id: str) -> None:
+        """Cancel expiry of source values."""
+        if self._max_age is not None:
+            async_get_coordinator(self.hass).expiry.async_cancel((self, entity_id))
+
+    @callback
+    def _async_source_expired(self, entity_id: str) -> None:
+        """Handle source which was not updated longer than allowed."""
+        _LOGGER.debug("Values of %s expired for %s", entity_id, self.entity_id)
+        self._expired.add(entity_id)
+        self._async_source_updated(entity_id, None)
+
+    @callback
+    def _async_source_updated(
+        self, entity_id: str, values: SourceValues | None
+    ) -> None:
+        """Handle decoded source values changes."""
+        if self._max_age is not None and values is not None:
+            self._expired.discard(entity_id)
+            self._async_schedule_expiry(entity_id)
 
-        domain = split_entity_id(state.entity_id)[0]
-        if domain == WEATHER_DOMAIN:
-            temperature = state.attributes.get(ATTR_WEATHER_TEMPERATURE)
-            entity_unit = state.attributes.get(ATTR_WEATHER_TEMPERATURE_UNIT)
-        elif domain == CLIMATE_DOMAIN:
-            temperature = state.attributes.get(ATTR_CURRENT_TEMPERATURE)
-            entity_unit = state.attributes.get(ATTR_WEATHER_TEMPERATURE_UNIT)
+        # Only the changed source is decoded, the other ones are taken from cache
+        if self._aggregates is not None:
+            # Only aggregates the changed source is a member of are updated
+            self._aggregate_values(entity_id, values)
+            self._temp_val, self._humd_val, self._wind_val = (
+                aggregate.value for aggregate in self._aggregates.values()
+            )
         else:
-            temperature = state.state
-            entity_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+            if entity_id == self._temp:
+                self._temp_val = None if values is None else values.temperature
+            if entity_id == self._humd:
+                self._humd_val = None if values is None else values.humidity
+            if entity_id == self._wind:
+                self._wind_val = 0.0 if values is None else values.wind_speed
+        if self._stats is not None:
+            self._stats.updates += 1
+
+        if not self._coalesce_window:
+            self._async_update_state()
+        elif self._unsub_coalesce is None:
+            # Changes arriving within the window are written as a single state
+            self._unsub_coalesce = async_call_later(
+                self.hass, self._coalesce_window, self._coalesce_job
+            )
+        elif self._stats is not None:
+            self._stats.coalesced += 1
+
+    # pylint: disable=unused-argument
+    @callback
+    def _async_coalesced_update(self, now: datetime) -> None:  # noqa: ARG002
+        """Recalculate sensor state after coalescing window is over."""
+        self._unsub_coalesce = None
+        self._async_update_state()
+
+    @callback
+    def _async_update_state(self) -> None:
+        """Recalculate sensor state from cached source values and write it."""
+        if self._stats is None:
+            self._async_calculate()
+            self._async_write_state()
+            return
+
+        start = time.perf_counter_ns()
+        self._async_calculate()
+        self._async_write_state()
+        self._stats.add_latency(time.perf_counter_ns() - start)
+
+    def _is_significant_change(self, now: datetime) -> bool:
+        """Return True if sensor state changed enough to be written."""
+        value = self._attr_native_value
+        last = self._written_value
+        if (
+            not (self._min_change or self._hysteresis)
+            or self._written_at is None
+            or (value is None) != (last is None)
+        ):
+            return True
+        if value is None:
+            return False
+        if self._heartbeat is not None and now - self._written_at >= self._heartbeat:
+            return True
+
+        delta = value - last
+        threshold = self._min_change
+        if delta * self._written_direction < 0:
+            # Value reverses its direction
+            threshold += self._hysteresis
+        return delta != 0 and abs(delta) >= threshold
+
+    @callback
+    def _async_write_state(self) -> None:
+        """Write sensor state unless its change is insignificant."""
+        now = dt_util.utcnow()
+        if not self._is_significant_change(now):
+            if self._stats is not None:
+                self._stats.skipped += 1
+            return
 
-        if not self._has_state(temperature):
+        value = self._attr_native_value
+        if value is not None and self._written_value is not None:
+            delta = value - self._written_value
+            if delta:
+                self._written_direction = 1 if delta > 0 else -1
+        self._written_value = value
+        self._written_at = now
+        self.async_write_ha_state()
+
+    def _get_values(self, entity_id: str) -> SourceValues | None:
+        """Get decoded values of source entity."""
+        if entity_id in self._expired:
             return None
+        return async_get_coordinator(self.hass).async_get_values(entity_id)
 
-        try:
-            temperature = TemperatureConverter.convert(
-                float(temperature), entity_unit, UnitOfTemperature.CELSIUS
-            )
-        except ValueError:
-            _LOGGER.exception('Could not convert value "%s" to float', state)
+    def _get_temperature(self, entity_id: str | None) -> float | None:
+        """Get temperature value (in °C) from entity."""
+        if entity_id is None:
+            return None
+        if (values := self._get_values(entity_id)) is None:
             return None
 
-        return float(temperature)
+        return values.temperature
 
     def _get_humidity(self, entity_id: str | None) -> float | None:
         """Get humidity value from entity."""
         if entity_id is None:
             return None
-        state: State = self.hass.states.get(entity_id)
-        if state is None:
+        if (values := self._get_values(entity_id)) is None:
             return None
 
-        domain = split_entity_id(state.entity_id)[0]
-        if domain == WEATHER_DOMAIN:
-            humidity = state.attributes.get(ATTR_WEATHER_HUMIDITY)
-        elif domain == CLIMATE_DOMAIN:
-            humidity = state.attributes.get(ATTR_CURRENT_HUMIDITY)
-        else:
-            humidity = state.state
-
-        if not self._has_state(humidity):
-            return None
-
-        return float(humidity)
+        return values.humidity
 
     def _get_wind_speed(self, entity_id: str | None) -> float | None:
         """Get wind speed value from entity."""
         if entity_id is None:
             return 0.0
-        state: State = self.hass.states.get(entity_id)
-        if state is None:
+        if (values := self._get_values(entity_id)) is None:
             return 0.0
 
-        domain = split_entity_id(state.entity_id)[0]
-        if domain == WEATHER_DOMAIN:
-            wind_speed = state.attributes.get(ATTR_WEATHER_WIND_SPEED)
-            entity_unit = state.attributes.get(ATTR_WEATHER_WIND_SPEED_UNIT)
-        else:
-            wind_speed = state.state
-            entity_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        return values.wind_speed
 
-        if not self._has_state(wind_speed):
-            return None
+    async def async_update(self) -> None:
+        """Update sensor state."""
+        if self._stats is None:
+            self._async_refresh()
+            return
 
-        try:
-            wind_speed = SpeedConverter.convert(
-                float(wind_speed), entity_unit, UnitOfSpeed.METERS_PER_SECOND
+        start = time.perf_counter_ns()
+        self._async_refresh()
+        self._stats.add_latency(time.perf_counter_ns() - start)
+        self._stats.updates += 1
+
+    @callback
+    def _async_refresh(self, *, keep_missing: bool = False) -> None:
+        """Re-read values of all sources and recalculate sensor state."""
+        if self._aggregates is not None:
+            for entity_id in self._entities:
+                self._aggregate_values(entity_id, self._get_values(entity_id))
+            temp, humd, wind = (
+                aggregate.value for aggregate in self._aggregates.values()
             )
-        except ValueError:
-            _LOGGER.exception('Could not convert value "%s" to float', state)
-            return None
+        else:
+            temp = self._get_temperature(self._temp)  # °C
+            humd = self._get_humidity(self._humd)  # %
+            wind = self._get_wind_speed(self._wind)  # m/s
+        if keep_missing:
+            temp = self._temp_val if temp is None else temp
+            humd = self._humd_val if humd is None else humd
+            wind = self._wind_val if wind is None else wind
 
-        return float(wind_speed)
+        self._temp_val, self._humd_val, self._wind_val = temp, humd, wind
+        self._async_calculate()
 
-    async def async_update(self) -> None:
-        """Update sensor state."""
-        self._temp_val = temp = self._get_temperature(self._temp)  # °C
-        self._humd_val = humd = self._get_humidity(self._humd)  # %
-        self._wind_val = wind = self._get_wind_speed(self._wind)  # m/s
+    def _check_single_sources(self) -> None:
+        """Raise error if several sources of the same role are aggregated."""
+        # History and forecasts are calculated from one source of every role
+        if self._aggregates is not None and any(
+            len(aggregate.members) > 1 for aggregate in self._aggregates.values()
+        ):
+            msg = f"{self.entity_id} aggregates several sources of the same role"
+            raise HomeAssistantError(msg)
+
+    async def async_backfill(
+        self, start_time: datetime, end_time: datetime | None = None
+    ) -> None:
+        """Backfill long-term statistics from recorded history of sources."""
+        self._check_single_sources()
+        # Recorder is heavy to import and needed only by this service
+        from .backfill import async_backfill  # noqa: PLC0415
+
+        imported = await async_backfill(
+            self.hass,
+            self.entity_id,
+            {
+                ROLE_TEMPERATURE: self._temp,
+                ROLE_HUMIDITY: self._humd,
+                ROLE_WIND_SPEED: self._wind,
+            },
+            self._formula,
+            start_time=dt_util.as_local(start_time),
+            end_time=dt_util.utcnow()
+            if end_time is None
+            else dt_util.as_local(end_time),
+            unit_of_measurement=self.unit_of_measurement or UnitOfTemperature.CELSIUS,
+        )
+        _LOGGER.info("Backfilled %d hours of %s statistics", imported, self.entity_id)
+
+    async def async_get_forecasts(self, type: str) -> ServiceResponse:  # noqa: A002
+        """Return apparent temperature forecast of weather source."""
+        self._check_single_sources()
+        weather = next(
+            (
+                entity_id
+                for entity_id in (self._temp, *self._entities)
+                if entity_id is not None
+                and split_entity_id(entity_id)[0] == WEATHER_DOMAIN
+            ),
+            None,
+        )
+        if weather is None:
+            msg = f"{self.entity_id} has no weather source"
+            raise HomeAssistantError(msg)
+
+        # Entries without humidity use current humidity
+        return {
+            ATTR_FORECAST: await self._forecasts.async_get(
+                self.hass, weather, type, self._humd_val
+            )
+        }
+
+    @callback
+    def _async_calculate(self) -> None:
+        """Calculate sensor state from cached source values."""
+        temp = self._temp_val
+        humd = self._humd_val
+        wind = self._wind_val
 
         _LOGGER.debug("Temp: %s °C  Hum: %s %%  Wind: %s m/s", temp, humd, wind)
 
+        # Unavailable sources are logged by source coordinator
         if temp is None or humd is None:
-            _LOGGER.warning(
-                "Can't calculate sensor value: some sources are unavailable."
-            )
+            self._attr_available = False
             self._attr_native_value = None
+            for sensor in self._derived:
+                sensor.async_set_value(None)
             return
 
         if wind is None:
-            _LOGGER.warning(
-                "Can't get wind speed value. Wind speed will be ignored in calculation."
-            )
-            wind = 0
+            wind = 0  # Wind speed is ignored in calculation
 
-        e_value = humd * 0.06105 * math.exp((17.27 * temp) / (237.7 + temp))
-        self._attr_native_value = temp + 0.348 * e_value - 0.7 * wind - 4.25
+        self._attr_available = True
+        self._attr_native_value, e_value = calculate_cached(
+            self._formula.name, temp, humd, wind
+        )
+        if self._windows:
+            now = dt_util.utcnow().timestamp()
+            for window in self._windows.values():
+                window.add(self._attr_native_value, now)
+        if self._derived:
+            values = derived_values(
+                temp,
+                humd,
+                wind,
+                (sensor.entity_description.key for sensor in self._derived),
+                e_value,
+            )
+            for sensor in self._derived:
+                sensor.async_set_value(values[sensor.entity_description.key])
         _LOGGER.debug(
             "New sensor state is %s %s",
             self._attr_native_value,
             self._attr_native_unit_of_measurement,
         )
+
+
+class UnrecordedApparentTemperatureSensor(ApparentTemperatureSensor):
+    """Apparent Temperature Sensor class with source values excluded from recorder."""
+
+    _unrecorded_attributes = frozenset(
+        {
+            ATTR_TEMPERATURE_SOURCE_VALUE,
+            ATTR_HUMIDITY_SOURCE_VALUE,
+            ATTR_WIND_SPEED_SOURCE_VALUE,
+        }
+    )
+
+
+class UpdateLatencySensor(SensorEntity):
+    """Diagnostic sensor of apparent temperature sensor update statistics."""
+
+    _attr_has_entity_name = True
+    _attr_icon = "mdi:timer-outline"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_suggested_display_precision = 3
+
+    def __init__(self, sensor: ApparentTemperatureSensor) -> None:
+        """Class initialization."""
+        self._sensor = sensor
+        if sensor.unique_id is not None:
+            self._attr_unique_id = f"{sensor.unique_id}_update_latency"
+
+    @property
+    def name(self) -> str | UndefinedType | None:
+        """Return the name of the sensor."""
+        return f"{self._sensor.name} Update Latency"
+
+    async def async_update(self) -> None:
+        """Update statistics of apparent temperature sensor."""
+        stats = self._sensor.stats.as_dict()
+        stats[ATTR_DECODE_FAILURES] = self._sensor.decode_failures
+        stats[ATTR_CACHE_HITS], stats[ATTR_CACHE_MISSES] = calculation_cache_info()
+        self._attr_native_value = stats.pop(ATTR_LATENCY_P99)
+        self._attr_extra_state_attributes = stats
+
+
+class DerivedSensor(SensorEntity):
+    """Sensor of comfort value derived from apparent temperature sensor sources."""
+
+    # Values are pushed by apparent temperature sensor, so sources are
+    # tracked and decoded only once for all derived sensors
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_available = False
+
+    def __init__(
+        self, sensor: ApparentTemperatureSensor, description: SensorEntityDescription
+    ) -> None:
+        """Class initialization."""
+        self._sensor = sensor
+        self.entity_description = description
+        if sensor.unique_id is not None:
+            self._attr_unique_id = f"{sensor.unique_id}_{description.key}"
+
+    @property
+    def name(self) -> str | UndefinedType | None:
+        """Return the name of the sensor."""
+        return f"{self._sensor.name} {self.entity_description.name}"
+
+    @callback
+    def async_set_value(self, value: float | str | None) -> None:
+        """Set new value and write state if it changed."""
+        available = value is not None
+        if value == self._attr_native_value and available == self._attr_available:
+            return
+
+        self._attr_native_value = value
+        self._attr_available = available
+        if self.hass is not None:
+            self.async_write_ha_state()
+
+
+class AreaSensors:
+    """Apparent temperature sensors of areas with temperature and humidity sources."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config: ConfigType,
+        async_add_entities: AddEntitiesCallback,
+    ) -> None:
+        """Class initialization."""
+        self.hass = hass
+        self._formula = config[CONF_FORMULA]
+        self._index = AreaIndex(hass, config[CONF_EXCLUDE])
+        self._async_add_entities = async_add_entities
+        self._sensors: dict[
+            str, tuple[ApparentTemperatureSensor, dict[str, tuple[str, ...]]]
+        ] = {}
+        self._unsubs: list[CALLBACK_TYPE] = []
+        # Sensors are removed and added again with awaits in between, so
+        # concurrent updates of the same area would create duplicates
+        self._lock = asyncio.Lock()
+
+    @callback
+    def async_setup(self) -> list[ApparentTemperatureSensor]:
+        """Create sensors of all areas and start tracking registry changes."""
+        self._index.async_build()
+        sensors = [
+            sensor
+            for area_id in self._index.areas
+            if (sensor := self._create_sensor(area_id)) is not None
+        ]
+        self._unsubs = [
+            self.hass.bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_entity_updated
+            ),
+            self.hass.bus.async_listen(
+                dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_updated
+            ),
+        ]
+        self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self.async_shutdown)
+        return sensors
+
+    @callback
+    def async_shutdown(self, _event: Event | None = None) -> None:
+        """Stop tracking registry changes."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    def _create_sensor(self, area_id: str) -> ApparentTemperatureSensor | None:
+        """Create sensor of area if area has sources."""
+        if (sources := self._index.sources(area_id)) is None:
+            return None
+
+        area = ar.async_get(self.hass).async_get_area(area_id)
+        sensor = ApparentTemperatureSensor(
+            f"{DOMAIN}_area_{area_id}",
+            f"{area.name if area is not None else area_id} Apparent Temperature",
+            list(sources),
+            formula=self._formula,
+            aggregate=AGGREGATE_MEAN,
+            # Sources may have registry entries before they have any states
+            roles=sources,
+        )
+        self._sensors[area_id] = (sensor, sources)
+        return sensor
+
+    @callback
+    def _async_entity_updated(
+        self, event: Event[er.EventEntityRegistryUpdatedData]
+    ) -> None:
+        """Reindex changed entity."""
+        affected = self._index.async_update_entity(event.data["entity_id"])
+        if old_entity_id := event.data.get("old_entity_id"):
+            affected |= self._index.async_update_entity(old_entity_id)
+        if affected:
+            self.hass.async_create_task(self._async_update_areas(affected))
+
+    @callback
+    def _async_device_updated(
+        self, event: Event[dr.EventDeviceRegistryUpdatedData]
+    ) -> None:
+        """Reindex entities of device moved to another area."""
+        if event.data["action"] != "update" or "area_id" not in event.data["changes"]:
+            return
+        if affected := self._index.async_update_device(event.data["device_id"]):
+            self.hass.async_create_task(self._async_update_areas(affected))
+
+    async def _async_update_areas(self, area_ids: set[str]) -> None:
+        """Create, recreate or remove sensors of areas whose sources changed."""
+        async with self._lock:
+            sensors = []
+            for area_id in area_ids:
+                sources = self._index.sources(area_id)
+                if (current := self._sensors.get(area_id)) is not None:
+                    if current[1] == sources:
+                        continue
+                    del self._sensors[area_id]
+                    await current[0].async_remove(force_remove=True)
+                    if sources is None:
+                        # Area has no sources anymore
+                        er.async_get(self.hass).async_remove(current[0].entity_id)
+                if (sensor := self._create_sensor(area_id)) is not None:
+                    sensors.append(sensor)
+            if sensors:
+                self._async_add_entities(sensors)
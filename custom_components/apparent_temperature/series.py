@@ -0,0 +1,52 @@
+"""Source history series for apparent_temperature."""
+
+from collections.abc import Callable, Sequence
+from typing import Final
+
+import numpy as np
+from homeassistant.core import State, split_entity_id
+from numpy.typing import NDArray
+
+from .const import ROLE_HUMIDITY, ROLE_TEMPERATURE, ROLE_WIND_SPEED
+from .source import (
+    ValueDecoder,
+    humidity_decoder,
+    temperature_decoder,
+    wind_speed_decoder,
+)
+
+# Kept apart from backfill, so offline tools do not import recorder
+
+DECODERS: Final[dict[str, Callable[[str], ValueDecoder]]] = {
+    ROLE_TEMPERATURE: temperature_decoder,
+    ROLE_HUMIDITY: humidity_decoder,
+    ROLE_WIND_SPEED: wind_speed_decoder,
+}
+
+Series = tuple[NDArray[np.float64], NDArray[np.float64]]
+
+
+def decode_history(states: Sequence[State], role: str, entity_id: str) -> Series:
+    """Decode source entity history into arrays of timestamps and values."""
+    # One decoder is built for the whole history, so its unit converter is
+    # looked up again only when unit changes
+    decode = DECODERS[role](split_entity_id(entity_id)[0]).decode
+    times = np.fromiter(
+        (state.last_updated_timestamp for state in states), np.float64, len(states)
+    )
+    values = np.fromiter(
+        (np.nan if (value := decode(state)) is None else value for state in states),
+        np.float64,
+        len(states),
+    )
+    return times, values
+
+
+def align_series(breakpoints: NDArray[np.float64], series: Series) -> NDArray:
+    """Return series values actual at each of breakpoints."""
+    times, values = series
+    if not len(times):
+        return np.full(len(breakpoints), np.nan)
+
+    index = np.searchsorted(times, breakpoints, side="right") - 1
+    return np.where(index >= 0, values[np.maximum(index, 0)], np.nan)
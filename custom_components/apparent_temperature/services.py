@@ -0,0 +1,148 @@
+"""Services of apparent_temperature."""
+
+from collections import defaultdict
+from typing import TYPE_CHECKING, Final
+
+import voluptuous as vol
+from homeassistant.const import UnitOfSpeed, UnitOfTemperature
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util.unit_conversion import (
+    BaseUnitConverter,
+    SpeedConverter,
+    TemperatureConverter,
+)
+
+from .const import (
+    ATTR_FORMULA,
+    ATTR_HUMIDITY,
+    ATTR_READINGS,
+    ATTR_RESULTS,
+    ATTR_TEMPERATURE,
+    ATTR_TEMPERATURE_UNIT,
+    ATTR_WIND_SPEED,
+    ATTR_WIND_SPEED_UNIT,
+    DEFAULT_FORMULA,
+    DOMAIN,
+    SERVICE_CALCULATE,
+)
+from .formulas import FORMULAS
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+
+
+TEMPERATURE_UNITS: Final = vol.In(
+    [UnitOfTemperature.CELSIUS, UnitOfTemperature.FAHRENHEIT, UnitOfTemperature.KELVIN]
+)
+WIND_SPEED_UNITS: Final = vol.In([unit.value for unit in UnitOfSpeed])
+
+READING_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_TEMPERATURE): vol.Coerce(float),
+        vol.Required(ATTR_HUMIDITY): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=100)
+        ),
+        vol.Optional(ATTR_WIND_SPEED, default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_TEMPERATURE_UNIT): TEMPERATURE_UNITS,
+        vol.Optional(ATTR_WIND_SPEED_UNIT): WIND_SPEED_UNITS,
+    }
+)
+
+CALCULATE_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_READINGS): vol.All(cv.ensure_list, [READING_SCHEMA]),
+        vol.Optional(ATTR_FORMULA, default=DEFAULT_FORMULA): vol.In(FORMULAS),
+        vol.Optional(
+            ATTR_TEMPERATURE_UNIT, default=UnitOfTemperature.CELSIUS
+        ): TEMPERATURE_UNITS,
+        vol.Optional(
+            ATTR_WIND_SPEED_UNIT, default=UnitOfSpeed.METERS_PER_SECOND
+        ): WIND_SPEED_UNITS,
+    }
+)
+
+
+def _convert_batch(
+    values: list[float],
+    units: list[str],
+    converter: type[BaseUnitConverter],
+    to_unit: str,
+) -> "NDArray[np.float64]":
+    """Convert values with per-value units to one unit."""
+    import numpy as np  # noqa: PLC0415
+
+    result = np.asarray(values, dtype=np.float64)
+    indices: dict[str, list[int]] = defaultdict(list)
+    for index, unit in enumerate(units):
+        indices[unit].append(index)
+    # Converters are plain arithmetic, so each group of values with the same
+    # unit is converted at once
+    for unit, group in indices.items():
+        if unit != to_unit:
+            result[group] = converter.converter_factory(unit, to_unit)(result[group])
+    return result
+
+
+def calculate(
+    readings: list[dict],
+    formula: str = DEFAULT_FORMULA,
+    temperature_unit: str = UnitOfTemperature.CELSIUS,
+    wind_speed_unit: str = UnitOfSpeed.METERS_PER_SECOND,
+) -> list[float]:
+    """Calculate apparent temperature (in °C) for list of readings."""
+    if not readings:
+        return []
+    import numpy as np  # noqa: PLC0415
+
+    temp = _convert_batch(
+        [reading[ATTR_TEMPERATURE] for reading in readings],
+        [reading.get(ATTR_TEMPERATURE_UNIT, temperature_unit) for reading in readings],
+        TemperatureConverter,
+        UnitOfTemperature.CELSIUS,
+    )
+    humd = np.fromiter(
+        (reading[ATTR_HUMIDITY] for reading in readings),
+        dtype=np.float64,
+        count=len(readings),
+    )
+    wind = _convert_batch(
+        [reading.get(ATTR_WIND_SPEED, 0.0) for reading in readings],
+        [reading.get(ATTR_WIND_SPEED_UNIT, wind_speed_unit) for reading in readings],
+        SpeedConverter,
+        UnitOfSpeed.METERS_PER_SECOND,
+    )
+    return FORMULAS[formula].calculate_batch(temp, humd, wind).tolist()
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register services of apparent_temperature."""
+
+    async def async_calculate(call: ServiceCall) -> ServiceResponse:
+        """Calculate apparent temperature for readings."""
+        return {
+            ATTR_RESULTS: calculate(
+                call.data[ATTR_READINGS],
+                call.data[ATTR_FORMULA],
+                call.data[ATTR_TEMPERATURE_UNIT],
+                call.data[ATTR_WIND_SPEED_UNIT],
+            )
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CALCULATE,
+        async_calculate,
+        schema=CALCULATE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
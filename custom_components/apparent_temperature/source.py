@@ -0,0 +1,369 @@
+"""Source entities decoding for apparent_temperature."""
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Final
+
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
+    ATTR_UNIT_OF_MEASUREMENT,
+    PERCENTAGE,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+    UnitOfSpeed,
+    UnitOfTemperature,
+)
+from homeassistant.core import HomeAssistant, State, split_entity_id
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.typing import UNDEFINED, UndefinedType
+from homeassistant.util.unit_conversion import (
+    BaseUnitConverter,
+    SpeedConverter,
+    TemperatureConverter,
+)
+
+from .const import (
+    ATTR_CURRENT_HUMIDITY,
+    ATTR_CURRENT_TEMPERATURE,
+    ATTR_WEATHER_HUMIDITY,
+    ATTR_WEATHER_TEMPERATURE,
+    ATTR_WEATHER_TEMPERATURE_UNIT,
+    ATTR_WEATHER_WIND_SPEED,
+    ATTR_WEATHER_WIND_SPEED_UNIT,
+    CLIMATE_DOMAIN,
+    GROUP_DOMAIN,
+    ROLE_HUMIDITY,
+    ROLE_TEMPERATURE,
+    ROLE_WIND_SPEED,
+    WEATHER_DOMAIN,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+# Minimal interval between repeated log messages about one source
+AVAILABILITY_LOG_INTERVAL: Final = 900  # seconds
+
+
+@dataclass(frozen=True, slots=True)
+class SourceValues:
+    """Values decoded from one source entity state."""
+
+    temperature: float | None = None  # °C
+    humidity: float | None = None  # %
+    wind_speed: float | None = None  # m/s
+
+
+def has_state(state: str | None) -> bool:
+    """Return True if state has any value."""
+    return state is not None and state not in [
+        STATE_UNKNOWN,
+        STATE_UNAVAILABLE,
+        "None",
+        "",
+    ]
+
+
+def expand_source(hass: HomeAssistant, entity_id: str) -> tuple[list[str], list[str]]:
+    """Return member entities and all (including nested) groups of source entity."""
+    members: list[str] = []
+    groups: list[str] = []
+
+    def expand(entity_id: str) -> None:
+        if split_entity_id(entity_id)[0] != GROUP_DOMAIN:
+            if entity_id not in members:
+                members.append(entity_id)
+        elif entity_id not in groups:
+            # Group component is heavy to import, so only groups pay for it
+            from homeassistant.components.group import (  # noqa: PLC0415
+                get_entity_ids,
+            )
+
+            groups.append(entity_id)
+            for member in get_entity_ids(hass, entity_id):
+                expand(member)
+
+    expand(entity_id)
+    return members, groups
+
+
+def source_roles(state: State) -> tuple[str, ...]:
+    """Return roles which source entity can play in calculations."""
+    return classify_roles(
+        state.entity_id,
+        state.attributes.get(ATTR_DEVICE_CLASS),
+        state.attributes.get(ATTR_UNIT_OF_MEASUREMENT),
+    )
+
+
+def classify_roles(
+    entity_id: str, device_class: str | None, unit_of_measurement: str | None
+) -> tuple[str, ...]:
+    """Return roles of entity with given device class and unit."""
+    domain = split_entity_id(entity_id)[0]
+
+    if domain == WEATHER_DOMAIN:
+        roles = (ROLE_TEMPERATURE, ROLE_HUMIDITY, ROLE_WIND_SPEED)
+    elif domain == CLIMATE_DOMAIN:
+        roles = (ROLE_TEMPERATURE, ROLE_HUMIDITY)
+    elif (
+        device_class == SensorDeviceClass.TEMPERATURE
+        or unit_of_measurement in UnitOfTemperature
+    ):
+        roles = (ROLE_TEMPERATURE,)
+    elif (
+        device_class == SensorDeviceClass.HUMIDITY or unit_of_measurement == PERCENTAGE
+    ):
+        roles = (ROLE_HUMIDITY,)
+    elif unit_of_measurement in UnitOfSpeed:
+        roles = (ROLE_WIND_SPEED,)
+    elif entity_id.find("temperature") >= 0:
+        roles = (ROLE_TEMPERATURE,)
+    elif entity_id.find("humidity") >= 0:
+        roles = (ROLE_HUMIDITY,)
+    elif entity_id.find("wind") >= 0:
+        roles = (ROLE_WIND_SPEED,)
+    else:
+        roles = ()
+
+    return roles
+
+
+class ValueDecoder:
+    """Decoder of one value from source entity states."""
+
+    # Attribute keys are selected once per source entity, and unit converter
+    # is bound to the source unit and rebuilt only when that unit changes.
+
+    __slots__ = (
+        "_convert",
+        "_converter",
+        "_target_unit",
+        "_unit",
+        "failures",
+        "key",
+        "unit_key",
+    )
+
+    def __init__(
+        self,
+        key: str | None,
+        unit_key: str | None = None,
+        converter: type[BaseUnitConverter] | None = None,
+        target_unit: str | None = None,
+    ) -> None:
+        """Class initialization."""
+        self.key = key  # None means entity state itself
+        self.unit_key = unit_key
+        self._converter = converter
+        self._target_unit = target_unit
+        self._unit: str | UndefinedType | None = UNDEFINED
+        self._convert: Callable[[float], float] | None = float
+        self.failures = 0
+
+    def _bind(self, unit: str | None) -> None:
+        """Bind unit converter to source unit."""
+        self._unit = unit
+        if self._converter is None:
+            return
+
+        try:
+            self._convert = self._converter.converter_factory(unit, self._target_unit)
+        except HomeAssistantError:
+            _LOGGER.warning("Unsupported %s unit: %s", self._converter.UNIT_CLASS, unit)
+            self._convert = None
+
+    def decode(self, state: State) -> float | None:
+        """Get value from entity state."""
+        value = state.state if self.key is None else state.attributes.get(self.key)
+        if not has_state(value):
+            return None
+
+        if (
+            self.unit_key is not None
+            and (unit := state.attributes.get(self.unit_key)) != self._unit
+        ):
+            self._bind(unit)
+        if self._convert is None:
+            self.failures += 1
+            return None
+
+        try:
+            number = float(value)
+        except ValueError:
+            number = math.nan
+        # "nan" and "inf" states are parsed as floats, but can not be calculated
+        if not math.isfinite(number):
+            self.failures += 1
+            _LOGGER.debug('Could not convert value "%s" to float', value)
+            return None
+        return self._convert(number)
+
+
+def temperature_decoder(domain: str) -> ValueDecoder:
+    """Return decoder of temperature value (in °C) for source domain."""
+    if domain == WEATHER_DOMAIN:
+        key, unit_key = ATTR_WEATHER_TEMPERATURE, ATTR_WEATHER_TEMPERATURE_UNIT
+    elif domain == CLIMATE_DOMAIN:
+        key, unit_key = ATTR_CURRENT_TEMPERATURE, ATTR_WEATHER_TEMPERATURE_UNIT
+    else:
+        key, unit_key = None, ATTR_UNIT_OF_MEASUREMENT
+
+    return ValueDecoder(key, unit_key, TemperatureConverter, UnitOfTemperature.CELSIUS)
+
+
+def humidity_decoder(domain: str) -> ValueDecoder:
+    """Return decoder of humidity value for source domain."""
+    if domain == WEATHER_DOMAIN:
+        key = ATTR_WEATHER_HUMIDITY
+    elif domain == CLIMATE_DOMAIN:
+        key = ATTR_CURRENT_HUMIDITY
+    else:
+        key = None
+
+    return ValueDecoder(key)
+
+
+def wind_speed_decoder(domain: str) -> ValueDecoder:
+    """Return decoder of wind speed value (in m/s) for source domain."""
+    if domain == WEATHER_DOMAIN:
+        key, unit_key = ATTR_WEATHER_WIND_SPEED, ATTR_WEATHER_WIND_SPEED_UNIT
+    else:
+        key, unit_key = None, ATTR_UNIT_OF_MEASUREMENT
+
+    return ValueDecoder(key, unit_key, SpeedConverter, UnitOfSpeed.METERS_PER_SECOND)
+
+
+def decode_temperature(state: State) -> float | None:
+    """Get temperature value (in °C) from entity state."""
+    return temperature_decoder(split_entity_id(state.entity_id)[0]).decode(state)
+
+
+def decode_humidity(state: State) -> float | None:
+    """Get humidity value from entity state."""
+    return humidity_decoder(split_entity_id(state.entity_id)[0]).decode(state)
+
+
+def decode_wind_speed(state: State) -> float | None:
+    """Get wind speed value (in m/s) from entity state."""
+    return wind_speed_decoder(split_entity_id(state.entity_id)[0]).decode(state)
+
+
+class SourceDecoder:
+    """Precompiled decoder of all values which source entity provides."""
+
+    __slots__ = (
+        "_humidity",
+        "_temperature",
+        "_wind_speed",
+        "domain",
+        "required_roles",
+        "roles",
+    )
+
+    def __init__(self, state: State) -> None:
+        """Class initialization."""
+        self.domain = split_entity_id(state.entity_id)[0]
+        self.roles = source_roles(state)
+        # Wind speed is optional in calculations, so source is available
+        # without it unless wind speed is all it provides
+        self.required_roles = (
+            tuple(role for role in self.roles if role != ROLE_WIND_SPEED) or self.roles
+        )
+
+        self._temperature = (
+            temperature_decoder(self.domain) if ROLE_TEMPERATURE in self.roles else None
+        )
+        self._humidity = (
+            humidity_decoder(self.domain) if ROLE_HUMIDITY in self.roles else None
+        )
+        self._wind_speed = (
+            wind_speed_decoder(self.domain) if ROLE_WIND_SPEED in self.roles else None
+        )
+
+    @property
+    def failures(self) -> int:
+        """Return number of values which could not be decoded."""
+        return sum(
+            decoder.failures
+            for decoder in (self._temperature, self._humidity, self._wind_speed)
+            if decoder is not None
+        )
+
+    def decode(self, state: State) -> SourceValues:
+        """Decode all values from source entity state."""
+        return SourceValues(
+            None if self._temperature is None else self._temperature.decode(state),
+            None if self._humidity is None else self._humidity.decode(state),
+            None if self._wind_speed is None else self._wind_speed.decode(state),
+        )
+
+
+class SourceAvailability:
+    """Availability state machine of one source entity."""
+
+    # Becoming unavailable is logged once, and so is recovery from a logged
+    # outage. Further failed updates and availability flapping within
+    # AVAILABILITY_LOG_INTERVAL are only counted and reported periodically.
+
+    __slots__ = (
+        "_failures",
+        "_logged_at",
+        "_reported",
+        "_transitions",
+        "available",
+        "entity_id",
+    )
+
+    def __init__(self, entity_id: str) -> None:
+        """Class initialization."""
+        self.entity_id = entity_id
+        self.available = True
+        self._reported = False  # Current outage was logged
+        self._failures = 0
+        self._transitions = 0
+        self._logged_at: float | None = None
+
+    def update(self, state: State | None, *, available: bool) -> None:
+        """Update source availability and log its changes."""
+        now = time.monotonic()
+        quiet = (
+            self._logged_at is not None
+            and now - self._logged_at < AVAILABILITY_LOG_INTERVAL
+        )
+        if not quiet and (self._failures or self._transitions):
+            _LOGGER.warning(
+                "Source %s changed availability %d times and failed %d updates"
+                " since last report",
+                self.entity_id,
+                self._transitions,
+                self._failures,
+            )
+            self._failures = self._transitions = 0
+            self._logged_at = now
+            quiet = True
+
+        if available == self.available:
+            if not available:
+                self._failures += 1
+            return
+
+        self.available = available
+        if available and self._reported:
+            _LOGGER.info("Source %s is available again", self.entity_id)
+            self._reported = False
+        elif not available and not quiet:
+            _LOGGER.warning(
+                "Source %s is unavailable (state: %s)",
+                self.entity_id,
+                None if state is None else state.state,
+            )
+            self._reported = True
+            self._logged_at = now
+        else:
+            self._transitions += 1
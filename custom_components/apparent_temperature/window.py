@@ -0,0 +1,115 @@
+"""Rolling-window statistics of apparent_temperature sensors."""
+
+from collections import deque
+from typing import Final
+
+# Values are collected into at most that many buckets per window
+WINDOW_MAX_BUCKETS: Final = 360
+
+# Bucket fields
+_INDEX: Final = 0
+_MIN: Final = 1
+_MAX: Final = 2
+_SUM: Final = 3
+_COUNT: Final = 4
+
+
+def window_name(period: float) -> str:
+    """Return short name of window period (in seconds), e.g. "24h"."""
+    period = int(period)
+    if not period % 3600:
+        return f"{period // 3600}h"
+    if not period % 60:
+        return f"{period // 60}min"
+    return f"{period}s"
+
+
+class RollingWindow:
+    """Min, max and mean of values over a rolling time window."""
+
+    # Values are grouped into buckets of period / max_buckets seconds, so
+    # memory does not depend on update rate. Min and max are kept by
+    # monotonic deques of buckets and the mean by running sums, so adding
+    # a value costs amortized O(1).
+
+    __slots__ = ("_buckets", "_count", "_max", "_min", "_resolution", "_sum", "period")
+
+    def __init__(self, period: float, max_buckets: int = WINDOW_MAX_BUCKETS) -> None:
+        """Class initialization."""
+        self.period = period  # seconds
+        self._resolution = period / max_buckets
+        self._buckets: deque[list[float]] = deque()
+        self._min: deque[list[float]] = deque()
+        self._max: deque[list[float]] = deque()
+        self._sum = 0.0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return number of buckets in window."""
+        return len(self._buckets)
+
+    def add(self, value: float, timestamp: float) -> None:
+        """Add value calculated at timestamp."""
+        self._expire(timestamp)
+        index = timestamp // self._resolution
+        if self._buckets and self._buckets[-1][_INDEX] == index:
+            bucket = self._buckets[-1]
+            bucket[_MIN] = min(bucket[_MIN], value)
+            bucket[_MAX] = max(bucket[_MAX], value)
+            bucket[_SUM] += value
+            bucket[_COUNT] += 1
+        else:
+            bucket = [index, value, value, value, 1]
+            self._buckets.append(bucket)
+        self._sum += value
+        self._count += 1
+        self._push(bucket)
+
+    def _push(self, bucket: list[float]) -> None:
+        """Push changed last bucket to monotonic deques."""
+        # The bucket itself is popped too if it already is the last one
+        while self._min and self._min[-1][_MIN] >= bucket[_MIN]:
+            self._min.pop()
+        self._min.append(bucket)
+        while self._max and self._max[-1][_MAX] <= bucket[_MAX]:
+            self._max.pop()
+        self._max.append(bucket)
+
+    def _expire(self, now: float) -> None:
+        """Drop buckets which left the window."""
+        oldest = (now - self.period) // self._resolution
+        while self._buckets and self._buckets[0][_INDEX] < oldest:
+            bucket = self._buckets.popleft()
+            self._sum -= bucket[_SUM]
+            self._count -= bucket[_COUNT]
+            if self._min[0] is bucket:
+                self._min.popleft()
+            if self._max[0] is bucket:
+                self._max.popleft()
+        if not self._buckets:
+            # Drop accumulated rounding errors
+            self._sum = 0.0
+            self._count = 0
+
+    def stats(self, now: float) -> tuple[float | None, float | None, float | None]:
+        """Return min, max and mean of values in window."""
+        self._expire(now)
+        if not self._count:
+            return None, None, None
+        return self._min[0][_MIN], self._max[0][_MAX], self._sum / self._count
+
+    def as_list(self) -> list[list[float]]:
+        """Return buckets of window as list for storing."""
+        return [list(bucket) for bucket in self._buckets]
+
+    def restore(self, buckets: list[list[float]], now: float) -> None:
+        """Restore stored buckets of window."""
+        for stored in buckets:
+            bucket = [float(stored[_INDEX]), *stored[_MIN:_COUNT], int(stored[_COUNT])]
+            if self._buckets and self._buckets[-1][_INDEX] >= bucket[_INDEX]:
+                continue  # Corrupted or reordered data
+            self._buckets.append(bucket)
+            self._sum += bucket[_SUM]
+            self._count += bucket[_COUNT]
+            self._push(bucket)
+        self._expire(now)
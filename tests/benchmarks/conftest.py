@@ -0,0 +1,39 @@
+"""Fixtures of benchmarks and load tests."""
+
+import pytest
+
+from .replay import ReplayReport
+
+REPLAY_REPORTS = pytest.StashKey[list[tuple[str, ReplayReport]]]()
+
+
+@pytest.fixture
+def replay_report(request: pytest.FixtureRequest):
+    """Return function to show replay report in test session summary."""
+
+    def add(report: ReplayReport) -> None:
+        request.config.stash.setdefault(REPLAY_REPORTS, []).append(
+            (request.node.nodeid, report)
+        )
+
+    return add
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    """Show replay reports."""
+    if not (reports := config.stash.get(REPLAY_REPORTS, [])):
+        return
+
+    terminalreporter.section("replay load")
+    for nodeid, report in reports:
+        lag = (
+            "n/a"
+            if report.lag_mean is None
+            else f"mean {report.lag_mean:.2f} ms, p99 {report.lag_p99:.2f} ms, "
+            f"max {report.lag_max:.2f} ms"
+        )
+        terminalreporter.write_line(
+            f"{nodeid}: {report.events} events in {report.duration:.2f} s, "
+            f"{report.throughput:.0f} events/s, "
+            f"{report.writes_per_second:.0f} state writes/s, loop lag {lag}"
+        )
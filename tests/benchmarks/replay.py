@@ -0,0 +1,239 @@
+"""Replay of source event streams for load tests of apparent_temperature."""
+
+import asyncio
+import json
+import math
+import random
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Final
+
+from homeassistant.const import (
+    ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_STATE_CHANGED,
+    EVENT_STATE_REPORTED,
+    PERCENTAGE,
+    UnitOfSpeed,
+    UnitOfTemperature,
+)
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.entity_platform import async_get_platforms
+
+from custom_components.apparent_temperature.const import DOMAIN
+from custom_components.apparent_temperature.instrumentation import percentile
+from custom_components.apparent_temperature.sensor import ApparentTemperatureSensor
+
+# Interval of event loop lag probes
+LAG_PROBE_INTERVAL: Final = 0.01  # seconds
+
+# Replay yields to event loop at least after that many events
+REPLAY_BATCH: Final = 100
+
+
+@dataclass(frozen=True, slots=True)
+class ReplayEvent:
+    """State of source entity at offset from start of event stream."""
+
+    offset: float  # seconds
+    entity_id: str
+    state: str
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class ReplayReport:
+    """Load statistics of one replay."""
+
+    events: int
+    duration: float  # seconds
+    state_writes: int
+    lag_mean: float | None  # ms
+    lag_p99: float | None  # ms
+    lag_max: float | None  # ms
+
+    @property
+    def throughput(self) -> float:
+        """Return number of replayed events per second."""
+        return self.events / self.duration if self.duration else 0.0
+
+    @property
+    def writes_per_second(self) -> float:
+        """Return number of state writes of sensors per second."""
+        return self.state_writes / self.duration if self.duration else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return statistics as dictionary."""
+        return {
+            **asdict(self),
+            "throughput": self.throughput,
+            "writes_per_second": self.writes_per_second,
+        }
+
+
+def load_events(path: Path) -> list[ReplayEvent]:
+    """Load event log of states recorded as JSON lines."""
+    # Every line is a state dictionary as exported by Home Assistant, e.g.
+    # {"entity_id": "sensor.t", "state": "21.5", "attributes": {...},
+    #  "last_updated": "2024-07-01T12:00:00+00:00"}
+    states = [
+        json.loads(line)
+        for line in path.read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    ]
+    timestamps = [
+        datetime.fromisoformat(state["last_updated"]).timestamp() for state in states
+    ]
+    start = min(timestamps, default=0.0)
+    return sorted(
+        (
+            ReplayEvent(
+                timestamp - start,
+                state["entity_id"],
+                str(state["state"]),
+                state.get("attributes") or {},
+            )
+            for state, timestamp in zip(states, timestamps, strict=True)
+        ),
+        key=lambda event: event.offset,
+    )
+
+
+def synthetic_events(
+    stations: int = 1,
+    duration: float = 86400,
+    interval: float = 60,
+    seed: int = 0,
+) -> Iterator[ReplayEvent]:
+    """Generate temperature, humidity and wind speed streams of weather stations."""
+    # Temperature follows a daily cycle, humidity goes opposite to it and wind
+    # speed is a random walk. Every station reports all its sensors once per
+    # interval (in seconds), with some jitter.
+    rng = random.Random(seed)
+    phases = [rng.uniform(0, 2 * math.pi) for _ in range(stations)]
+    winds = [rng.uniform(0, 5) for _ in range(stations)]
+
+    events: list[ReplayEvent] = []
+    for step in range(int(duration // interval)):
+        events.clear()
+        for station, phase in enumerate(phases):
+            offset = step * interval + rng.uniform(0, interval)
+            cycle = math.sin(2 * math.pi * offset / 86400 + phase)
+            winds[station] = max(0.0, winds[station] + rng.gauss(0, 0.3))
+            events.extend(
+                (
+                    ReplayEvent(
+                        offset,
+                        f"sensor.station_{station}_temperature",
+                        f"{15 + 8 * cycle + rng.gauss(0, 0.2):.1f}",
+                        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+                    ),
+                    ReplayEvent(
+                        offset,
+                        f"sensor.station_{station}_humidity",
+                        f"{60 - 20 * cycle + rng.gauss(0, 1):.0f}",
+                        {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE},
+                    ),
+                    ReplayEvent(
+                        offset,
+                        f"sensor.station_{station}_wind_speed",
+                        f"{winds[station]:.1f}",
+                        {ATTR_UNIT_OF_MEASUREMENT: UnitOfSpeed.METERS_PER_SECOND},
+                    ),
+                )
+            )
+        events.sort(key=lambda event: event.offset)
+        yield from events
+
+
+def dump_events(events: Iterable[ReplayEvent], path: Path, start: datetime) -> None:
+    """Save events as log of states which can be loaded back."""
+    with path.open("w", encoding="utf-8") as file:
+        for event in events:
+            updated = datetime.fromtimestamp(
+                start.timestamp() + event.offset, start.tzinfo
+            )
+            state = {
+                "entity_id": event.entity_id,
+                "state": event.state,
+                "attributes": event.attributes,
+                "last_updated": updated.isoformat(),
+            }
+            file.write(json.dumps(state) + "\n")
+
+
+def sensor_entity_ids(hass: HomeAssistant) -> set[str]:
+    """Return entity IDs of all apparent temperature sensors."""
+    return {
+        entity.entity_id
+        for platform in async_get_platforms(hass, DOMAIN)
+        for entity in platform.entities.values()
+        if isinstance(entity, ApparentTemperatureSensor)
+    }
+
+
+async def async_replay(
+    hass: HomeAssistant,
+    events: Iterable[ReplayEvent],
+    speed: float | None = None,
+) -> ReplayReport:
+    """Replay events as source states and measure load of sensors."""
+    # Events are replayed speed times faster than they were recorded, or as
+    # fast as possible if speed is not set
+    entity_ids = sensor_entity_ids(hass)
+    writes = 0
+
+    @callback
+    def _filter(event_data: dict[str, Any]) -> bool:
+        return event_data["entity_id"] in entity_ids
+
+    @callback
+    def _count(_event: Event) -> None:
+        nonlocal writes
+        writes += 1
+
+    # Unchanged states are written as reported, not changed ones
+    unsubs = [
+        hass.bus.async_listen(event_type, _count, event_filter=_filter)
+        for event_type in (EVENT_STATE_CHANGED, EVENT_STATE_REPORTED)
+    ]
+
+    lags: list[float] = []
+
+    async def _probe_lag() -> None:
+        while True:
+            expected = time.perf_counter() + LAG_PROBE_INTERVAL
+            await asyncio.sleep(LAG_PROBE_INTERVAL)
+            lags.append(max(0.0, time.perf_counter() - expected))
+
+    probe = hass.async_create_background_task(_probe_lag(), "replay lag probe")
+    count = 0
+    start = time.perf_counter()
+    try:
+        for count, event in enumerate(events, 1):
+            if speed:
+                delay = start + event.offset / speed - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            if not count % REPLAY_BATCH:
+                await asyncio.sleep(0)
+            hass.states.async_set(event.entity_id, event.state, event.attributes)
+        await hass.async_block_till_done()
+        duration = time.perf_counter() - start
+    finally:
+        probe.cancel()
+        for unsub in unsubs:
+            unsub()
+
+    lags.sort()
+    p99 = percentile(lags, 0.99)
+    return ReplayReport(
+        events=count,
+        duration=duration,
+        state_writes=writes,
+        lag_mean=sum(lags) / len(lags) * 1000 if lags else None,
+        lag_p99=None if p99 is None else p99 * 1000,
+        lag_max=lags[-1] * 1000 if lags else None,
+    )
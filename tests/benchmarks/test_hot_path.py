@@ -0,0 +1,203 @@
+# pylint: disable=protected-access,redefined-outer-name
+"""Benchmarks of the sensor update hot path and event fan-out."""
+
+# Source states are changed through the state machine, so the measured time
+# includes event bus dispatching and state writes of sensors, as in production.
+# Benchmarks run in an executor thread and submit every round to the event loop
+# of Home Assistant, which stays free to dispatch events in between.
+
+import asyncio
+from collections.abc import Callable, Coroutine
+from functools import partial
+from typing import Any, Final
+
+import pytest
+from homeassistant.components.climate import (
+    ATTR_CURRENT_HUMIDITY,
+    ATTR_CURRENT_TEMPERATURE,
+)
+from homeassistant.components.weather import (
+    ATTR_WEATHER_HUMIDITY,
+    ATTR_WEATHER_TEMPERATURE,
+    ATTR_WEATHER_TEMPERATURE_UNIT,
+    ATTR_WEATHER_WIND_SPEED,
+    ATTR_WEATHER_WIND_SPEED_UNIT,
+)
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_UNIT_OF_MEASUREMENT,
+    CONF_NAME,
+    CONF_PLATFORM,
+    CONF_SOURCE,
+    PERCENTAGE,
+    UnitOfSpeed,
+    UnitOfTemperature,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.apparent_temperature.const import DOMAIN
+from custom_components.apparent_temperature.sensor import ApparentTemperatureSensor
+
+GROUP_SIZE: Final = 1000
+STORM_EVENTS: Final = 20
+STORM_ROUNDS: Final = 5
+
+
+def source_states(offset: float = 0.0) -> dict[str, tuple[str, dict[str, Any]]]:
+    """Return states of source entities of all supported types."""
+    # Offset is added to temperatures, so sources can be changed back and forth
+    return {
+        "weather.test": (
+            "sunny",
+            {
+                ATTR_WEATHER_TEMPERATURE: 12 + offset,
+                ATTR_WEATHER_TEMPERATURE_UNIT: UnitOfTemperature.CELSIUS,
+                ATTR_WEATHER_HUMIDITY: 32,
+                ATTR_WEATHER_WIND_SPEED: 10,
+                ATTR_WEATHER_WIND_SPEED_UNIT: UnitOfSpeed.KILOMETERS_PER_HOUR,
+            },
+        ),
+        "climate.test": (
+            "heat",
+            {
+                ATTR_CURRENT_TEMPERATURE: 21 + offset,
+                ATTR_WEATHER_TEMPERATURE_UNIT: UnitOfTemperature.CELSIUS,
+                ATTR_CURRENT_HUMIDITY: 45,
+            },
+        ),
+        "sensor.test_temperature": (
+            str(68 + offset),
+            {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.FAHRENHEIT},
+        ),
+        "sensor.test_humidity": ("40", {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE}),
+        "sensor.test_wind_speed": (
+            "10",
+            {ATTR_UNIT_OF_MEASUREMENT: UnitOfSpeed.KILOMETERS_PER_HOUR},
+        ),
+    }
+
+
+def set_source_states(hass: HomeAssistant) -> None:
+    """Set states of source entities of all supported types."""
+    for entity_id, (state, attributes) in source_states().items():
+        hass.states.async_set(entity_id, state, attributes)
+
+
+async def async_setup_sensors(
+    hass: HomeAssistant, sources: list[str], sensors: int = 1
+) -> None:
+    """Set up and start sensors with the same sources."""
+    assert await async_setup_component(
+        hass,
+        "sensor",
+        {
+            "sensor": [
+                {
+                    CONF_PLATFORM: DOMAIN,
+                    CONF_NAME: f"test_{index}",
+                    CONF_SOURCE: sources,
+                }
+                for index in range(sensors)
+            ]
+        },
+    )
+    await hass.async_start()
+    await hass.async_block_till_done()
+
+
+async def async_benchmark(
+    hass: HomeAssistant,
+    benchmark,
+    target: Callable[[], Coroutine[Any, Any, None]],
+    **kwargs: Any,
+) -> None:
+    """Benchmark coroutine function run in event loop of Home Assistant."""
+
+    def run() -> None:
+        asyncio.run_coroutine_threadsafe(target(), hass.loop).result()
+
+    await hass.async_add_executor_job(
+        partial(benchmark.pedantic, run, **kwargs)
+        if kwargs
+        else partial(benchmark, run)
+    )
+
+
+@pytest.mark.parametrize(
+    ("sources", "changed"),
+    [
+        (["weather.test"], "weather.test"),
+        (["climate.test"], "climate.test"),
+        (
+            [
+                "sensor.test_temperature",
+                "sensor.test_humidity",
+                "sensor.test_wind_speed",
+            ],
+            "sensor.test_temperature",
+        ),
+    ],
+    ids=["weather", "climate", "sensor"],
+)
+async def test_async_update(hass: HomeAssistant, benchmark, sources, changed):
+    """Benchmark latency from source state change to sensor state write."""
+    set_source_states(hass)
+    await async_setup_sensors(hass, sources)
+    states = [source_states(offset)[changed] for offset in (1.0, 0.0)]
+    rounds = 0
+
+    async def update() -> None:
+        nonlocal rounds
+        state, attributes = states[rounds % 2]
+        rounds += 1
+        hass.states.async_set(changed, state, attributes)
+        await hass.async_block_till_done()
+
+    await async_benchmark(hass, benchmark, update)
+
+    # Sensor state was written after the last change of its source
+    state = hass.states.get("sensor.test_0")
+    assert state.last_updated > hass.states.get(changed).last_updated
+
+
+async def test_setup_sources_group(hass: HomeAssistant, benchmark):
+    """Benchmark sources setup with large group of entities."""
+    members = [f"sensor.test_temperature_{index}" for index in range(GROUP_SIZE)]
+    for entity_id in members:
+        hass.states.async_set(
+            entity_id, "20", {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS}
+        )
+    hass.states.async_set("group.test_group", "on", {ATTR_ENTITY_ID: members})
+    entity = ApparentTemperatureSensor(None, "test", ["group.test_group"])
+    entity.hass = hass
+
+    # Roles of sources are cached by sensor, so every round starts cold
+    entities = benchmark.pedantic(
+        entity._setup_sources, setup=entity._roles.clear, rounds=20
+    )
+
+    assert len(entities) == GROUP_SIZE
+
+
+@pytest.mark.parametrize("sensors", [1, 100, 1000])
+async def test_event_storm(hass: HomeAssistant, benchmark, sensors):
+    """Benchmark latency from source events to state writes of many sensors."""
+    set_source_states(hass)
+    await async_setup_sensors(
+        hass, ["sensor.test_temperature", "sensor.test_humidity"], sensors
+    )
+
+    async def storm() -> None:
+        for index in range(STORM_EVENTS):
+            hass.states.async_set(
+                "sensor.test_temperature",
+                str(60 + index),
+                {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.FAHRENHEIT},
+            )
+        await hass.async_block_till_done()
+
+    await async_benchmark(hass, benchmark, storm, rounds=STORM_ROUNDS)
+
+    state = hass.states.get(f"sensor.test_{sensors - 1}")
+    assert float(state.state) == pytest.approx(26.5565398661699, abs=0.01)
@@ -0,0 +1,117 @@
+"""Import-time budget of the sensor platform."""
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import Final
+
+import pytest
+from homeassistant.components import climate, group, weather
+
+from custom_components.apparent_temperature import const
+
+MODULE: Final = "custom_components.apparent_temperature.sensor"
+
+# Modules which are already imported by Home Assistant core before any
+# sensor platform is set up, so they do not count against the budget
+PRELOADED: Final = (
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.discovery",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.restore_state",
+    "homeassistant.components.sensor",
+)
+
+# Packages which must be imported only when their sources or batch
+# calculations are used
+LAZY: Final = (
+    "homeassistant.components.climate",
+    "homeassistant.components.group",
+    "homeassistant.components.recorder",
+    "homeassistant.components.weather",
+    "numpy",
+)
+
+# Import time of sensor platform relative to import time of preloaded modules,
+# so the budget does not depend on speed of the machine. It is well above the
+# usual ratio (below 0.1) to tolerate noise of single runs, but far below the
+# ratio with eagerly imported components (over 0.7).
+IMPORT_TIME_BUDGET: Final = 0.4
+
+
+def import_times(module: str) -> tuple[dict[str, int], int]:
+    """Return cumulative import times (in µs) of modules and of preloaded ones."""
+    result = subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import {', '.join(PRELOADED)}; import {module}",
+        ],
+        capture_output=True,
+        check=True,
+        cwd=Path(__file__).parents[2],
+        text=True,
+    )
+
+    # Lines are "import time: self [us] | cumulative | imported package",
+    # nested imports are indented and come before the importing one
+    times: dict[str, int] = {}
+    preloaded = 0
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        times[name.strip()] = int(cumulative)
+        if module not in times and not name.startswith("  "):
+            preloaded += int(cumulative)
+    return times, preloaded
+
+
+def test_constants():
+    """Test local copies of component constants are up to date."""
+    assert const.CLIMATE_DOMAIN == climate.DOMAIN
+    assert const.GROUP_DOMAIN == group.DOMAIN
+    assert const.WEATHER_DOMAIN == weather.DOMAIN
+
+    assert const.ATTR_CURRENT_TEMPERATURE == climate.ATTR_CURRENT_TEMPERATURE
+    assert const.ATTR_CURRENT_HUMIDITY == climate.ATTR_CURRENT_HUMIDITY
+    assert const.ATTR_WEATHER_TEMPERATURE == weather.ATTR_WEATHER_TEMPERATURE
+    assert const.ATTR_WEATHER_TEMPERATURE_UNIT == weather.ATTR_WEATHER_TEMPERATURE_UNIT
+    assert const.ATTR_WEATHER_HUMIDITY == weather.ATTR_WEATHER_HUMIDITY
+    assert const.ATTR_WEATHER_WIND_SPEED == weather.ATTR_WEATHER_WIND_SPEED
+    assert const.ATTR_WEATHER_WIND_SPEED_UNIT == weather.ATTR_WEATHER_WIND_SPEED_UNIT
+    assert const.ATTR_FORECAST_TIME == weather.ATTR_FORECAST_TIME
+    assert const.ATTR_FORECAST_TEMP == weather.ATTR_FORECAST_TEMP
+    assert const.ATTR_FORECAST_HUMIDITY == weather.ATTR_FORECAST_HUMIDITY
+    assert const.ATTR_FORECAST_WIND_SPEED == weather.ATTR_FORECAST_WIND_SPEED
+    assert const.SERVICE_GET_FORECASTS == weather.SERVICE_GET_FORECASTS
+
+
+@pytest.mark.timeout(60)
+def test_lazy_imports():
+    """Test heavy components are not imported with sensor platform."""
+    times, _ = import_times(MODULE)
+
+    assert MODULE in times
+    assert not [name for name in LAZY if name in times]
+
+
+@pytest.mark.timeout(60)
+def test_import_time_budget():
+    """Test sensor platform is imported within time budget."""
+    times, preloaded = import_times(MODULE)
+
+    assert times[MODULE] < IMPORT_TIME_BUDGET * preloaded
+
+
+@pytest.mark.timeout(60)
+def test_import_time(benchmark):
+    """Measure import time of sensor platform."""
+    # Absolute wall-clock times are compared only in benchmark runs
+    if benchmark.disabled:
+        pytest.skip("benchmarks are disabled")
+
+    benchmark.pedantic(import_times, args=(MODULE,))
@@ -0,0 +1,161 @@
+"""Load tests replaying source event streams through apparent_temperature sensors."""
+
+# Synthetic streams are replayed by default. To replay a recorded day of real
+# traffic, e.g. at 100 times real speed:
+#
+#   pytest tests/benchmarks/test_replay.py --replay-log=day.jsonl --replay-speed=100
+
+from datetime import UTC, datetime
+from typing import Final
+
+import pytest
+from homeassistant.const import (
+    CONF_NAME,
+    CONF_PLATFORM,
+    CONF_SOURCE,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+)
+from homeassistant.core import HomeAssistant, split_entity_id
+from homeassistant.setup import async_setup_component
+
+from custom_components.apparent_temperature.const import DOMAIN
+
+from .replay import (
+    ReplayEvent,
+    async_replay,
+    dump_events,
+    load_events,
+    sensor_entity_ids,
+    synthetic_events,
+)
+
+STATION_SUFFIXES: Final = ("_temperature", "_humidity", "_wind_speed")
+
+
+def station_sources(events: list[ReplayEvent]) -> dict[str, list[str]]:
+    """Return source entities of events grouped by station name."""
+    # Station name is object ID without its suffix, so "sensor.kitchen_humidity"
+    # belongs to the "kitchen" station
+    stations: dict[str, list[str]] = {}
+    for event in events:
+        name = split_entity_id(event.entity_id)[1]
+        for suffix in STATION_SUFFIXES:
+            name = name.removesuffix(suffix)
+        sources = stations.setdefault(name, [])
+        if event.entity_id not in sources:
+            sources.append(event.entity_id)
+    return stations
+
+
+async def async_setup_stations(hass: HomeAssistant, events: list[ReplayEvent]) -> None:
+    """Set up one sensor per station with initial states of its sources."""
+    initial: dict[str, ReplayEvent] = {}
+    for event in events:
+        initial.setdefault(event.entity_id, event)
+    for event in initial.values():
+        hass.states.async_set(event.entity_id, event.state, event.attributes)
+
+    assert await async_setup_component(
+        hass,
+        "sensor",
+        {
+            "sensor": [
+                {CONF_PLATFORM: DOMAIN, CONF_NAME: name, CONF_SOURCE: sources}
+                for name, sources in station_sources(events).items()
+            ]
+        },
+    )
+    await hass.async_start()
+    await hass.async_block_till_done()
+
+
+def test_synthetic_events():
+    """Test synthetic streams are reproducible and ordered."""
+    events = list(synthetic_events(stations=2, duration=600, interval=60, seed=1))
+
+    assert len(events) == 2 * 3 * 10
+    assert events == list(
+        synthetic_events(stations=2, duration=600, interval=60, seed=1)
+    )
+    assert [event.offset for event in events] == sorted(
+        event.offset for event in events
+    )
+    assert station_sources(events) == {
+        f"station_{index}": [
+            f"sensor.station_{index}_temperature",
+            f"sensor.station_{index}_humidity",
+            f"sensor.station_{index}_wind_speed",
+        ]
+        for index in range(2)
+    }
+
+
+def test_load_events(tmp_path):
+    """Test event log is loaded back in order of time."""
+    events = sorted(
+        synthetic_events(duration=300),
+        key=lambda event: (event.offset, event.entity_id),
+    )
+    path = tmp_path / "events.jsonl"
+    # Logs exported from history are grouped by entity
+    dump_events(
+        sorted(events, key=lambda event: event.entity_id),
+        path,
+        datetime(2024, 7, 1, tzinfo=UTC),
+    )
+
+    loaded = load_events(path)
+
+    assert [(event.entity_id, event.state) for event in loaded] == [
+        (event.entity_id, event.state) for event in events
+    ]
+    assert [event.offset for event in loaded] == pytest.approx(
+        [event.offset - events[0].offset for event in events]
+    )
+
+
+async def test_replay(hass: HomeAssistant, request, replay_report):
+    """Replay event stream and report load of sensors."""
+    options = request.config.option
+    if options.replay_log is not None:
+        events = load_events(options.replay_log)
+    else:
+        events = list(
+            synthetic_events(
+                stations=options.replay_stations,
+                duration=options.replay_duration,
+                interval=options.replay_interval,
+            )
+        )
+    await async_setup_stations(hass, events)
+    entity_ids = sensor_entity_ids(hass)
+
+    report = await async_replay(hass, events, speed=options.replay_speed)
+    replay_report(report)
+
+    assert report.events == len(events)
+    assert report.state_writes > 0
+    assert entity_ids
+    for entity_id in entity_ids:
+        assert hass.states.get(entity_id).state not in (
+            STATE_UNKNOWN,
+            STATE_UNAVAILABLE,
+        )
+
+
+async def test_replay_rate(hass: HomeAssistant):
+    """Test events are replayed at requested rate."""
+    events = list(synthetic_events(duration=600, interval=60))
+    await async_setup_stations(hass, events)
+
+    # 10 minutes of events at 6000 times real speed take at least 0.1 s
+    report = await async_replay(hass, events, speed=6000)
+
+    assert report.events == 30
+    assert report.duration >= events[-1].offset / 6000
+    assert 0 < report.state_writes <= report.events
+    assert report.lag_max is not None
+    assert report.as_dict()["throughput"] == pytest.approx(
+        report.events / report.duration
+    )
@@ -16,6 +16,7 @@
 #
 # See here for more info: https://docs.pytest.org/en/latest/fixture.html (note that
 # pytest includes fixtures OOB which you can use as defined on this page)
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
@@ -42,3 +43,37 @@ def _skip_notifications_fixture() -> None:
         patch("homeassistant.components.persistent_notification.async_dismiss"),
     ):
         yield
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add options of replay load test, see tests/benchmarks/test_replay.py."""
+    group = parser.getgroup("replay", "replay load test")
+    group.addoption(
+        "--replay-log",
+        type=Path,
+        help="JSON lines log of recorded states to replay instead of synthetic ones",
+    )
+    group.addoption(
+        "--replay-speed",
+        type=float,
+        help="replay events that many times faster than real time "
+        "(default: as fast as possible)",
+    )
+    group.addoption(
+        "--replay-stations",
+        type=int,
+        default=10,
+        help="number of synthetic weather stations (default: %(default)s)",
+    )
+    group.addoption(
+        "--replay-duration",
+        type=float,
+        default=6 * 3600,
+        help="duration of synthetic streams in seconds (default: %(default)s)",
+    )
+    group.addoption(
+        "--replay-interval",
+        type=float,
+        default=60,
+        help="update interval of synthetic stations in seconds (default: %(default)s)",
+    )
@@ -0,0 +1,111 @@
+"""The test for the aggregation of several sources."""
+
+import random
+from statistics import median
+
+import pytest
+
+from custom_components.apparent_temperature.aggregate import (
+    FRESHNESS_HALF_LIFE,
+    FRESHNESS_REBASE_EXPONENT,
+    HEAP_COMPACT_SLACK,
+    Aggregate,
+)
+from custom_components.apparent_temperature.const import (
+    AGGREGATE_FRESHNESS,
+    AGGREGATE_MAX,
+    AGGREGATE_MEAN,
+    AGGREGATE_MEDIAN,
+    AGGREGATE_MIN,
+)
+
+
+@pytest.mark.parametrize(
+    ("method", "expected", "expected_removed"),
+    [
+        (AGGREGATE_MEAN, 21.0, 65 / 3),
+        (AGGREGATE_MEDIAN, 21.0, 22.0),
+        (AGGREGATE_MIN, 19.0, 20.0),
+        (AGGREGATE_MAX, 23.0, 23.0),
+    ],
+)
+def test_aggregate(method, expected, expected_removed):
+    """Test aggregation of member values."""
+    aggregate = Aggregate(method)
+    assert aggregate.value is None
+
+    aggregate.add("sensor.probe_1")
+    assert "sensor.probe_1" in aggregate
+    assert len(aggregate) == 0
+    assert aggregate.value is None
+
+    for index, value in enumerate((19.0, 20.0, 21.0, 23.0), 1):
+        aggregate.update(f"sensor.probe_{index}", value, 0)
+    # Member value changes
+    aggregate.update("sensor.probe_3", 22.0, 0)
+    aggregate.update("sensor.probe_2", 19.0, 0)
+    aggregate.update("sensor.probe_2", 20.0, 0)
+    assert len(aggregate) == 4
+    assert aggregate.value == pytest.approx(expected)
+
+    aggregate.remove("sensor.probe_1")
+    assert "sensor.probe_1" not in aggregate
+    assert aggregate.value == pytest.approx(expected_removed)
+
+    # Member without value stays member
+    aggregate.update("sensor.probe_2", None, 0)
+    assert "sensor.probe_2" in aggregate
+    assert len(aggregate) == 2
+
+    for index in range(2, 5):
+        aggregate.remove(f"sensor.probe_{index}")
+    assert not aggregate.members
+    assert aggregate.value is None
+
+
+@pytest.mark.parametrize(
+    ("method", "function"),
+    [(AGGREGATE_MEDIAN, median), (AGGREGATE_MIN, min), (AGGREGATE_MAX, max)],
+)
+def test_aggregate_heaps(method, function):
+    """Test order statistics stay exact and bounded over many updates."""
+    rng = random.Random(0)
+    aggregate = Aggregate(method)
+    values: dict[str, float] = {}
+
+    for _ in range(2000):
+        entity_id = f"sensor.probe_{rng.randrange(10)}"
+        if rng.random() < 0.1:
+            aggregate.remove(entity_id)
+            values.pop(entity_id, None)
+        else:
+            values[entity_id] = rng.uniform(-10, 40)
+            aggregate.update(entity_id, values[entity_id], 0)
+        assert aggregate.value == (function(values.values()) if values else None)
+
+    # Replaced values are dropped from heaps, not accumulated
+    for heap in aggregate._heaps:
+        assert len(heap._entries) <= 2 * heap.size + HEAP_COMPACT_SLACK + 1
+
+
+def test_aggregate_freshness():
+    """Test freshness-weighted mean of member values."""
+    aggregate = Aggregate(AGGREGATE_FRESHNESS)
+
+    aggregate.update("sensor.probe_1", 20.0, 1000)
+    aggregate.update("sensor.probe_2", 23.0, 1000 + FRESHNESS_HALF_LIFE)
+    assert aggregate.value == pytest.approx(22.0)
+
+    aggregate.update("sensor.probe_1", 20.0, 1000 + FRESHNESS_HALF_LIFE)
+    assert aggregate.value == pytest.approx(21.5)
+
+    aggregate.remove("sensor.probe_2")
+    assert aggregate.value == pytest.approx(20.0)
+
+    # Weights are rebased before they overflow
+    late = 1000 + FRESHNESS_HALF_LIFE * (FRESHNESS_REBASE_EXPONENT + 10)
+    aggregate.update("sensor.probe_2", 23.0, late)
+    assert aggregate.value == pytest.approx(23.0)
+
+    aggregate.update("sensor.probe_1", 20.0, late)
+    assert aggregate.value == pytest.approx(21.5)
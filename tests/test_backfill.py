@@ -0,0 +1,119 @@
+# pylint: disable=protected-access,redefined-outer-name
+"""The test for the historical backfill."""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, PERCENTAGE, UnitOfTemperature
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.apparent_temperature.backfill import (
+    async_backfill,
+    compile_hourly_statistics,
+)
+from custom_components.apparent_temperature.const import (
+    FORMULA_AUSTRALIAN,
+    ROLE_HUMIDITY,
+    ROLE_TEMPERATURE,
+    ROLE_WIND_SPEED,
+)
+from custom_components.apparent_temperature.formulas import FORMULAS
+
+FORMULA = FORMULAS[FORMULA_AUSTRALIAN]
+
+
+@pytest.fixture(autouse=True)
+def _auto_enable_custom_integrations(
+    recorder_db_url, enable_custom_integrations
+) -> None:
+    """Set up recorder database before custom integrations are enabled."""
+    return
+
+
+def test_compile_hourly_statistics():
+    """Test compiling of time-weighted hourly statistics."""
+    start = 7200.0
+    statistics = compile_hourly_statistics(
+        start,
+        start + 3 * 3600,
+        {
+            ROLE_TEMPERATURE: (
+                np.array([0.0, start + 1800, start + 3600]),
+                np.array([10.0, 20.0, np.nan]),
+            ),
+            ROLE_HUMIDITY: (np.array([0.0]), np.array([0.0])),
+            ROLE_WIND_SPEED: None,
+        },
+        FORMULA,
+    )
+
+    # Third hour has no valid values
+    assert len(statistics) == 1
+    hour, mean, minimum, maximum = statistics[0]
+    assert hour == start
+    assert minimum == pytest.approx(FORMULA.calculate(10, 0, 0))
+    assert maximum == pytest.approx(FORMULA.calculate(20, 0, 0))
+    assert mean == pytest.approx((minimum + maximum) / 2)
+
+
+async def test_async_backfill(recorder_mock: Recorder, hass: HomeAssistant, freezer):
+    """Test backfill of long-term statistics from recorded history."""
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(
+        hours=5
+    )
+    freezer.move_to(start)
+    for hour in range(4):
+        hass.states.async_set(
+            "sensor.test_temperature",
+            str(10 + hour),
+            {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+        )
+        hass.states.async_set(
+            "sensor.test_humidity", "50", {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE}
+        )
+        await async_wait_recording_done(hass)
+        freezer.tick(timedelta(hours=1))
+
+    imported = await async_backfill(
+        hass,
+        "sensor.test_apparent_temperature",
+        {
+            ROLE_TEMPERATURE: "sensor.test_temperature",
+            ROLE_HUMIDITY: "sensor.test_humidity",
+            ROLE_WIND_SPEED: None,
+        },
+        FORMULA,
+        start_time=start,
+        end_time=start + timedelta(hours=4, minutes=30),
+        chunk=timedelta(hours=3),
+    )
+    await async_wait_recording_done(hass)
+
+    assert imported == 4
+    statistics = await recorder_mock.async_add_executor_job(
+        statistics_during_period,
+        hass,
+        start,
+        None,
+        {"sensor.test_apparent_temperature"},
+        "hour",
+        None,
+        {"mean", "min", "max"},
+    )
+    rows = statistics["sensor.test_apparent_temperature"]
+    assert len(rows) == 4
+    for hour, row in enumerate(rows):
+        expected = FORMULA.calculate(10 + hour, 50, 0)
+        assert datetime.fromtimestamp(row["start"], dt_util.UTC) == start + timedelta(
+            hours=hour
+        )
+        assert row["mean"] == pytest.approx(expected)
+        assert row["min"] == pytest.approx(expected)
+        assert row["max"] == pytest.approx(expected)
@@ -0,0 +1,234 @@
+"""The test for the offline recalculation command line interface."""
+
+import csv
+import json
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, PERCENTAGE, UnitOfTemperature
+
+from custom_components.apparent_temperature.cli import (
+    database_time_range,
+    main,
+    parse_sensor,
+    read_database_states,
+)
+from custom_components.apparent_temperature.const import (
+    FORMULA_AUSTRALIAN,
+    ROLE_HUMIDITY,
+    ROLE_TEMPERATURE,
+    ROLE_WIND_SPEED,
+)
+from custom_components.apparent_temperature.formulas import FORMULAS
+
+START = 1704067200.0  # 2024-01-01 00:00:00 UTC
+HOUR = 3600.0
+
+# Recorded states of source entities
+STATES = [
+    (
+        "sensor.test_temperature",
+        "50",
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.FAHRENHEIT},
+        START - HOUR,
+    ),
+    ("sensor.test_humidity", "40", {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE}, START),
+    (
+        "sensor.test_temperature",
+        "20",
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+        START + 30 * HOUR,
+    ),
+    (
+        "sensor.test_humidity",
+        "unavailable",
+        {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE},
+        START + 40 * HOUR,
+    ),
+]
+
+EXPECTED = [
+    (START, 10.0, 40.0),
+    (START + 30 * HOUR, 20.0, 40.0),
+]
+
+
+def _create_database(path: Path) -> None:
+    """Create minimal recorder database."""
+    connection = sqlite3.connect(path)
+    connection.executescript(
+        """
+        CREATE TABLE states_meta (metadata_id INTEGER PRIMARY KEY, entity_id TEXT);
+        CREATE TABLE state_attributes (
+            attributes_id INTEGER PRIMARY KEY, shared_attrs TEXT
+        );
+        CREATE TABLE states (
+            state_id INTEGER PRIMARY KEY, state TEXT, attributes TEXT,
+            last_updated_ts FLOAT, metadata_id INTEGER, attributes_id INTEGER
+        );
+        """
+    )
+    metadata = {}
+    for entity_id, state, attributes, timestamp in STATES:
+        if entity_id not in metadata:
+            metadata[entity_id] = connection.execute(
+                "INSERT INTO states_meta (entity_id) VALUES (?)", (entity_id,)
+            ).lastrowid
+        attributes_id = connection.execute(
+            "INSERT INTO state_attributes (shared_attrs) VALUES (?)",
+            (json.dumps(attributes),),
+        ).lastrowid
+        connection.execute(
+            "INSERT INTO states (state, last_updated_ts, metadata_id, attributes_id) "
+            "VALUES (?, ?, ?, ?)",
+            (state, timestamp, metadata[entity_id], attributes_id),
+        )
+    connection.commit()
+    connection.close()
+
+
+def _read_output(path: Path) -> list[dict[str, str]]:
+    """Read results from output CSV file."""
+    with path.open(newline="", encoding="utf-8") as file:
+        return list(csv.DictReader(file))
+
+
+def _assert_output(rows: list[dict[str, str]]) -> None:
+    """Check results in output file."""
+    formula = FORMULAS[FORMULA_AUSTRALIAN]
+    assert len(rows) == len(EXPECTED)
+    for row, (timestamp, temp, humd) in zip(rows, EXPECTED, strict=True):
+        assert row["sensor"] == "test"
+        assert row["time"].startswith("2024-01-0")
+        assert float(row["temperature"]) == pytest.approx(temp)
+        assert float(row["humidity"]) == pytest.approx(humd)
+        assert float(row["apparent_temperature"]) == pytest.approx(
+            formula.calculate(temp, humd, 0)
+        )
+        assert row["time"] == (
+            "2024-01-01T00:00:00+00:00"
+            if timestamp == START
+            else "2024-01-02T06:00:00+00:00"
+        )
+
+
+def test_parse_sensor():
+    """Test parsing of sensor specification."""
+    assert parse_sensor("test=sensor.t,sensor.h").sources == {
+        ROLE_TEMPERATURE: "sensor.t",
+        ROLE_HUMIDITY: "sensor.h",
+        ROLE_WIND_SPEED: None,
+    }
+    assert parse_sensor("test=sensor.t,sensor.h,sensor.w").sources[ROLE_WIND_SPEED] == (
+        "sensor.w"
+    )
+
+
+def test_no_recorder():
+    """Test command line interface does not import recorder."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            (
+                "import sys, custom_components.apparent_temperature.cli; "
+                "print('homeassistant.components.recorder' in sys.modules)"
+            ),
+        ],
+        capture_output=True,
+        check=True,
+        cwd=Path(__file__).parents[1],
+        text=True,
+    )
+
+    assert result.stdout.strip() == "False"
+
+
+def test_database_connections(tmp_path: Path):
+    """Test database connections are closed after reading."""
+    database = tmp_path / "home-assistant_v2.db"
+    _create_database(database)
+    connections = []
+    sqlite_connect = sqlite3.connect
+
+    def connect(*args: Any, **kwargs: Any) -> sqlite3.Connection:
+        connections.append(sqlite_connect(*args, **kwargs))
+        return connections[-1]
+
+    with patch("custom_components.apparent_temperature.cli.sqlite3.connect", connect):
+        assert database_time_range(str(database), ["sensor.test_temperature"]) == (
+            START - HOUR,
+            START + 30 * HOUR,
+        )
+        rows = read_database_states(
+            str(database), "sensor.test_temperature", START, START + 48 * HOUR
+        )
+
+    assert [row.state for row in rows] == ["50", "20"]
+    assert len(connections) == 2
+    for connection in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            connection.execute("SELECT 1")
+
+
+def test_database(tmp_path: Path):
+    """Test recalculation from recorder database."""
+    database = tmp_path / "home-assistant_v2.db"
+    output = tmp_path / "output.csv"
+    _create_database(database)
+
+    assert (
+        main(
+            [
+                "--db",
+                str(database),
+                "--sensor",
+                "test=sensor.test_temperature,sensor.test_humidity",
+                "--output",
+                str(output),
+                "--start",
+                "2024-01-01T00:00:00+00:00",
+                "--workers",
+                "2",
+            ]
+        )
+        == 0
+    )
+    _assert_output(_read_output(output))
+
+
+def test_csv(tmp_path: Path):
+    """Test recalculation from CSV export of history."""
+    source = tmp_path / "history.csv"
+    output = tmp_path / "output.csv"
+    with source.open("w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(("entity_id", "state", "last_changed", "attributes"))
+        for entity_id, state, attributes, timestamp in sorted(STATES):
+            writer.writerow((entity_id, state, timestamp, json.dumps(attributes)))
+
+    assert (
+        main(
+            [
+                "--csv",
+                str(source),
+                "--sensor",
+                "test=sensor.test_temperature,sensor.test_humidity",
+                "--output",
+                str(output),
+                "--start",
+                "2024-01-01T00:00:00+00:00",
+                "--end",
+                "2024-01-03T00:00:00+00:00",
+                "--workers",
+                "2",
+            ]
+        )
+        == 0
+    )
+    _assert_output(_read_output(output))
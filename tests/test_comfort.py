@@ -0,0 +1,80 @@
+"""The test for the derived comfort values."""
+
+import pytest
+
+from custom_components.apparent_temperature.comfort import (
+    absolute_humidity,
+    comfort,
+    derived_values,
+    dew_point,
+)
+from custom_components.apparent_temperature.const import (
+    DERIVED_ABSOLUTE_HUMIDITY,
+    DERIVED_COMFORT,
+    DERIVED_DEW_POINT,
+    DERIVED_HEAT_INDEX,
+    DERIVED_WIND_CHILL,
+)
+from custom_components.apparent_temperature.formulas import vapor_pressure
+
+
+@pytest.mark.parametrize(
+    ("temp", "humi", "expected_dew_point", "expected_absolute_humidity"),
+    [
+        (20, 50, 9.3, 8.6),
+        (30, 70, 23.9, 21.2),
+        (-10, 80, -12.8, 1.9),
+    ],
+)
+def test_dew_point_and_absolute_humidity(
+    temp, humi, expected_dew_point, expected_absolute_humidity
+):
+    """Test dew point and absolute humidity."""
+    e_value = vapor_pressure(temp, humi)
+
+    assert dew_point(e_value) == pytest.approx(expected_dew_point, abs=0.1)
+    assert absolute_humidity(temp, e_value) == pytest.approx(
+        expected_absolute_humidity, abs=0.1
+    )
+
+
+def test_dew_point_dry_air():
+    """Test dew point of absolutely dry air."""
+    assert dew_point(0.0) is None
+    assert comfort(None) == "dry"
+
+
+@pytest.mark.parametrize(
+    ("dew_point_value", "expected"),
+    [
+        (5.0, "dry"),
+        (12.0, "very_comfortable"),
+        (15.9, "comfortable"),
+        (16.0, "ok_but_humid"),
+        (20.0, "somewhat_uncomfortable"),
+        (23.0, "quite_uncomfortable"),
+        (25.0, "extremely_uncomfortable"),
+        (30.0, "severely_high"),
+    ],
+)
+def test_comfort(dew_point_value, expected):
+    """Test comfort categories."""
+    assert comfort(dew_point_value) == expected
+
+
+def test_derived_values():
+    """Test only requested values are calculated."""
+    assert derived_values(20, 50, 0, [DERIVED_COMFORT, DERIVED_DEW_POINT]) == {
+        DERIVED_COMFORT: "dry",
+        DERIVED_DEW_POINT: pytest.approx(9.3, abs=0.1),
+    }
+    assert derived_values(
+        -10,
+        50,
+        20 / 3.6,
+        [DERIVED_ABSOLUTE_HUMIDITY, DERIVED_HEAT_INDEX, DERIVED_WIND_CHILL],
+    ) == {
+        DERIVED_ABSOLUTE_HUMIDITY: pytest.approx(1.1, abs=0.1),
+        DERIVED_HEAT_INDEX: pytest.approx(-13.6, abs=0.5),
+        DERIVED_WIND_CHILL: pytest.approx(-17.9, abs=0.5),
+    }
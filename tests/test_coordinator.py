@@ -0,0 +1,200 @@
+# pylint: disable=protected-access,redefined-outer-name
+"""The test for the source coordinator."""
+
+from datetime import timedelta
+
+from homeassistant.const import (
+    ATTR_UNIT_OF_MEASUREMENT,
+    CONF_PLATFORM,
+    CONF_SOURCE,
+    PERCENTAGE,
+    UnitOfSpeed,
+    UnitOfTemperature,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.apparent_temperature.const import (
+    ATTR_WEATHER_HUMIDITY,
+    ATTR_WEATHER_TEMPERATURE,
+    ATTR_WEATHER_TEMPERATURE_UNIT,
+    DOMAIN,
+)
+from custom_components.apparent_temperature.coordinator import (
+    EXPIRY_COMPACT_THRESHOLD,
+    SourceCoordinator,
+    async_get_coordinator,
+)
+from custom_components.apparent_temperature.source import SourceValues
+
+
+async def test_async_get_coordinator(hass: HomeAssistant):
+    """Test coordinator is shared integration-wide."""
+    coordinator = async_get_coordinator(hass)
+
+    assert isinstance(coordinator, SourceCoordinator)
+    assert async_get_coordinator(hass) is coordinator
+
+
+async def test_fan_out(hass: HomeAssistant):
+    """Test one decoded update is sent to every listener."""
+    hass.states.async_set(
+        "sensor.test_temperature",
+        "20",
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+    )
+    hass.states.async_set(
+        "sensor.test_humidity", "40", {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE}
+    )
+    coordinator = async_get_coordinator(hass)
+    calls1 = []
+    calls2 = []
+
+    @callback
+    def listener1(entity_id: str, values: SourceValues | None) -> None:
+        calls1.append((entity_id, values))
+
+    @callback
+    def listener2(entity_id: str, values: SourceValues | None) -> None:
+        calls2.append((entity_id, values))
+
+    unsub1 = coordinator.async_add_listener(
+        ["sensor.test_temperature", "sensor.test_humidity"], listener1
+    )
+    unsub2 = coordinator.async_add_listener(["sensor.test_temperature"], listener2)
+
+    assert sorted(coordinator.tracked_entities) == [
+        "sensor.test_humidity",
+        "sensor.test_temperature",
+    ]
+    assert coordinator.async_get_values("sensor.test_temperature") == SourceValues(
+        temperature=20.0
+    )
+    assert coordinator.async_get_values("sensor.test_humidity") == SourceValues(
+        humidity=40.0
+    )
+
+    hass.states.async_set(
+        "sensor.test_temperature",
+        "68",
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.FAHRENHEIT},
+    )
+    await hass.async_block_till_done()
+
+    assert calls1 == [("sensor.test_temperature", SourceValues(temperature=20.0))]
+    assert calls2 == calls1
+
+    unsub1()
+    hass.states.async_set(
+        "sensor.test_humidity", "45", {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE}
+    )
+    hass.states.async_set(
+        "sensor.test_temperature",
+        "21",
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+    )
+    await hass.async_block_till_done()
+
+    assert coordinator.tracked_entities == ["sensor.test_temperature"]
+    assert len(calls1) == 1
+    assert calls2[-1] == ("sensor.test_temperature", SourceValues(temperature=21.0))
+
+    unsub2()
+
+    assert coordinator.tracked_entities == []
+
+
+async def test_optional_wind_speed_availability(hass: HomeAssistant, caplog):
+    """Test source without optional wind speed is available."""
+    hass.states.async_set(
+        "weather.home",
+        "sunny",
+        {
+            ATTR_WEATHER_TEMPERATURE: 20,
+            ATTR_WEATHER_TEMPERATURE_UNIT: UnitOfTemperature.CELSIUS,
+            ATTR_WEATHER_HUMIDITY: 40,
+        },
+    )
+    hass.states.async_set(
+        "sensor.test_wind_speed",
+        "unknown",
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfSpeed.METERS_PER_SECOND},
+    )
+    assert await async_setup_component(
+        hass,
+        "sensor",
+        {"sensor": {CONF_PLATFORM: DOMAIN, CONF_SOURCE: "weather.home"}},
+    )
+    await hass.async_block_till_done()
+    coordinator = async_get_coordinator(hass)
+    coordinator.async_add_listener(["sensor.test_wind_speed"], lambda *_: None)
+
+    assert coordinator._availability["weather.home"].available
+    assert "weather.home is unavailable" not in caplog.text
+    assert float(hass.states.get("sensor.home_apparent_temperature").state)
+
+    # Wind speed is required from source which provides nothing else
+    hass.states.async_set(
+        "sensor.test_wind_speed",
+        "calm",
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfSpeed.METERS_PER_SECOND},
+    )
+    await hass.async_block_till_done()
+
+    assert not coordinator._availability["sensor.test_wind_speed"].available
+
+
+async def test_removed_source(hass: HomeAssistant):
+    """Test removed source entity is passed as missing values."""
+    hass.states.async_set(
+        "sensor.test_humidity", "40", {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE}
+    )
+    coordinator = async_get_coordinator(hass)
+    calls = []
+
+    coordinator.async_add_listener(
+        ["sensor.test_humidity"], lambda *args: calls.append(args)
+    )
+    hass.states.async_remove("sensor.test_humidity")
+    await hass.async_block_till_done()
+
+    assert calls == [("sensor.test_humidity", None)]
+    assert coordinator.async_get_values("sensor.test_humidity") is None
+
+
+async def test_expiry_queue(hass: HomeAssistant, freezer):
+    """Test expiry queue calls actions at their deadlines."""
+    expiry = async_get_coordinator(hass).expiry
+    now = dt_util.utcnow().timestamp()
+    calls = []
+
+    expiry.async_schedule("a", now + 10, lambda: calls.append("a"))
+    expiry.async_schedule("b", now + 20, lambda: calls.append("b"))
+    expiry.async_schedule("c", now + 30, lambda: calls.append("c"))
+    expiry.async_schedule("a", now + 25, lambda: calls.append("a"))
+    expiry.async_cancel("b")
+
+    assert len(expiry) == 2
+
+    for seconds, expected in ((15, []), (12, ["a"]), (8, ["a", "c"])):
+        freezer.tick(timedelta(seconds=seconds))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+        assert calls == expected
+
+    assert len(expiry) == 0
+
+
+async def test_expiry_queue_compaction(hass: HomeAssistant):
+    """Test rescheduled entries do not grow the heap unbounded."""
+    expiry = async_get_coordinator(hass).expiry
+    now = dt_util.utcnow().timestamp()
+
+    for index in range(1000):
+        expiry.async_schedule("a", now + 10 + index, lambda: None)
+
+    assert len(expiry) == 1
+    assert len(expiry._heap) <= 2 + EXPIRY_COMPACT_THRESHOLD
@@ -0,0 +1,83 @@
+"""The test for the apparent temperature formulas."""
+
+import numpy as np
+import pytest
+
+from custom_components.apparent_temperature.const import (
+    FORMULA_AUSTRALIAN,
+    FORMULA_FEELS_LIKE,
+    FORMULA_HEAT_INDEX,
+    FORMULA_HUMIDEX,
+    FORMULA_WIND_CHILL,
+)
+from custom_components.apparent_temperature.formulas import (
+    FORMULAS,
+    australian,
+    calculate_cached,
+    calculation_cache_info,
+    vapor_pressure,
+)
+
+TEMPERATURES = [-30.0, -10.0, 0.0, 10.0, 12.0, 20.0, 27.0, 32.0, 35.0, 45.0]
+HUMIDITIES = [0.0, 10.0, 32.0, 50.0, 90.0]
+WIND_SPEEDS = [0.0, 1.0, 2.7777777777777777, 10.0]
+
+
+@pytest.mark.parametrize(
+    ("formula", "temp", "humi", "wind", "expected"),
+    [
+        (FORMULA_AUSTRALIAN, 12, 32, 10 / 3.6, 7.364606040265729),
+        (FORMULA_AUSTRALIAN, 20, 0, 0, 15.75),
+        (FORMULA_HEAT_INDEX, 20, 50, 0, 19.4),
+        (FORMULA_HEAT_INDEX, 32.2, 50, 0, 35.0),
+        (FORMULA_WIND_CHILL, -10, 50, 20 / 3.6, -17.9),
+        (FORMULA_WIND_CHILL, 15, 50, 20 / 3.6, 15.0),
+        (FORMULA_HUMIDEX, 30, 70, 0, 41.1),
+        (FORMULA_FEELS_LIKE, 32.2, 50, 5, 35.0),
+        (FORMULA_FEELS_LIKE, -10, 50, 20 / 3.6, -17.9),
+        (FORMULA_FEELS_LIKE, 20, 50, 5, 20.0),
+    ],
+)
+def test_calculate(formula, temp, humi, wind, expected):
+    """Test scalar formulas."""
+    assert FORMULAS[formula].calculate(temp, humi, wind) == pytest.approx(
+        expected, abs=0.5
+    )
+
+
+@pytest.mark.parametrize("formula", list(FORMULAS))
+def test_calculate_batch(formula):
+    """Test batch formulas give the same results as scalar ones."""
+    temp, humi, wind = (
+        grid.ravel()
+        for grid in np.meshgrid(TEMPERATURES, HUMIDITIES, WIND_SPEEDS, indexing="ij")
+    )
+    calculate = FORMULAS[formula].calculate
+
+    result = FORMULAS[formula].calculate_batch(temp, humi, wind)
+
+    assert result.shape == temp.shape
+    assert result == pytest.approx(
+        [calculate(*values) for values in zip(temp, humi, wind, strict=True)]
+    )
+    assert FORMULAS[formula].calculate_batch(12.0, 32.0, 0.0).shape == ()
+
+
+def test_calculate_cached():
+    """Test calculations are cached by quantized values."""
+    hits, misses = calculation_cache_info()
+
+    value, e_value = calculate_cached(FORMULA_AUSTRALIAN, 12.344, 32.0, 10 / 3.6)
+    assert value == pytest.approx(australian(12.344, 32.0, 10 / 3.6), abs=0.01)
+    assert e_value == pytest.approx(vapor_pressure(12.344, 32.0), abs=0.01)
+    assert calculation_cache_info() == (hits, misses + 1)
+
+    # Values which differ less than quantum share cached result
+    assert calculate_cached(FORMULA_AUSTRALIAN, 12.3441, 32.0, 2.7778) == (
+        value,
+        e_value,
+    )
+    assert calculation_cache_info() == (hits + 1, misses + 1)
+
+    calculate_cached(FORMULA_HUMIDEX, 12.344, 32.0, 10 / 3.6)
+    assert calculation_cache_info() == (hits + 1, misses + 2)
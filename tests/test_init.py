@@ -0,0 +1,263 @@
+"""The test for the apparent_temperature integration setup."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import (
+    ATTR_UNIT_OF_MEASUREMENT,
+    CONF_NAME,
+    CONF_SOURCE,
+    PERCENTAGE,
+    UnitOfTemperature,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+
+from custom_components.apparent_temperature.const import CONF_AREAS, DOMAIN
+from custom_components.apparent_temperature.sensor import ApparentTemperatureSensor
+from custom_components.apparent_temperature.source import expand_source
+
+
+async def test_setup_sensors_from_integration_config(hass: HomeAssistant):
+    """Test all sensors of integration configuration are set up at once."""
+    hass.states.async_set(
+        "sensor.outdoor_temperature",
+        "12",
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+    )
+    hass.states.async_set(
+        "sensor.outdoor_humidity", "32", {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE}
+    )
+    for index in range(3):
+        hass.states.async_set(
+            f"sensor.room_{index}_temperature",
+            "20",
+            {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+        )
+
+    with patch(
+        "custom_components.apparent_temperature.coordinator.expand_source",
+        wraps=expand_source,
+    ) as expand:
+        assert await async_setup_component(
+            hass,
+            DOMAIN,
+            {
+                DOMAIN: [
+                    {
+                        CONF_NAME: "Outdoor",
+                        CONF_SOURCE: [
+                            "sensor.outdoor_temperature",
+                            "sensor.outdoor_humidity",
+                        ],
+                    },
+                    *(
+                        {
+                            CONF_NAME: f"Room {index}",
+                            CONF_SOURCE: [
+                                f"sensor.room_{index}_temperature",
+                                "sensor.outdoor_humidity",
+                            ],
+                        }
+                        for index in range(3)
+                    ),
+                ]
+            },
+        )
+        await hass.async_block_till_done()
+
+        # Shared source is expanded only once
+        assert expand.call_count == 5
+
+    state = hass.states.get("sensor.outdoor")
+    assert float(state.state) > 0
+    for index in range(3):
+        state = hass.states.get(f"sensor.room_{index}")
+        assert float(state.state) > float(hass.states.get("sensor.outdoor").state)
+
+
+async def test_setup_area_sensors(hass: HomeAssistant):
+    """Test sensors are created and removed for areas incrementally."""
+    area_registry = ar.async_get(hass)
+    entity_registry = er.async_get(hass)
+    kitchen = area_registry.async_create("Kitchen")
+    garage = area_registry.async_create("Garage")
+
+    def add_source(object_id, device_class, unit, value, area_id) -> str:
+        entry = entity_registry.async_get_or_create(
+            "sensor",
+            "test",
+            object_id,
+            suggested_object_id=object_id,
+            original_device_class=device_class,
+            unit_of_measurement=unit,
+        )
+        entity_registry.async_update_entity(entry.entity_id, area_id=area_id)
+        hass.states.async_set(entry.entity_id, value, {ATTR_UNIT_OF_MEASUREMENT: unit})
+        return entry.entity_id
+
+    add_source(
+        "kitchen_temperature",
+        SensorDeviceClass.TEMPERATURE,
+        UnitOfTemperature.CELSIUS,
+        "22",
+        kitchen.id,
+    )
+    humidity = add_source(
+        "kitchen_humidity", SensorDeviceClass.HUMIDITY, PERCENTAGE, "50", kitchen.id
+    )
+    add_source(
+        "garage_temperature",
+        SensorDeviceClass.TEMPERATURE,
+        UnitOfTemperature.CELSIUS,
+        "10",
+        garage.id,
+    )
+
+    assert await async_setup_component(hass, DOMAIN, {DOMAIN: {CONF_AREAS: None}})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.kitchen_apparent_temperature")
+    assert state is not None
+    assert float(state.state) > 0
+    # Garage has no humidity source
+    assert hass.states.get("sensor.garage_apparent_temperature") is None
+
+    # Humidity sensor is moved to garage
+    entity_registry.async_update_entity(humidity, area_id=garage.id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.kitchen_apparent_temperature") is None
+    state = hass.states.get("sensor.garage_apparent_temperature")
+    assert state is not None
+    assert float(state.state) > 0
+
+
+async def test_area_source_registered_before_state(hass: HomeAssistant):
+    """Test area sources are tracked even if they have no state yet."""
+    area_registry = ar.async_get(hass)
+    entity_registry = er.async_get(hass)
+    kitchen = area_registry.async_create("Kitchen")
+
+    def register(object_id, device_class, unit) -> str:
+        entry = entity_registry.async_get_or_create(
+            "sensor",
+            "test",
+            object_id,
+            suggested_object_id=object_id,
+            original_device_class=device_class,
+            unit_of_measurement=unit,
+        )
+        entity_registry.async_update_entity(entry.entity_id, area_id=kitchen.id)
+        return entry.entity_id
+
+    humidity = register("kitchen_humidity", SensorDeviceClass.HUMIDITY, PERCENTAGE)
+    hass.states.async_set(humidity, "50", {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE})
+
+    assert await async_setup_component(hass, DOMAIN, {DOMAIN: {CONF_AREAS: None}})
+    await hass.async_block_till_done()
+
+    temperatures = []
+    for index, value in enumerate(("20", "24")):
+        # Registry entry of new source appears before its first state
+        temperature = register(
+            f"kitchen_temperature_{index}",
+            SensorDeviceClass.TEMPERATURE,
+            UnitOfTemperature.CELSIUS,
+        )
+        temperatures.append(temperature)
+        await hass.async_block_till_done()
+        hass.states.async_set(
+            temperature, value, {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS}
+        )
+        await hass.async_block_till_done()
+
+        state = hass.states.get("sensor.kitchen_apparent_temperature")
+        assert state.attributes["temperature_source"] == temperatures
+        # Mean of all temperature sources
+        assert float(state.attributes["temperature_source_value"]) == pytest.approx(
+            20 + 2 * index
+        )
+
+
+async def test_area_updates(hass: HomeAssistant, caplog):
+    """Test area updates do not overlap and stop with Home Assistant."""
+    area_registry = ar.async_get(hass)
+    entity_registry = er.async_get(hass)
+    kitchen = area_registry.async_create("Kitchen")
+
+    def register(object_id, device_class, unit, value) -> str:
+        entry = entity_registry.async_get_or_create(
+            "sensor",
+            "test",
+            object_id,
+            suggested_object_id=object_id,
+            original_device_class=device_class,
+            unit_of_measurement=unit,
+        )
+        hass.states.async_set(entry.entity_id, value, {ATTR_UNIT_OF_MEASUREMENT: unit})
+        return entry.entity_id
+
+    for entity_id in (
+        register("kitchen_humidity", SensorDeviceClass.HUMIDITY, PERCENTAGE, "50"),
+        register(
+            "kitchen_temperature",
+            SensorDeviceClass.TEMPERATURE,
+            UnitOfTemperature.CELSIUS,
+            "20",
+        ),
+    ):
+        entity_registry.async_update_entity(entity_id, area_id=kitchen.id)
+    assert await async_setup_component(hass, DOMAIN, {DOMAIN: {CONF_AREAS: None}})
+    await hass.async_block_till_done()
+    listeners = hass.bus.async_listeners()
+
+    temperatures = [
+        register(
+            f"kitchen_temperature_{index}",
+            SensorDeviceClass.TEMPERATURE,
+            UnitOfTemperature.CELSIUS,
+            str(21 + index),
+        )
+        for index in range(2)
+    ]
+    await hass.async_block_till_done()
+
+    original = ApparentTemperatureSensor.async_will_remove_from_hass
+    removable = asyncio.Event()
+
+    async def async_will_remove_from_hass(self) -> None:
+        # Removal of entity may suspend, e.g. to save its state
+        await removable.wait()
+        await original(self)
+
+    # Each source moved to area recreates area sensor, the second move is
+    # handled while the sensor is being removed after the first one
+    with patch.object(
+        ApparentTemperatureSensor,
+        "async_will_remove_from_hass",
+        async_will_remove_from_hass,
+    ):
+        for entity_id in temperatures:
+            entity_registry.async_update_entity(entity_id, area_id=kitchen.id)
+        hass.loop.call_soon(removable.set)
+        await hass.async_block_till_done()
+
+    assert "does not generate unique IDs" not in caplog.text
+    state = hass.states.get("sensor.kitchen_apparent_temperature")
+    assert state.attributes["temperature_source"][1:] == temperatures
+    assert float(state.attributes["temperature_source_value"]) == pytest.approx(21)
+
+    await hass.async_stop()
+
+    remaining = hass.bus.async_listeners()
+    for event_type in (
+        er.EVENT_ENTITY_REGISTRY_UPDATED,
+        dr.EVENT_DEVICE_REGISTRY_UPDATED,
+    ):
+        assert remaining.get(event_type, 0) == listeners[event_type] - 1
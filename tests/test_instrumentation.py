@@ -0,0 +1,42 @@
+"""The test for the runtime instrumentation."""
+
+from custom_components.apparent_temperature.instrumentation import (
+    SensorStats,
+    percentile,
+)
+
+
+def test_percentile():
+    """Test nearest-rank percentile."""
+    samples = list(range(1, 101))
+
+    assert percentile([], 0.5) is None
+    assert percentile([7], 0.99) == 7
+    assert percentile(samples, 0.5) == 51
+    assert percentile(samples, 0.99) == 100
+
+
+def test_sensor_stats():
+    """Test update statistics."""
+    stats = SensorStats(samples=4)
+
+    assert stats.as_dict() == {
+        "updates": 0,
+        "coalesced": 0,
+        "skipped": 0,
+        "latency_p50": None,
+        "latency_p99": None,
+    }
+
+    stats.updates = 3
+    for latency in (9_000_000, 1_000_000, 2_000_000, 3_000_000, 4_000_000):
+        stats.add_latency(latency)
+
+    # Only the most recent samples are kept
+    assert stats.as_dict() == {
+        "updates": 3,
+        "coalesced": 0,
+        "skipped": 0,
+        "latency_p50": 3.0,
+        "latency_p99": 4.0,
+    }
@@ -1,7 +1,9 @@
 # pylint: disable=protected-access,redefined-outer-name
 """The test for the sensor platform."""
 
+from datetime import timedelta
 from typing import Final
+from unittest.mock import patch
 
 import pytest
 from homeassistant.components.number import NumberDeviceClass
@@ -14,26 +16,58 @@ from homeassistant.components.weather import (
     ATTR_WEATHER_WIND_SPEED_UNIT,
 )
 from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_UNIT_OF_MEASUREMENT,
+    CONF_NAME,
     CONF_PLATFORM,
     CONF_SOURCE,
+    CONF_UNIQUE_ID,
+    EVENT_CALL_SERVICE,
     PERCENTAGE,
+    STATE_UNAVAILABLE,
     UnitOfSpeed,
     UnitOfTemperature,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CoreState, HomeAssistant, State
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.setup import async_setup_component
-from pytest_homeassistant_custom_component.common import assert_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    assert_setup_component,
+    async_capture_events,
+    async_fire_time_changed,
+    mock_restore_cache_with_extra_data,
+)
 
 from custom_components.apparent_temperature.const import (
+    AGGREGATE_MEDIAN,
     ATTR_HUMIDITY_SOURCE,
     ATTR_HUMIDITY_SOURCE_VALUE,
+    ATTR_START_TIME,
     ATTR_TEMPERATURE_SOURCE,
     ATTR_TEMPERATURE_SOURCE_VALUE,
     ATTR_WIND_SPEED_SOURCE,
     ATTR_WIND_SPEED_SOURCE_VALUE,
+    CONF_AGGREGATE,
+    CONF_DERIVED,
+    CONF_INSTRUMENTATION,
+    CONF_MAX_AGE,
+    CONF_MIN_CHANGE,
+    CONF_WINDOWS,
+    DERIVED_COMFORT,
+    DERIVED_DEW_POINT,
     DOMAIN,
+    SERVICE_BACKFILL,
+    SERVICE_GET_FORECASTS,
+)
+from custom_components.apparent_temperature.coordinator import async_get_coordinator
+from custom_components.apparent_temperature.forecast import calculate_forecast
+from custom_components.apparent_temperature.formulas import australian
+from custom_components.apparent_temperature.sensor import (
+    ApparentTemperatureSensor,
+    UnrecordedApparentTemperatureSensor,
 )
-from custom_components.apparent_temperature.sensor import ApparentTemperatureSensor
+from custom_components.apparent_temperature.source import SourceValues
 
 TEST_UNIQUE_ID: Final = "test_id"
 TEST_NAME: Final = "test_name"
@@ -276,7 +310,7 @@ async def test_async_setup_platform(hass: HomeAssistant, temp, humi, wind, expec
     state = hass.states.get("sensor.test_apparent_temperature")
     assert state.attributes.get("friendly_name") == "test_Apparent temperature"
     assert state is not None
-    assert state.state == expected
+    assert float(state.state) == pytest.approx(float(expected), abs=0.01)
     assert state.attributes[ATTR_TEMPERATURE_SOURCE] == "weather.test_monitored"
     assert state.attributes[ATTR_HUMIDITY_SOURCE] == "weather.test_monitored"
     assert state.attributes[ATTR_WIND_SPEED_SOURCE] == "weather.test_monitored"
@@ -371,4 +405,657 @@ async def test_async_update(hass: HomeAssistant):
     entity._wind = "weather.test_monitored"
     await entity.async_update()
     assert entity.state is not None
-    assert entity.state == 7.364606040265729
+    assert entity.state == pytest.approx(7.364606040265729, abs=0.01)
+
+
+async def test__async_source_updated(hass: HomeAssistant):
+    """Test sensor recalculation from decoded source values."""
+    entity = ApparentTemperatureSensor(TEST_UNIQUE_ID, TEST_NAME, TEST_SOURCES)
+    entity.hass = hass
+    entity._temp = "sensor.test_temperature"
+    entity._humd = entity._wind = "weather.test_monitored"
+    entity._temp_val = 12.0
+
+    with patch.object(entity, "async_write_ha_state") as write_state:
+        entity._async_source_updated(
+            "weather.test_monitored",
+            SourceValues(temperature=30.0, humidity=32.0, wind_speed=10 / 3.6),
+        )
+
+    write_state.assert_called_once()
+    assert entity._temp_val == 12.0
+    assert entity._humd_val == 32.0
+    assert entity.state == pytest.approx(7.364606040265729, abs=0.01)
+
+    with patch.object(entity, "async_write_ha_state") as write_state:
+        entity._async_source_updated("sensor.test_temperature", None)
+
+    write_state.assert_called_once()
+    assert entity._temp_val is None
+    assert entity.state is None
+    assert entity.available is False
+
+
+async def test_coalesce_window(hass: HomeAssistant):
+    """Test source updates within coalescing window are written once."""
+    entity = ApparentTemperatureSensor(
+        TEST_UNIQUE_ID, TEST_NAME, TEST_SOURCES, coalesce_window=0.05
+    )
+    entity.hass = hass
+    entity._temp = "sensor.test_temperature"
+    entity._humd = "sensor.test_humidity"
+
+    with patch.object(entity, "async_write_ha_state") as write_state:
+        entity._async_source_updated(
+            "sensor.test_temperature", SourceValues(temperature=12.0)
+        )
+        entity._async_source_updated(
+            "sensor.test_humidity", SourceValues(humidity=32.0)
+        )
+
+        write_state.assert_not_called()
+        assert entity.state is None
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+
+        write_state.assert_called_once()
+        assert entity.state == 9.309050484710173
+
+
+async def test_change_suppression(hass: HomeAssistant, freezer):
+    """Test insignificant changes are not written."""
+    entity = ApparentTemperatureSensor(
+        TEST_UNIQUE_ID,
+        TEST_NAME,
+        TEST_SOURCES,
+        min_change=0.5,
+        hysteresis=0.5,
+        heartbeat=timedelta(minutes=10),
+    )
+    entity.hass = hass
+
+    with patch.object(entity, "async_write_ha_state") as write_state:
+        for value, written in (
+            (None, True),
+            (None, False),
+            (10.0, True),
+            (10.4, False),
+            (10.5, True),
+            (10.1, False),  # Direction reversal needs min_change + hysteresis
+            (9.5, True),
+            (9.0, True),
+            (None, True),
+        ):
+            write_state.reset_mock()
+            entity._attr_native_value = value
+            entity._async_write_state()
+            assert write_state.called is written, value
+
+        entity._attr_native_value = 9.0
+        entity._async_write_state()
+        write_state.reset_mock()
+
+        entity._attr_native_value = 9.1
+        entity._async_write_state()
+        write_state.assert_not_called()
+
+        freezer.tick(timedelta(minutes=11))
+        entity._async_write_state()
+        write_state.assert_called_once()
+
+
+async def test_source_values_modes(hass: HomeAssistant):
+    """Test source values attributes modes."""
+    await async_setup_test_entities(hass)
+
+    entity = ApparentTemperatureSensor(
+        TEST_UNIQUE_ID, TEST_NAME, ["weather.test_monitored"], source_values=False
+    )
+    entity.hass = hass
+    entity._setup_sources()
+    entity._async_refresh()
+
+    attributes = entity.extra_state_attributes
+    assert attributes == {
+        ATTR_TEMPERATURE_SOURCE: "weather.test_monitored",
+        ATTR_HUMIDITY_SOURCE: "weather.test_monitored",
+        ATTR_WIND_SPEED_SOURCE: "weather.test_monitored",
+    }
+    assert entity.extra_state_attributes is attributes
+
+    entity = UnrecordedApparentTemperatureSensor(
+        TEST_UNIQUE_ID, TEST_NAME, ["weather.test_monitored"]
+    )
+    entity.hass = hass
+    entity._setup_sources()
+    entity._async_refresh()
+
+    assert entity.extra_state_attributes[ATTR_TEMPERATURE_SOURCE_VALUE] == 12.0
+    assert entity._unrecorded_attributes == {
+        ATTR_TEMPERATURE_SOURCE_VALUE,
+        ATTR_HUMIDITY_SOURCE_VALUE,
+        ATTR_WIND_SPEED_SOURCE_VALUE,
+    }
+
+
+async def test_group_membership_changes(hass: HomeAssistant):
+    """Test sources follow group membership changes."""
+    for entity_id, value, unit in (
+        ("sensor.test_temperature", "20", UnitOfTemperature.CELSIUS),
+        ("sensor.test_temperature_2", "30", UnitOfTemperature.CELSIUS),
+        ("sensor.test_humidity", "40", PERCENTAGE),
+    ):
+        hass.states.async_set(entity_id, value, {ATTR_UNIT_OF_MEASUREMENT: unit})
+    hass.states.async_set(
+        "group.test_group",
+        "on",
+        {ATTR_ENTITY_ID: ["sensor.test_temperature", "sensor.test_humidity"]},
+    )
+    assert await async_setup_component(hass, "sensor", {"sensor": [TEST_CONFIG]})
+    await hass.async_start()
+    await hass.async_block_till_done()
+
+    coordinator = async_get_coordinator(hass)
+    state = hass.states.get("sensor.test_apparent_temperature")
+    assert state.attributes[ATTR_TEMPERATURE_SOURCE] == "sensor.test_temperature"
+    assert state.attributes[ATTR_TEMPERATURE_SOURCE_VALUE] == 20.0
+
+    # Expansions shared by sensors set up together may predate the change
+    with (
+        patch.object(
+            coordinator, "async_add_listener", wraps=coordinator.async_add_listener
+        ) as add_listener,
+        patch.object(coordinator, "async_expand_source") as expand,
+    ):
+        hass.states.async_set(
+            "group.test_group",
+            "on",
+            {ATTR_ENTITY_ID: ["sensor.test_humidity", "group.test_nested"]},
+        )
+        hass.states.async_set(
+            "group.test_nested", "on", {ATTR_ENTITY_ID: ["sensor.test_temperature_2"]}
+        )
+        await hass.async_block_till_done()
+
+    expand.assert_not_called()
+    # Unchanged sources are not re-subscribed
+    add_listener.assert_called_once()
+    assert add_listener.call_args.args[0] == ["sensor.test_temperature_2"]
+    assert sorted(coordinator.tracked_entities) == [
+        "sensor.test_humidity",
+        "sensor.test_temperature_2",
+    ]
+    state = hass.states.get("sensor.test_apparent_temperature")
+    assert state.attributes[ATTR_TEMPERATURE_SOURCE] == "sensor.test_temperature_2"
+    assert state.attributes[ATTR_TEMPERATURE_SOURCE_VALUE] == 30.0
+
+    hass.states.async_set(
+        "group.test_nested", "on", {ATTR_ENTITY_ID: ["sensor.test_temperature"]}
+    )
+    await hass.async_block_till_done()
+
+    assert sorted(coordinator.tracked_entities) == [
+        "sensor.test_humidity",
+        "sensor.test_temperature",
+    ]
+    state = hass.states.get("sensor.test_apparent_temperature")
+    assert state.attributes[ATTR_TEMPERATURE_SOURCE_VALUE] == 20.0
+
+
+async def test_setup_when_running(hass: HomeAssistant):
+    """Test sensor added after startup is updated immediately."""
+    await hass.async_start()
+    await hass.async_block_till_done()
+    hass.states.async_set(
+        "sensor.test_temperature",
+        "12",
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+    )
+    hass.states.async_set(
+        "sensor.test_humidity", "32", {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE}
+    )
+
+    assert await async_setup_component(
+        hass,
+        "sensor",
+        {
+            "sensor": {
+                CONF_PLATFORM: DOMAIN,
+                CONF_SOURCE: ["sensor.test_temperature", "sensor.test_humidity"],
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test_apparent_temperature")
+    assert state.state == "9.30905048471017"
+
+
+async def test_restore_state(hass: HomeAssistant):
+    """Test last sensor value and source values are restored."""
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State(
+                    "sensor.test_apparent_temperature",
+                    "9.3",
+                    {
+                        ATTR_TEMPERATURE_SOURCE_VALUE: 12.0,
+                        ATTR_HUMIDITY_SOURCE_VALUE: 32.0,
+                        ATTR_WIND_SPEED_SOURCE_VALUE: 0.0,
+                    },
+                ),
+                {
+                    "native_value": 9.3,
+                    "native_unit_of_measurement": UnitOfTemperature.CELSIUS,
+                },
+            )
+        ],
+    )
+    hass.set_state(CoreState.not_running)
+    hass.states.async_set(
+        "sensor.test_temperature",
+        STATE_UNAVAILABLE,
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+    )
+    hass.states.async_set(
+        "sensor.test_humidity",
+        STATE_UNAVAILABLE,
+        {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE},
+    )
+
+    assert await async_setup_component(
+        hass,
+        "sensor",
+        {
+            "sensor": {
+                CONF_PLATFORM: DOMAIN,
+                CONF_SOURCE: ["sensor.test_temperature", "sensor.test_humidity"],
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test_apparent_temperature")
+    assert state.state == "9.3"
+    assert state.attributes[ATTR_TEMPERATURE_SOURCE_VALUE] == 12.0
+    assert state.attributes[ATTR_HUMIDITY_SOURCE_VALUE] == 32.0
+    assert state.attributes[ATTR_WIND_SPEED_SOURCE_VALUE] == 0.0
+
+    await hass.async_start()
+    await hass.async_block_till_done()
+
+    # Sources which have not reported yet keep restored values
+    state = hass.states.get("sensor.test_apparent_temperature")
+    assert state.state == "9.30905048471017"
+
+    hass.states.async_set(
+        "sensor.test_temperature",
+        "20",
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test_apparent_temperature")
+    assert state.attributes[ATTR_TEMPERATURE_SOURCE_VALUE] == 20.0
+    assert state.attributes[ATTR_HUMIDITY_SOURCE_VALUE] == 32.0
+
+
+async def test_instrumentation(hass: HomeAssistant):
+    """Test update statistics are exposed by diagnostic sensor."""
+    hass.states.async_set(
+        "sensor.test_temperature",
+        "12",
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+    )
+    hass.states.async_set(
+        "sensor.test_humidity", "32", {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE}
+    )
+    assert await async_setup_component(
+        hass,
+        "sensor",
+        {
+            "sensor": {
+                CONF_PLATFORM: DOMAIN,
+                CONF_SOURCE: ["sensor.test_temperature", "sensor.test_humidity"],
+                CONF_MIN_CHANGE: 1,
+                CONF_INSTRUMENTATION: True,
+            }
+        },
+    )
+    await hass.async_start()
+    await hass.async_block_till_done()
+
+    for value in ("12.1", "12.2", "20", "abc"):
+        hass.states.async_set(
+            "sensor.test_temperature",
+            value,
+            {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+        )
+        await hass.async_block_till_done()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=1))
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test_apparent_temperature_update_latency")
+    assert state is not None
+    assert float(state.state) > 0
+    assert state.attributes["updates"] == 4
+    assert state.attributes["coalesced"] == 0
+    assert state.attributes["skipped"] == 2
+    assert state.attributes["decode_failures"] == 1
+    assert state.attributes["cache_hits"] + state.attributes["cache_misses"] > 0
+    assert state.attributes["latency_p50"] > 0
+
+
+async def test_max_age(hass: HomeAssistant, freezer):
+    """Test values of sources which stopped updating expire."""
+    hass.states.async_set(
+        "sensor.test_temperature",
+        "12",
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+    )
+    hass.states.async_set(
+        "sensor.test_humidity", "32", {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE}
+    )
+    assert await async_setup_component(
+        hass,
+        "sensor",
+        {
+            "sensor": {
+                CONF_PLATFORM: DOMAIN,
+                CONF_SOURCE: ["sensor.test_temperature", "sensor.test_humidity"],
+                CONF_MAX_AGE: {"minutes": 1},
+            }
+        },
+    )
+    await hass.async_start()
+    await hass.async_block_till_done()
+
+    freezer.tick(timedelta(seconds=30))
+    hass.states.async_set(
+        "sensor.test_humidity", "33", {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE}
+    )
+    await hass.async_block_till_done()
+
+    freezer.tick(timedelta(seconds=40))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test_apparent_temperature")
+    assert state.state == STATE_UNAVAILABLE
+
+    hass.states.async_set(
+        "sensor.test_temperature",
+        "13",
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test_apparent_temperature")
+    assert state.state != STATE_UNAVAILABLE
+    assert state.attributes[ATTR_TEMPERATURE_SOURCE_VALUE] == 13.0
+
+
+async def test_aggregate(hass: HomeAssistant):
+    """Test several sources of the same role are aggregated."""
+    for index, value in enumerate((19, 20, 21, 24), 1):
+        hass.states.async_set(
+            f"sensor.probe_{index}",
+            str(value),
+            {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+        )
+    hass.states.async_set(
+        "sensor.test_humidity", "32", {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE}
+    )
+    assert await async_setup_component(
+        hass,
+        "sensor",
+        {
+            "sensor": {
+                CONF_PLATFORM: DOMAIN,
+                CONF_NAME: "Room",
+                CONF_SOURCE: [
+                    "sensor.probe_1",
+                    "sensor.probe_2",
+                    "sensor.probe_3",
+                    "sensor.probe_4",
+                    "sensor.test_humidity",
+                ],
+                CONF_AGGREGATE: AGGREGATE_MEDIAN,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.room")
+    assert state.attributes[ATTR_TEMPERATURE_SOURCE] == [
+        "sensor.probe_1",
+        "sensor.probe_2",
+        "sensor.probe_3",
+        "sensor.probe_4",
+    ]
+    assert state.attributes[ATTR_HUMIDITY_SOURCE] == ["sensor.test_humidity"]
+    assert state.attributes[ATTR_WIND_SPEED_SOURCE] is None
+    assert state.attributes[ATTR_TEMPERATURE_SOURCE_VALUE] == 20.5
+
+    hass.states.async_set(
+        "sensor.probe_1", "23", {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS}
+    )
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.room")
+    assert state.attributes[ATTR_TEMPERATURE_SOURCE_VALUE] == 22.0
+
+    # Unavailable probe is left out of aggregate
+    hass.states.async_set("sensor.probe_4", STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.room")
+    assert state.state != STATE_UNAVAILABLE
+    assert state.attributes[ATTR_TEMPERATURE_SOURCE_VALUE] == 21.0
+
+    # History and forecasts are not aggregated
+    for service, data in (
+        (SERVICE_BACKFILL, {ATTR_START_TIME: dt_util.utcnow() - timedelta(days=1)}),
+        (SERVICE_GET_FORECASTS, {"type": "hourly"}),
+    ):
+        with pytest.raises(HomeAssistantError, match="aggregates several sources"):
+            await hass.services.async_call(
+                DOMAIN,
+                service,
+                data,
+                target={ATTR_ENTITY_ID: "sensor.room"},
+                blocking=True,
+                return_response=service == SERVICE_GET_FORECASTS,
+            )
+
+
+async def test_windows(hass: HomeAssistant, freezer):
+    """Test rolling-window statistics are published and restored."""
+    now = dt_util.utcnow().timestamp()
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State("sensor.test_apparent_temperature", "15.0"),
+                {
+                    "native_value": 15.0,
+                    "native_unit_of_measurement": UnitOfTemperature.CELSIUS,
+                    "windows": {"1h": [[(now - 600) // 10, 5.0, 15.0, 20.0, 2]]},
+                },
+            )
+        ],
+    )
+    hass.states.async_set(
+        "sensor.test_temperature",
+        "12",
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+    )
+    hass.states.async_set(
+        "sensor.test_humidity", "32", {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE}
+    )
+    assert await async_setup_component(
+        hass,
+        "sensor",
+        {
+            "sensor": {
+                CONF_PLATFORM: DOMAIN,
+                CONF_SOURCE: ["sensor.test_temperature", "sensor.test_humidity"],
+                CONF_WINDOWS: [{"hours": 1}, {"hours": 24}],
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test_apparent_temperature")
+    value = float(state.state)
+    assert state.attributes["min_1h"] == 5.0
+    assert state.attributes["max_1h"] == 15.0
+    assert state.attributes["mean_1h"] == pytest.approx((20.0 + value) / 3)
+    assert state.attributes["min_24h"] == pytest.approx(value)
+    assert state.attributes["max_24h"] == pytest.approx(value)
+
+    freezer.tick(timedelta(hours=2))
+    hass.states.async_set(
+        "sensor.test_temperature",
+        "20",
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test_apparent_temperature")
+    new_value = float(state.state)
+    assert state.attributes["min_1h"] == pytest.approx(new_value)
+    assert state.attributes["max_1h"] == pytest.approx(new_value)
+    assert state.attributes["min_24h"] == pytest.approx(value)
+    assert state.attributes["max_24h"] == pytest.approx(new_value)
+
+
+async def test_derived(hass: HomeAssistant):
+    """Test derived comfort sensors are updated with apparent temperature."""
+    hass.states.async_set(
+        "sensor.test_temperature",
+        "20",
+        {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+    )
+    hass.states.async_set(
+        "sensor.test_humidity", "50", {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE}
+    )
+    assert await async_setup_component(
+        hass,
+        "sensor",
+        {
+            "sensor": {
+                CONF_PLATFORM: DOMAIN,
+                CONF_UNIQUE_ID: TEST_UNIQUE_ID,
+                CONF_SOURCE: ["sensor.test_temperature", "sensor.test_humidity"],
+                CONF_DERIVED: [DERIVED_DEW_POINT, DERIVED_COMFORT],
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test_apparent_temperature_dew_point")
+    assert float(state.state) == pytest.approx(9.3, abs=0.1)
+    assert state.attributes[ATTR_UNIT_OF_MEASUREMENT] == UnitOfTemperature.CELSIUS
+    state = hass.states.get("sensor.test_apparent_temperature_comfort")
+    assert state.state == "dry"
+    assert hass.states.get("sensor.test_apparent_temperature_heat_index") is None
+
+    hass.states.async_set(
+        "sensor.test_humidity", "80", {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE}
+    )
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test_apparent_temperature_dew_point")
+    assert float(state.state) == pytest.approx(16.4, abs=0.1)
+    state = hass.states.get("sensor.test_apparent_temperature_comfort")
+    assert state.state == "ok_but_humid"
+
+    hass.states.async_set("sensor.test_humidity", STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test_apparent_temperature_comfort")
+    assert state.state == STATE_UNAVAILABLE
+
+
+async def test_get_forecasts(hass: HomeAssistant):
+    """Test apparent temperature forecast is cached by forecast payload."""
+    hass.states.async_set("sensor.forecast_temperature", "12")
+    assert await async_setup_component(
+        hass,
+        "weather",
+        {
+            "weather": {
+                "platform": "template",
+                "name": "test_forecast",
+                "condition_template": "{{ 'sunny' }}",
+                "temperature_template": "{{ 12 }}",
+                ATTR_WEATHER_TEMPERATURE_UNIT: UnitOfTemperature.CELSIUS,
+                "humidity_template": "{{ 32 }}",
+                "wind_speed_template": "{{ 10 }}",
+                ATTR_WEATHER_WIND_SPEED_UNIT: UnitOfSpeed.KILOMETERS_PER_HOUR,
+                "forecast_hourly_template": (
+                    "{{ [{'datetime': '2024-01-01T00:00:00+00:00',"
+                    " 'condition': 'sunny',"
+                    " 'temperature': states('sensor.forecast_temperature') | float,"
+                    " 'humidity': 32, 'wind_speed': 10},"
+                    " {'datetime': '2024-01-01T01:00:00+00:00',"
+                    " 'condition': 'sunny', 'temperature': 20}] }}"
+                ),
+            }
+        },
+    )
+    await hass.async_block_till_done()
+    assert await async_setup_component(
+        hass,
+        "sensor",
+        {"sensor": {CONF_PLATFORM: DOMAIN, CONF_SOURCE: "weather.test_forecast"}},
+    )
+    await hass.async_block_till_done()
+
+    # Forecasts are pushed by weather entity, not asked for on every read
+    calls = async_capture_events(hass, EVENT_CALL_SERVICE)
+    with patch(
+        "custom_components.apparent_temperature.forecast.calculate_forecast",
+        wraps=calculate_forecast,
+    ) as calculate:
+        for _ in range(2):
+            response = await hass.services.async_call(
+                DOMAIN,
+                SERVICE_GET_FORECASTS,
+                {"type": "hourly"},
+                target={ATTR_ENTITY_ID: "sensor.test_forecast_apparent_temperature"},
+                blocking=True,
+                return_response=True,
+            )
+        assert calculate.call_count == 1
+        assert response == {
+            "sensor.test_forecast_apparent_temperature": {
+                "forecast": [
+                    {
+                        "datetime": "2024-01-01T00:00:00+00:00",
+                        "apparent_temperature": pytest.approx(7.3646, abs=0.01),
+                    },
+                    {
+                        "datetime": "2024-01-01T01:00:00+00:00",
+                        # Current humidity and no wind are assumed
+                        "apparent_temperature": pytest.approx(
+                            australian(20.0, 32.0, 0.0)
+                        ),
+                    },
+                ]
+            }
+        }
+
+        hass.states.async_set("sensor.forecast_temperature", "14")
+        await hass.async_block_till_done()
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_FORECASTS,
+            {"type": "hourly"},
+            target={ATTR_ENTITY_ID: "sensor.test_forecast_apparent_temperature"},
+            blocking=True,
+            return_response=True,
+        )
+        assert calculate.call_count == 2
+    assert not [call for call in calls if call.data["domain"] == "weather"]
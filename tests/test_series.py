@@ -0,0 +1,46 @@
+"""The test for the source history series."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, UnitOfTemperature
+from homeassistant.core import State
+from homeassistant.util.unit_conversion import TemperatureConverter
+
+from custom_components.apparent_temperature.const import ROLE_TEMPERATURE
+from custom_components.apparent_temperature.series import align_series, decode_history
+
+
+def test_decode_history():
+    """Test decoding of source history with one decoder."""
+    fahrenheit = {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.FAHRENHEIT}
+    celsius = {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS}
+    states = [
+        State("sensor.test", "50", fahrenheit),
+        State("sensor.test", "68", fahrenheit),
+        State("sensor.test", "unavailable", fahrenheit),
+        State("sensor.test", "25", celsius),
+    ]
+
+    with patch.object(
+        TemperatureConverter,
+        "converter_factory",
+        wraps=TemperatureConverter.converter_factory,
+    ) as converter_factory:
+        times, values = decode_history(states, ROLE_TEMPERATURE, "sensor.test")
+
+    # Converter is looked up only when unit changes
+    assert converter_factory.call_count == 2
+    assert times.tolist() == [state.last_updated_timestamp for state in states]
+    assert values == pytest.approx([10.0, 20.0, np.nan, 25.0], nan_ok=True)
+
+
+def test_align_series():
+    """Test aligning of series to breakpoints."""
+    series = (np.array([10.0, 20.0]), np.array([1.0, 2.0]))
+
+    assert align_series(np.array([5.0, 10.0, 15.0, 25.0]), series) == pytest.approx(
+        [np.nan, 1.0, 1.0, 2.0], nan_ok=True
+    )
+    assert np.isnan(align_series(np.array([5.0]), (np.array([]), np.array([])))).all()
@@ -0,0 +1,75 @@
+"""The test for the apparent_temperature services."""
+
+import pytest
+import voluptuous as vol
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.apparent_temperature.const import (
+    DOMAIN,
+    FORMULA_HEAT_INDEX,
+    SERVICE_CALCULATE,
+)
+from custom_components.apparent_temperature.formulas import australian, heat_index
+from custom_components.apparent_temperature.services import calculate
+
+
+def test_calculate():
+    """Test batch calculation with mixed units."""
+    readings = [
+        {"temperature": 12.0, "humidity": 32.0, "wind_speed": 10 / 3.6},
+        {"temperature": 68.0, "humidity": 50.0, "temperature_unit": "°F"},
+        {
+            "temperature": 293.15,
+            "humidity": 50.0,
+            "wind_speed": 10.0,
+            "temperature_unit": "K",
+            "wind_speed_unit": "km/h",
+        },
+    ]
+
+    assert calculate([]) == []
+    assert calculate(readings) == pytest.approx(
+        [
+            australian(12.0, 32.0, 10 / 3.6),
+            australian(20.0, 50.0, 0.0),
+            australian(20.0, 50.0, 10 / 3.6),
+        ]
+    )
+    assert calculate(readings[:1], FORMULA_HEAT_INDEX, "°F", "km/h") == pytest.approx(
+        [heat_index((12.0 - 32) / 1.8, 32.0, 0)]
+    )
+
+
+async def test_calculate_service(hass: HomeAssistant):
+    """Test calculate service returns results of all readings."""
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_CALCULATE,
+        {
+            "readings": [
+                {"temperature": 12, "humidity": 32, "wind_speed": 10},
+                {"temperature": 20, "humidity": 50},
+            ],
+            "wind_speed_unit": "km/h",
+        },
+        blocking=True,
+        return_response=True,
+    )
+    assert response == {
+        "results": pytest.approx(
+            [australian(12.0, 32.0, 10 / 3.6), australian(20.0, 50.0, 0.0)]
+        )
+    }
+
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_CALCULATE,
+            {"readings": [{"temperature": 20, "humidity": 150}]},
+            blocking=True,
+            return_response=True,
+        )
@@ -0,0 +1,147 @@
+# pylint: disable=protected-access,redefined-outer-name
+"""The test for the source entities decoding."""
+
+from unittest.mock import patch
+
+import pytest
+from homeassistant.components.weather import (
+    ATTR_WEATHER_HUMIDITY,
+    ATTR_WEATHER_TEMPERATURE,
+    ATTR_WEATHER_TEMPERATURE_UNIT,
+    ATTR_WEATHER_WIND_SPEED,
+    ATTR_WEATHER_WIND_SPEED_UNIT,
+)
+from homeassistant.const import (
+    ATTR_UNIT_OF_MEASUREMENT,
+    PERCENTAGE,
+    UnitOfSpeed,
+    UnitOfTemperature,
+)
+from homeassistant.core import State
+from homeassistant.util.unit_conversion import TemperatureConverter
+
+from custom_components.apparent_temperature.const import (
+    ROLE_HUMIDITY,
+    ROLE_TEMPERATURE,
+    ROLE_WIND_SPEED,
+)
+from custom_components.apparent_temperature.source import (
+    AVAILABILITY_LOG_INTERVAL,
+    SourceAvailability,
+    SourceDecoder,
+    SourceValues,
+    decode_temperature,
+)
+
+
+def test_source_decoder_weather():
+    """Test decoding of weather entity states."""
+    state = State(
+        "weather.test",
+        "sunny",
+        {
+            ATTR_WEATHER_TEMPERATURE: 68,
+            ATTR_WEATHER_TEMPERATURE_UNIT: UnitOfTemperature.FAHRENHEIT,
+            ATTR_WEATHER_HUMIDITY: 40,
+            ATTR_WEATHER_WIND_SPEED: 36,
+            ATTR_WEATHER_WIND_SPEED_UNIT: UnitOfSpeed.KILOMETERS_PER_HOUR,
+        },
+    )
+    decoder = SourceDecoder(state)
+
+    assert decoder.domain == "weather"
+    assert decoder.roles == (ROLE_TEMPERATURE, ROLE_HUMIDITY, ROLE_WIND_SPEED)
+    assert decoder.decode(state) == SourceValues(
+        pytest.approx(20.0), 40.0, pytest.approx(10.0)
+    )
+
+
+def test_source_decoder_unit_change():
+    """Test unit converter is rebuilt only when source unit changes."""
+    celsius = State(
+        "sensor.test", "20", {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS}
+    )
+    fahrenheit = State(
+        "sensor.test", "68", {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.FAHRENHEIT}
+    )
+    decoder = SourceDecoder(celsius)
+
+    with patch.object(
+        TemperatureConverter,
+        "converter_factory",
+        wraps=TemperatureConverter.converter_factory,
+    ) as factory:
+        assert decoder.decode(celsius) == SourceValues(temperature=20.0)
+        assert decoder.decode(celsius) == SourceValues(temperature=20.0)
+        assert factory.call_count == 1
+
+        assert decoder.decode(fahrenheit) == SourceValues(
+            temperature=pytest.approx(20.0)
+        )
+        assert decoder.decode(fahrenheit) == SourceValues(
+            temperature=pytest.approx(20.0)
+        )
+        assert factory.call_count == 2
+
+
+def test_source_decoder_invalid_values(caplog):
+    """Test decoding of invalid source values."""
+    state = State("sensor.test_humidity", "40", {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE})
+    decoder = SourceDecoder(state)
+
+    assert decoder.decode(State("sensor.test_humidity", "unavailable")) == (
+        SourceValues()
+    )
+    assert decoder.decode(State("sensor.test_humidity", "wet")) == SourceValues()
+    assert "Could not convert value" in caplog.text
+    # Non-finite numbers can not be calculated
+    for value in ("nan", "inf", "-Infinity"):
+        assert decoder.decode(State("sensor.test_humidity", value)) == SourceValues()
+    assert decoder.failures == 4
+
+    assert decode_temperature(State("sensor.test_temperature", "20")) is None
+    assert "Unsupported temperature unit: None" in caplog.text
+
+
+def test_source_availability(caplog):
+    """Test source availability changes are logged with rate limit."""
+    availability = SourceAvailability("sensor.test")
+    unavailable = State("sensor.test", "unavailable")
+    available = State("sensor.test", "20")
+
+    with patch(
+        "custom_components.apparent_temperature.source.time.monotonic",
+        return_value=1000.0,
+    ) as monotonic:
+        availability.update(available, available=True)
+        assert not caplog.records
+
+        availability.update(unavailable, available=False)
+        availability.update(unavailable, available=False)
+        assert not availability.available
+        assert [record.message for record in caplog.records] == [
+            "Source sensor.test is unavailable (state: unavailable)"
+        ]
+
+        caplog.clear()
+        availability.update(available, available=True)
+        assert availability.available
+        assert [record.message for record in caplog.records] == [
+            "Source sensor.test is available again"
+        ]
+
+        # Flapping source
+        caplog.clear()
+        for _ in range(10):
+            availability.update(unavailable, available=False)
+            availability.update(available, available=True)
+        assert not caplog.records
+
+        monotonic.return_value += AVAILABILITY_LOG_INTERVAL
+        availability.update(available, available=True)
+        assert [record.message for record in caplog.records] == [
+            (
+                "Source sensor.test changed availability 20 times and failed"
+                " 1 updates since last report"
+            )
+        ]
@@ -0,0 +1,59 @@
+"""The test for the rolling-window statistics."""
+
+import pytest
+
+from custom_components.apparent_temperature.window import RollingWindow, window_name
+
+
+def test_window_name():
+    """Test window names."""
+    assert window_name(86400) == "24h"
+    assert window_name(900) == "15min"
+    assert window_name(90) == "90s"
+
+
+def test_rolling_window():
+    """Test min, max and mean over rolling window."""
+    window = RollingWindow(3600, max_buckets=60)
+    assert window.stats(0) == (None, None, None)
+
+    window.add(10.0, 0)
+    window.add(14.0, 30)  # Same bucket
+    window.add(12.0, 60)
+    window.add(8.0, 1800)
+    window.add(9.0, 1830)
+    assert len(window) == 3
+    assert window.stats(1830) == (8.0, 14.0, pytest.approx(10.6))
+
+    # First bucket leaves window
+    assert window.stats(3700) == (8.0, 12.0, pytest.approx(29 / 3))
+    window.add(7.0, 5400)
+    assert window.stats(5400) == (7.0, 9.0, pytest.approx(8.0))
+
+    assert window.stats(12000) == (None, None, None)
+    assert not window
+
+
+def test_rolling_window_memory_cap():
+    """Test number of buckets is bounded regardless of update rate."""
+    window = RollingWindow(3600, max_buckets=60)
+    for second in range(7200):
+        window.add(float(second % 100), second)
+
+    assert len(window) <= 61
+    assert window.stats(7199) == (0.0, 99.0, pytest.approx(49.5, abs=1))
+
+
+def test_rolling_window_restore():
+    """Test windows are restored from stored buckets."""
+    window = RollingWindow(3600, max_buckets=60)
+    window.add(10.0, 0)
+    window.add(14.0, 100)
+    window.add(8.0, 1800)
+
+    restored = RollingWindow(3600, max_buckets=60)
+    restored.restore(window.as_list(), 1800)
+    assert restored.stats(1800) == window.stats(1800)
+
+    restored.add(20.0, 1900)
+    assert restored.stats(3700) == (8.0, 20.0, pytest.approx(14.0))